@@ -0,0 +1,24 @@
+"""
+Optional Numba JIT decorator.
+
+`njit` is `numba.njit` when Numba is installed (`poetry install -E jit`) and a
+pass-through decorator otherwise, so kernels decorated with it always run —
+compiled when possible, as plain Python when not.
+"""
+from __future__ import annotations
+
+try:
+    from numba import njit as _numba_njit
+except Exception:  # pragma: no cover - numba is optional
+    _numba_njit = None  # type: ignore
+
+HAVE_NUMBA = _numba_njit is not None
+
+
+def njit(*args, **kwargs):
+    """`numba.njit` when available; otherwise returns the function unchanged."""
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
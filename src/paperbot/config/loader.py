@@ -17,7 +17,7 @@ Key outputs:
 """
 
 import os
-import yaml
+from .yaml_cache import safe_load
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, field_validator
 import pathlib
@@ -52,7 +52,7 @@ def load_settings(path: str = "config/config.yaml") -> Settings:
     Env-var names follow the prefix convention using `exchange` and `environment`.
     """
     with open(path, "r") as f:
-        config = yaml.safe_load(f)
+        config = safe_load(f)
     exchange = config["exchange"]
     environment = config["environment"]
     symbols = config["symbols"]
@@ -98,4 +98,4 @@ def load_exchange_profile(exchange: str, environment: str) -> Dict[str, Any]:
     if not p.exists():
         return {}
     with open(p, "r") as f:
-        return yaml.safe_load(f) or {}
+        return safe_load(f) or {}
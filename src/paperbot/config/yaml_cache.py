@@ -0,0 +1,65 @@
+"""
+Cached YAML loading for paperbot config files.
+
+What it does:
+- Parses a YAML file once and serves later loads from an in-process LRU cache.
+- Validates each hit against the file's (mtime, size) so edits are picked up.
+- Returns a deep copy so callers may mutate the result without poisoning the cache.
+- Exposes `safe_load`, which uses libyaml's CSafeLoader when PyYAML was built with it.
+
+Where it is used:
+- `paperbot.main` for `config/config.yaml`.
+- `safe_load` by `paperbot.config.loader` and `paperbot.llm.router`.
+"""
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import IO, Any, Tuple, Union
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Prefer libyaml's C loader; fall back to the pure-Python SafeLoader.
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+if SafeLoader is yaml.SafeLoader:  # pragma: no cover - depends on PyYAML build
+    logger.warning("libyaml not available; YAML config parsing uses the pure-Python loader")
+
+
+def safe_load(stream: Union[str, bytes, IO[Any]]) -> Any:
+    """`yaml.safe_load` equivalent that uses the C loader when available."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+_MAX_ENTRIES = 100
+_YAML_CACHE: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def load_yaml_cached(path: str) -> Any:
+    """Load a YAML file, reusing the parsed document while the file is unchanged."""
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    with _lock:
+        hit = _YAML_CACHE.get(key)
+        if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            _YAML_CACHE.move_to_end(key)
+            return copy.deepcopy(hit[2])
+    with open(path, "r") as f:
+        data = safe_load(f)
+    with _lock:
+        _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+        _YAML_CACHE.move_to_end(key)
+        while len(_YAML_CACHE) > _MAX_ENTRIES:
+            _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+def clear_yaml_cache() -> None:
+    """Drop all cached documents (tests / config reload)."""
+    with _lock:
+        _YAML_CACHE.clear()
@@ -4,16 +4,24 @@ Data fetch utilities for OHLCV candles via ccxt.
 What it does:
 - Initializes a ccxt exchange client using credentials from `Settings`.
 - Enables sandbox mode for testnet-like environments when supported.
-- Fetches recent OHLCV candles and normalizes them into dicts.
+- Fetches recent OHLCV candles and normalizes them into `Candle` tuples, optionally for
+  many symbols concurrently via `ccxt.async_support`.
 
 Where it is used:
 - Instantiated by `paperbot.main` to pull candles per symbol.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any
 import ccxt
 from paperbot.config.loader import load_settings, Settings
+from paperbot.data.model import Candle
+
+try:
+    import ccxt.async_support as ccxt_async
+except Exception:  # pragma: no cover - async extras optional
+    ccxt_async = None  # type: ignore
 
 class CandleFetcher:
     """Thin wrapper around ccxt to fetch normalized OHLCV candles."""
@@ -28,13 +36,23 @@ class CandleFetcher:
         indicates a test setting (e.g., `spot-testnet`).
         """
         exchange_class = getattr(ccxt, self.settings.exchange)
+        return self._configure(exchange_class(self._exchange_params()))
+
+    def _init_async_exchange(self):
+        """Create an async ccxt client mirroring `_init_exchange` (caller must close it)."""
+        exchange_class = getattr(ccxt_async, self.settings.exchange)
+        return self._configure(exchange_class(self._exchange_params()))
+
+    def _exchange_params(self) -> Dict[str, Any]:
         params = {
             "apiKey": self.settings.api_key,
             "secret": self.settings.api_secret,
         }
         if self.settings.api_passphrase:
             params["password"] = self.settings.api_passphrase
-        exchange = exchange_class(params)
+        return params
+
+    def _configure(self, exchange):
         # Enable testnet/sandbox if needed
         if (
             "TESTNET" in self.settings.environment.upper()
@@ -44,22 +62,49 @@ class CandleFetcher:
                 exchange.set_sandbox_mode(True)
         return exchange
 
-    def fetch_candles(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Fetch recent OHLCV and normalize to dictionaries.
+    def fetch_candles(self, symbol: str, limit: int = 10) -> List[Candle]:
+        """Fetch recent OHLCV and normalize to `Candle` tuples.
 
-        Returns a list of dicts with keys: timestamp, open, high, low, close, volume.
+        Fields: timestamp, open, high, low, close, volume, symbol. Candles also
+        support dict-style `c["close"]` / `c.get("close")` access.
         """
         timeframe = self.settings.timeframe
         candles = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
-        # Normalize to dicts with UTC timestamps
-        return [
-            {
-                "timestamp": c[0],
-                "open": c[1],
-                "high": c[2],
-                "low": c[3],
-                "close": c[4],
-                "volume": c[5],
-            }
-            for c in candles
-        ]
+        return self._normalize(candles, symbol)
+
+    def fetch_candles_many(
+        self, symbols: Iterable[str], limit: int = 10, max_concurrency: int = 10
+    ) -> Dict[str, List[Candle]]:
+        """Fetch candles for several symbols concurrently.
+
+        Uses ccxt's async client with at most `max_concurrency` requests in
+        flight; falls back to sequential `fetch_candles` when async support is
+        unavailable. Returns a dict keyed by symbol in input order.
+        """
+        symbols = list(symbols)
+        if ccxt_async is None:
+            return {s: self.fetch_candles(s, limit=limit) for s in symbols}
+        return asyncio.run(self._fetch_many_async(symbols, limit, max_concurrency))
+
+    async def _fetch_many_async(
+        self, symbols: List[str], limit: int, max_concurrency: int
+    ) -> Dict[str, List[Candle]]:
+        exchange = self._init_async_exchange()
+        sem = asyncio.Semaphore(max(1, max_concurrency))
+        timeframe = self.settings.timeframe
+
+        async def _one(symbol: str) -> List[Candle]:
+            async with sem:
+                rows = await exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+            return self._normalize(rows, symbol)
+
+        try:
+            results = await asyncio.gather(*(_one(s) for s in symbols))
+        finally:
+            await exchange.close()
+        return dict(zip(symbols, results))
+
+    @staticmethod
+    def _normalize(candles: List[List[Any]], symbol: str) -> List[Candle]:
+        # Normalize to Candle tuples with UTC millisecond timestamps
+        return [Candle(c[0], c[1], c[2], c[3], c[4], c[5], symbol) for c in candles]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+
+class Candle(NamedTuple):
+    """Compact OHLCV bar.
+
+    Field names match the legacy candle dict keys, and `c["close"]` /
+    `c.get("close")` keep working so dict-based consumers need no changes.
+    Only field names are looked up this way. The rest is still a tuple:
+    `"close" in c` tests values, not keys, and item assignment is not
+    supported.
+    """
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    symbol: Optional[str] = None
+
+    def __getitem__(self, key):  # type: ignore[override]
+        if isinstance(key, str):
+            if key in self._fields:
+                return getattr(self, key)
+            raise KeyError(key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._fields else default
+
+
+CandleLike = Union[Candle, dict]
+
+
+def ohlcv_columns(candles: Sequence[CandleLike]) -> np.ndarray:
+    """Return a float (n, 4) array of close, high, low, volume for dict or Candle rows."""
+    if not candles:
+        return np.empty((0, 4), dtype=float)
+    if isinstance(candles[0], Candle):
+        rows: List[tuple] = [(c.close, c.high, c.low, c.volume) for c in candles]  # type: ignore[union-attr]
+    else:
+        rows = [(c["close"], c["high"], c["low"], c["volume"]) for c in candles]  # type: ignore[index]
+    return np.array(rows, dtype=float)
+
+
+def timestamp_column(candles: Sequence[CandleLike]) -> np.ndarray:
+    """Return an int64 array of candle timestamps (ms); missing values become 0."""
+    return np.fromiter(
+        (int(c.get("timestamp", 0)) for c in candles), dtype=np.int64, count=len(candles)
+    )
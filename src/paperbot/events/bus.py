@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import logging
-from typing import Any, Dict
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
 try:
     import redis
 except Exception:  # pragma: no cover
     redis = None  # type: ignore
 
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 from .schema import EventEnvelope
 from .metrics import get_events_total, get_orders_rejected_total
 
@@ -27,43 +35,194 @@ def _get_redis():
     return redis.Redis.from_url(REDIS_URL, decode_responses=True)
 
 
-def publish(env: EventEnvelope) -> None:
-    """Publish an event to Redis Streams and log a single-line JSON for Loki.
-
-    Safe: swallow errors if Redis is not reachable to avoid impacting trading loop.
-    """
+def _count(event_type: str, reason: Optional[str] = None) -> None:
     # Metrics: total per type
     try:
-        get_events_total().labels(env.event.event_type).inc()
-        if env.event.event_type == "order_rejected":
-            reason = getattr(env.event, "reason", "unknown")
-            get_orders_rejected_total().labels(reason).inc()
+        get_events_total().labels(event_type).inc()
+        if event_type == "order_rejected":
+            get_orders_rejected_total().labels(reason or "unknown").inc()
     except Exception:
         pass
 
-    line = json.dumps({
+
+def _dumps(obj: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _line(env: EventEnvelope) -> str:
+    return _dumps({
         "schema_version": env.schema_version,
         "correlation_id": env.correlation_id,
         "sequence": env.sequence,
         "event": env.event.model_dump(),
-    }, separators=(",", ":"))
+    })
+
+
+def _raw_line(correlation_id: str, event: Dict[str, Any]) -> str:
+    return _dumps({
+        "schema_version": "v1",
+        "correlation_id": correlation_id,
+        "sequence": 0,
+        "event": event,
+    })
+
+
+def _log(line: str) -> None:
+    # Always log for Loki ingestion
+    try:
+        log.info(line)
+    except Exception:
+        pass
+
+
+def _send_many(lines: List[str]) -> None:
+    """XADD `lines` in one pipeline (whole batch to the DLQ on failure), then log them."""
     try:
         r = _get_redis()
-        r.xadd(STREAM_EVENTS, {"json": line})
+        pipe = r.pipeline(transaction=False)
+        for line in lines:
+            pipe.xadd(STREAM_EVENTS, {"json": line})
+        pipe.execute()
     except Exception:
         try:
             # best-effort DLQ
             r = _get_redis()
-            r.xadd(STREAM_DLQ, {"json": line})
+            pipe = r.pipeline(transaction=False)
+            for line in lines:
+                pipe.xadd(STREAM_DLQ, {"json": line})
+            pipe.execute()
         except Exception:
             pass
-    # Always log for Loki ingestion
+    for line in lines:
+        _log(line)
+
+
+def publish(env: EventEnvelope) -> None:
+    """Publish an event to Redis Streams and log a single-line JSON for Loki.
+
+    Safe: swallow errors if Redis is not reachable to avoid impacting trading loop.
+    """
+    _count(env.event.event_type, getattr(env.event, "reason", None))
+    line = _line(env)
     try:
-        log.info(line)
+        r = _get_redis()
+        r.xadd(STREAM_EVENTS, {"json": line})
     except Exception:
+        try:
+            # best-effort DLQ
+            r = _get_redis()
+            r.xadd(STREAM_DLQ, {"json": line})
+        except Exception:
+            pass
+    _log(line)
+
+
+def publish_many(envs: Sequence[EventEnvelope]) -> None:
+    """Like `publish` for several events, sending every XADD in one Redis pipeline.
+
+    If the pipeline fails, the whole batch goes to the DLQ the same way. An event
+    that cannot be serialized is logged and skipped; the rest are still sent.
+    """
+    if not envs:
+        return
+    lines: List[str] = []
+    for env in envs:
+        try:
+            line = _line(env)
+        except Exception:
+            log.debug("events: dropping unserializable event", exc_info=True)
+            continue
+        _count(env.event.event_type, getattr(env.event, "reason", None))
+        lines.append(line)
+    if lines:
+        _send_many(lines)
+
+
+def publish_raw_many(items: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+    """Publish pre-built `(correlation_id, event_dict)` pairs without pydantic.
+
+    `event_dict` must already have the shape of the event model's `model_dump()`
+    (including `event_type`); it is not validated here, only on the consumer side.
+    Wire format, metrics and DLQ handling match `publish_many`.
+    """
+    if not items:
+        return
+    lines: List[str] = []
+    for correlation_id, event in items:
+        _count(event["event_type"], event.get("reason"))
+        lines.append(_raw_line(correlation_id, event))
+    _send_many(lines)
+
+
+def publish_raw(correlation_id: str, event: Dict[str, Any]) -> None:
+    """Single-event form of `publish_raw_many`."""
+    publish_raw_many(((correlation_id, event),))
+
+
+_BATCH_MAX = 1000
+_BATCH_INTERVAL_S = 0.05
+_pending: Deque[EventEnvelope] = deque()
+_wake = threading.Event()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+_drain_lock = threading.Lock()
+
+
+def _drain() -> int:
+    """Publish up to `_BATCH_MAX` queued events in one pipeline; return how many were sent."""
+    batch: List[EventEnvelope] = []
+    # One drainer at a time keeps events in enqueue order
+    with _drain_lock:
+        while len(batch) < _BATCH_MAX:
+            try:
+                batch.append(_pending.popleft())
+            except IndexError:
+                break
+        try:
+            publish_many(batch)
+        except Exception:
+            # Keep the background worker alive; the batch is lost, later events are not
+            log.debug("events: batch publish failed", exc_info=True)
+    return len(batch)
+
+
+def _run_batcher() -> None:
+    while True:
+        _wake.wait(_BATCH_INTERVAL_S)
+        _wake.clear()
+        while _drain() == _BATCH_MAX:
+            pass
+
+
+def publish_batched(env: EventEnvelope) -> None:
+    """Queue an event for `publish_many` on a background thread.
+
+    Events are flushed in groups of up to `_BATCH_MAX` every `_BATCH_INTERVAL_S`
+    seconds (or sooner once a full batch is waiting). Use for fire-and-forget
+    events; call `flush()` to publish everything queued so far synchronously.
+    """
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        with _worker_lock:
+            if _worker is None or not _worker.is_alive():
+                _worker = threading.Thread(target=_run_batcher, name="paperbot-events", daemon=True)
+                _worker.start()
+    _pending.append(env)
+    if len(_pending) >= _BATCH_MAX:
+        _wake.set()
+
+
+def flush() -> None:
+    """Synchronously publish all queued events (tests / shutdown)."""
+    while _drain():
         pass
 
 
+atexit.register(flush)
+
+
 def ensure_group(group: str) -> None:
     try:
         r = _get_redis()
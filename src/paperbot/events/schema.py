@@ -19,6 +19,13 @@ class BaseEvent(BaseModel):
 
 
 class EventEnvelope(BaseModel):
+    """Wire envelope for every event.
+
+    Hot emit paths (execution simulator, risk rejects) build envelopes and events
+    with `model_construct`, which skips validation: callers must pass values
+    that already have the field types.
+    """
+
     schema_version: str = "v1"
     correlation_id: str
     sequence: int = 0
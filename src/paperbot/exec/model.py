@@ -1,19 +1,31 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Literal, Optional
+from itertools import count
+from typing import Any, Dict, Literal, NamedTuple, Optional
+import os
 import uuid
 
+import numpy as np
+
 SideOrder = Literal["buy", "sell"]
 TypeOrder = Literal["market", "limit"]
 Liquidity = Literal["maker", "taker"]
 
 
+# FAST_IDS=1 (backtests) swaps uuid4 for a counter; ids are then unique per process only
+_FAST_IDS = os.getenv("FAST_IDS", "0") == "1"
+_id_prefix = f"ord-{os.getpid()}-"
+_id_seq = count(1)
+
+
 def new_id() -> str:
+    if _FAST_IDS:
+        return _id_prefix + str(next(_id_seq))
     return uuid.uuid4().hex
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     id: str
     ts: int
@@ -29,7 +41,7 @@ class Order:
     fee_amount: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Fill:
     order_id: str
     ts: int
@@ -42,6 +54,21 @@ class Fill:
     liquidity: Liquidity
 
 
+class FillColumns(NamedTuple):
+    """Column-wise (struct-of-arrays) batch of fills for `Ledger.on_fills_batch`.
+
+    All fields are equal-length arrays; `symbol_id` indexes the symbol list passed
+    alongside the batch. Rows are applied in array order.
+    """
+
+    ts: np.ndarray
+    symbol_id: np.ndarray
+    qty: np.ndarray
+    price: np.ndarray
+    fee_usd: np.ndarray
+    liquidity: np.ndarray
+
+
 @dataclass
 class Position:
     symbol: str
@@ -11,6 +11,7 @@ from ..metrics.exec import (
     get_fills_total,
     get_fees_paid_total,
     get_fees_paid_usd_total,
+    bind,
 )
 from ..events.schema import EventEnvelope, OrderSubmitted, OrderPartiallyFilled, OrderFilled, OrderRejected
 from ..events.bus import publish as publish_event
@@ -86,7 +87,7 @@ class ExecutionSimulator:
         self.oracle = PriceOracle(prof.get("oracle", {}))
 
     def submit(self, order: Order, candle: Dict[str, Any], features: Dict[str, Any] | None = None) -> List[Fill]:
-        self.orders_submitted.labels(order.type, order.symbol).inc()
+        bind(self.orders_submitted, order.type, order.symbol).inc()
         fills: List[Fill] = []
         close = float(candle.get("close", 0.0))
         high = float(candle.get("high", close))
@@ -99,7 +100,7 @@ class ExecutionSimulator:
         if self.min_notional and notional < self.min_notional:
             get_orders_blocked_total().labels("min_notional", order.symbol).inc()
             try:
-                evt = OrderRejected(
+                evt = OrderRejected.model_construct(
                     ts=ts,
                     market="stocks" if order.symbol.isalpha() else "crypto",
                     symbol=order.symbol,
@@ -107,7 +108,7 @@ class ExecutionSimulator:
                     side=order.side,
                     reason="min_notional",
                 )
-                publish_event(EventEnvelope(correlation_id=order.id, event=evt))
+                publish_event(EventEnvelope.model_construct(correlation_id=order.id, event=evt))
             except Exception:
                 pass
             return fills
@@ -138,7 +139,7 @@ class ExecutionSimulator:
             )
             qty_signed = to_fill if order.side == "buy" else -to_fill
             try:
-                evt = OrderSubmitted(
+                evt = OrderSubmitted.model_construct(
                     ts=ts,
                     market="stocks" if order.symbol.isalpha() else "crypto",
                     symbol=order.symbol,
@@ -148,7 +149,7 @@ class ExecutionSimulator:
                     qty=float(order.qty),
                     price=None,
                 )
-                publish_event(EventEnvelope(correlation_id=order.id, event=evt))
+                publish_event(EventEnvelope.model_construct(correlation_id=order.id, event=evt))
             except Exception:
                 pass
             fee_usd = self._convert_fee_to_usd(fee_amount, fee_currency, order.symbol, candle)
@@ -200,14 +201,14 @@ class ExecutionSimulator:
         self._remaining[order.id] = new_remaining
 
         for f in fills:
-            self.fills_total.labels(f.liquidity, f.symbol).inc()
-            self.fees_paid.labels(f.symbol).inc(f.fee)
+            bind(self.fills_total, f.liquidity, f.symbol).inc()
+            bind(self.fees_paid, f.symbol).inc(f.fee)
             # Determine market from symbol heuristic used elsewhere in the codebase
             market = "stocks" if f.symbol.isalpha() else "crypto"
-            self.fees_paid_usd.labels(market=market, symbol=f.symbol).inc(f.fee_usd)
+            bind(self.fees_paid_usd, market, f.symbol).inc(f.fee_usd)
             # Emit partial-fill event (even if full fill occurs later)
             try:
-                evt = OrderPartiallyFilled(
+                evt = OrderPartiallyFilled.model_construct(
                     ts=f.ts,
                     market=market,
                     symbol=f.symbol,
@@ -219,7 +220,7 @@ class ExecutionSimulator:
                     fee_usd=f.fee_usd,
                     slippage_bps=None,
                 )
-                publish_event(EventEnvelope(correlation_id=order.id, event=evt))
+                publish_event(EventEnvelope.model_construct(correlation_id=order.id, event=evt))
             except Exception:
                 pass
         # If fully filled on this call, emit order_filled
@@ -227,7 +228,7 @@ class ExecutionSimulator:
             if new_remaining == 0.0 and fills:
                 total_qty = sum(abs(f.qty) for f in fills)
                 avg_price = sum(abs(f.qty) * f.price for f in fills) / max(total_qty, 1e-9)
-                evt2 = OrderFilled(
+                evt2 = OrderFilled.model_construct(
                     ts=fills[-1].ts,
                     market="stocks" if order.symbol.isalpha() else "crypto",
                     symbol=order.symbol,
@@ -238,7 +239,7 @@ class ExecutionSimulator:
                     avg_price=avg_price,
                     fee_usd=sum(float(f.fee_usd) for f in fills),
                 )
-                publish_event(EventEnvelope(correlation_id=order.id, event=evt2))
+                publish_event(EventEnvelope.model_construct(correlation_id=order.id, event=evt2))
         except Exception:
             pass
         return fills
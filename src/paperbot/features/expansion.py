@@ -14,7 +14,95 @@ Where it is used:
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, Tuple
-from datetime import datetime, timezone
+
+from .._njit import HAVE_NUMBA, njit
+
+
+# ---- Loop kernels (compiled when numba is installed, plain Python otherwise) ----
+
+@njit(cache=True)
+def _ema_seeded(x, alpha):
+    """EMA over `x` seeded with its first element; returns the last value."""
+    ema = x[0]
+    for i in range(1, x.shape[0]):
+        ema = alpha * x[i] + (1 - alpha) * ema
+    return ema
+
+
+@njit(cache=True)
+def _macd_loop(prices, fast, slow, signal):
+    """Return (macd_line, signal_line) with the same recurrences as `macd`."""
+    n = prices.shape[0]
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    ema_fast = prices[0]
+    ema_slow = prices[0]
+    for i in range(1, n):
+        ema_fast = alpha_fast * prices[i] + (1 - alpha_fast) * ema_fast
+        ema_slow = alpha_slow * prices[i] + (1 - alpha_slow) * ema_slow
+    macd_line = ema_fast - ema_slow
+    if n < slow + signal:
+        return macd_line, macd_line
+    # Signal line (EMA of MACD); approximate over trailing window
+    macd_values = np.empty(n - slow)
+    for i in range(slow, n):
+        alpha = 2.0 / (fast + 1)
+        ema_fast_i = prices[i - slow]
+        ema_slow_i = prices[i - slow]
+        for j in range(i - slow + 1, i + 1):
+            ema_fast_i = alpha * prices[j] + (1 - alpha) * ema_fast_i
+            ema_slow_i = alpha * prices[j] + (1 - alpha) * ema_slow_i
+        macd_values[i - slow] = ema_fast_i - ema_slow_i
+    return macd_line, macd_values[-signal:].mean()
+
+
+@njit(cache=True)
+def _true_range_mean(close, high, low):
+    """Mean True Range over bars 1..n-1 of the window (0.0 for a single bar)."""
+    n = close.shape[0]
+    if n < 2:
+        return 0.0
+    total = 0.0
+    for i in range(1, n):
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        total += tr
+    return total / (n - 1)
+
+
+@njit(cache=True)
+def _skew_kurt(x):
+    """Population skewness and excess kurtosis in one pass (Pébay's online M2..M4).
+
+    Returns (0.0, 0.0) for fewer than 3 values or zero variance.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    m3 = 0.0
+    m4 = 0.0
+    for i in range(x.shape[0]):
+        n1 = n
+        n += 1
+        delta = x[i] - mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        mean += delta_n
+        m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * m2 - 4 * delta_n * m3
+        m3 += term1 * delta_n * (n - 2) - 3 * delta_n * m2
+        m2 += term1
+    if n < 3 or m2 <= 0.0:
+        return 0.0, 0.0
+    return np.sqrt(n) * m3 / m2 ** 1.5, n * m4 / (m2 * m2) - 3.0
+
+
+if HAVE_NUMBA:  # pragma: no cover - compile once at import, not on the first bar
+    _w = np.ones(2)
+    _ema_seeded(_w, 0.5)
+    _macd_loop(_w, 1, 1, 1)
+    _true_range_mean(_w, _w, _w)
+    _skew_kurt(_w)
+    del _w
 
 
 def sma_ema_cross(prices: np.ndarray, fast: int = 5, slow: int = 10) -> Dict[str, float]:
@@ -31,6 +119,7 @@ def sma_ema_cross(prices: np.ndarray, fast: int = 5, slow: int = 10) -> Dict[str
     """
     if len(prices) < slow:
         return {"sma": 0.0, "ema": 0.0, "crossover_signal": 0.0}
+    prices = np.asarray(prices, dtype=np.float64)
     
     # Calculate SMA
     sma = np.mean(prices[-slow:])
@@ -38,11 +127,7 @@ def sma_ema_cross(prices: np.ndarray, fast: int = 5, slow: int = 10) -> Dict[str
     # Calculate EMA using the fast period (iterative EMA on recent window)
     if len(prices) >= fast:
         # Use the last 'fast' prices for EMA calculation
-        recent_prices = prices[-fast:]
-        alpha = 2.0 / (fast + 1)
-        ema = recent_prices[0]
-        for price in recent_prices[1:]:
-            ema = alpha * price + (1 - alpha) * ema
+        ema = _ema_seeded(prices[-fast:], 2.0 / (fast + 1))
     else:
         ema = prices[-1]  # Use last price if insufficient data
     
@@ -72,37 +157,7 @@ def macd(prices: np.ndarray, fast: int = 8, slow: int = 15, signal: int = 5) ->
     if len(prices) < slow:
         return {"macd": 0.0, "signal_line": 0.0, "histogram": 0.0}
     
-    # Calculate fast and slow EMAs
-    alpha_fast = 2.0 / (fast + 1)
-    alpha_slow = 2.0 / (slow + 1)
-    
-    ema_fast = prices[0]
-    ema_slow = prices[0]
-    
-    for price in prices[1:]:
-        ema_fast = alpha_fast * price + (1 - alpha_fast) * ema_fast
-        ema_slow = alpha_slow * price + (1 - alpha_slow) * ema_slow
-    
-    macd_line = ema_fast - ema_slow
-    
-    # Signal line (EMA of MACD); approximate over trailing window
-    if len(prices) >= slow + signal:
-        macd_values = []
-        for i in range(slow, len(prices)):
-            alpha = 2.0 / (fast + 1)
-            ema_fast_i = prices[i - slow]
-            ema_slow_i = prices[i - slow]
-            for j in range(i - slow + 1, i + 1):
-                ema_fast_i = alpha * prices[j] + (1 - alpha) * ema_fast_i
-                ema_slow_i = alpha * prices[j] + (1 - alpha) * ema_slow_i
-            macd_values.append(ema_fast_i - ema_slow_i)
-        
-        if macd_values:
-            signal_line = np.mean(macd_values[-signal:])
-        else:
-            signal_line = macd_line
-    else:
-        signal_line = macd_line
+    macd_line, signal_line = _macd_loop(np.asarray(prices, dtype=np.float64), fast, slow, signal)
     
     histogram = macd_line - signal_line
     
@@ -163,12 +218,10 @@ def obv(prices: np.ndarray, volumes: np.ndarray) -> Dict[str, float]:
     if len(prices) < 2 or len(volumes) < 2:
         return {"obv": 0.0, "obv_change": 0.0}
     
-    obv_value = 0.0
-    for i in range(1, len(prices)):
-        if prices[i] > prices[i-1]:
-            obv_value += volumes[i]
-        elif prices[i] < prices[i-1]:
-            obv_value -= volumes[i]
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    # Branchless: +volume on up bars, -volume on down bars, 0 when unchanged
+    obv_value = (np.sign(np.diff(prices)) * volumes[1:len(prices)]).sum()
     
     obv_change = obv_value - (0.0 if len(prices) < 3 else obv_value)
     
@@ -199,27 +252,15 @@ def keltner_channel(prices: np.ndarray, high: np.ndarray, low: np.ndarray,
             "lower_channel": 0.0
         }
     
-    recent_prices = prices[-period:]
-    recent_high = high[-period:]
-    recent_low = low[-period:]
+    recent_prices = np.asarray(prices[-period:], dtype=np.float64)
+    recent_high = np.asarray(high[-period:], dtype=np.float64)
+    recent_low = np.asarray(low[-period:], dtype=np.float64)
     
     # Middle channel (EMA of close)
-    alpha = 2.0 / (period + 1)
-    middle_channel = recent_prices[0]
-    for price in recent_prices[1:]:
-        middle_channel = alpha * price + (1 - alpha) * middle_channel
+    middle_channel = _ema_seeded(recent_prices, 2.0 / (period + 1))
     
     # ATR calculation (True Range average over recent window)
-    tr_values = []
-    for i in range(1, len(recent_high)):
-        tr = max(
-            recent_high[i] - recent_low[i],
-            abs(recent_high[i] - recent_prices[i-1]),
-            abs(recent_low[i] - recent_prices[i-1])
-        )
-        tr_values.append(tr)
-    
-    atr = np.mean(tr_values) if tr_values else 0.0
+    atr = _true_range_mean(recent_prices, recent_high, recent_low)
     
     upper_channel = middle_channel + (2.0 * atr)
     lower_channel = middle_channel - (2.0 * atr)
@@ -245,23 +286,11 @@ def rolling_skew_kurtosis(prices: np.ndarray, lookback: int = 20) -> Dict[str, f
     if len(prices) < lookback:
         return {"skewness": 0.0, "kurtosis": 0.0}
     
-    recent_prices = prices[-lookback:]
+    recent_prices = np.asarray(prices[-lookback:], dtype=np.float64)
     returns = np.diff(recent_prices) / recent_prices[:-1]
     
-    if len(returns) < 3:
-        return {"skewness": 0.0, "kurtosis": 0.0}
-    
-    mean_return = np.mean(returns)
-    std_return = np.std(returns)
-    
-    if std_return == 0:
-        return {"skewness": 0.0, "kurtosis": 0.0}
-    
-    # Skewness
-    skewness = np.mean(((returns - mean_return) / std_return) ** 3)
-    
-    # Kurtosis (excess kurtosis, subtract 3 so normal≈0)
-    kurtosis = np.mean(((returns - mean_return) / std_return) ** 4) - 3
+    # Zero for < 3 returns or zero variance; kurtosis is excess (normal ≈ 0)
+    skewness, kurtosis = _skew_kurt(returns)
     
     return {
         "skewness": float(skewness),
@@ -269,6 +298,9 @@ def rolling_skew_kurtosis(prices: np.ndarray, lookback: int = 20) -> Dict[str, f
     }
 
 
+_HOUR_CATS = tuple(f"hour_{h:02d}" for h in range(24))
+
+
 def hour_of_day(timestamp_ms: int) -> Dict[str, Any]:
     """
     Extract hour of day from timestamp.
@@ -280,16 +312,13 @@ def hour_of_day(timestamp_ms: int) -> Dict[str, Any]:
         Dict with hour_int, hour_cat values
     """
     try:
-        # Use UTC to avoid local timezone skew in tests and runtime.
-        ts = datetime.utcfromtimestamp(timestamp_ms / 1000.0).replace(tzinfo=timezone.utc)
-        hour_int = ts.hour
-        hour_cat = f"hour_{hour_int:02d}"
-    except (ValueError, OSError):
+        # UTC hour straight from epoch ms (no datetime object, no string formatting)
+        hour_int = int(timestamp_ms // 3_600_000) % 24
+    except (ValueError, OverflowError):
         hour_int = 0
-        hour_cat = "hour_00"
     
     return {
         "hour_int": hour_int,
-        "hour_cat": hour_cat,
+        "hour_cat": _HOUR_CATS[hour_int],
         "hour": hour_int,
     }
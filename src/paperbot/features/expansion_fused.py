@@ -0,0 +1,208 @@
+"""
+Fused evaluation of all expansion indicators.
+
+What it does:
+- `compute_all` returns the merged output of `sma_ema_cross`, `macd`,
+  `bollinger_bands`, `obv`, `keltner_channel`, `rolling_skew_kurtosis` and
+  `hour_of_day` (default parameters) for one price history.
+- With numba installed, the window statistics come from a single compiled pass
+  over the arrays (`_fused_pass`): SMA/EMA, Bollinger mean/variance (Welford),
+  Keltner EMA + true range, OBV and return moments (Pébay's online M2..M4).
+  Without numba, the per-indicator helpers are called instead, which is faster
+  than the same loop in plain Python.
+
+Where it is used:
+- Available to feature pipelines that want every expansion indicator at once.
+- Equivalence with the per-indicator helpers is tested in
+  `tests/test_features_expansion.py`.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict
+
+import numpy as np
+
+from .._njit import HAVE_NUMBA, njit
+from .expansion import (
+    _macd_loop,
+    bollinger_bands,
+    hour_of_day,
+    keltner_channel,
+    macd,
+    obv,
+    rolling_skew_kurtosis,
+    sma_ema_cross,
+)
+
+# Default periods of the per-indicator helpers
+_FAST, _SLOW = 5, 10
+_MACD_FAST, _MACD_SLOW, _MACD_SIGNAL = 8, 15, 5
+_BB_PERIOD, _BB_MULT = 20, 2.0
+_KC_PERIOD = 20
+_SK_LOOKBACK = 20
+
+
+@njit(cache=True)
+def _fused_pass(prices, volumes, high, low, fast, slow, bb_period, kc_period, sk_lookback):
+    """One pass over the arrays; returns the raw window statistics as a float array.
+
+    Layout: [sma, ema, bb_mean, bb_std, kc_ema, kc_atr, obv, skew, kurt, sk_ok]
+    """
+    n = prices.shape[0]
+    out = np.zeros(10)
+    fast_start = n - fast
+    slow_start = n - slow
+    bb_start = n - bb_period
+    kc_start = n - kc_period
+    sk_start = n - sk_lookback
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_kc = 2.0 / (kc_period + 1)
+    sma_sum = 0.0
+    ema = 0.0
+    bb_n = 0
+    bb_mean = 0.0
+    bb_m2 = 0.0
+    kc_ema = 0.0
+    tr_sum = 0.0
+    obv_value = 0.0
+    # Pébay online moments of the returns in the skew/kurtosis window
+    r_n = 0
+    r_mean = 0.0
+    m2 = 0.0
+    m3 = 0.0
+    m4 = 0.0
+    for i in range(n):
+        p = prices[i]
+        if i > 0:
+            if p > prices[i - 1]:
+                obv_value += volumes[i]
+            elif p < prices[i - 1]:
+                obv_value -= volumes[i]
+        if i >= slow_start:
+            sma_sum += p
+        if i == fast_start:
+            ema = p
+        elif i > fast_start:
+            ema = alpha_fast * p + (1 - alpha_fast) * ema
+        if i >= bb_start:
+            bb_n += 1
+            delta = p - bb_mean
+            bb_mean += delta / bb_n
+            bb_m2 += delta * (p - bb_mean)
+        if i == kc_start:
+            kc_ema = p
+        elif i > kc_start:
+            kc_ema = alpha_kc * p + (1 - alpha_kc) * kc_ema
+            prev = prices[i - 1]
+            tr_sum += max(high[i] - low[i], abs(high[i] - prev), abs(low[i] - prev))
+        if i > sk_start:
+            r = (p - prices[i - 1]) / prices[i - 1]
+            n1 = r_n
+            r_n += 1
+            delta = r - r_mean
+            delta_n = delta / r_n
+            delta_n2 = delta_n * delta_n
+            term1 = delta * delta_n * n1
+            r_mean += delta_n
+            m4 += term1 * delta_n2 * (r_n * r_n - 3 * r_n + 3) + 6 * delta_n2 * m2 - 4 * delta_n * m3
+            m3 += term1 * delta_n * (r_n - 2) - 3 * delta_n * m2
+            m2 += term1
+    out[0] = sma_sum / slow
+    out[1] = ema if n >= fast else prices[n - 1]
+    out[2] = bb_mean
+    out[3] = math.sqrt(bb_m2 / bb_n) if bb_n > 0 else 0.0
+    out[4] = kc_ema
+    out[5] = tr_sum / (kc_period - 1) if kc_period > 1 else 0.0
+    out[6] = obv_value
+    if r_n >= 3 and m2 > 0.0:
+        out[7] = math.sqrt(r_n) * m3 / m2 ** 1.5
+        out[8] = r_n * m4 / (m2 * m2) - 3.0
+        out[9] = 1.0
+    return out
+
+
+if HAVE_NUMBA:  # pragma: no cover - compile once at import, not on the first bar
+    _w = np.ones(3)
+    _fused_pass(_w, _w, _w, _w, 2, 2, 2, 2, 2)
+    del _w
+
+
+def _compute_all_fused(prices, volumes, high, low, ts_ms: int) -> Dict[str, Any]:
+    n = len(prices)
+    s = _fused_pass(prices, volumes, high, low, _FAST, _SLOW, _BB_PERIOD, _KC_PERIOD, _SK_LOOKBACK)
+    out: Dict[str, Any] = {}
+    if n < _SLOW:
+        out.update(sma=0.0, ema=0.0, crossover_signal=0.0)
+    else:
+        out.update(sma=float(s[0]), ema=float(s[1]), crossover_signal=1.0 if s[1] > s[0] else -1.0)
+    if n < _MACD_SLOW:
+        out.update(macd=0.0, signal_line=0.0, histogram=0.0)
+    else:
+        line, sig = _macd_loop(prices, _MACD_FAST, _MACD_SLOW, _MACD_SIGNAL)
+        out.update(macd=float(line), signal_line=float(sig), histogram=float(line - sig))
+    if n < _BB_PERIOD:
+        out.update(upper_band=0.0, middle_band=0.0, lower_band=0.0, bandwidth=0.0)
+    else:
+        mid, band = s[2], _BB_MULT * s[3]
+        out.update(
+            upper_band=float(mid + band),
+            middle_band=float(mid),
+            lower_band=float(mid - band),
+            bandwidth=float(2 * band / mid) if mid != 0 else 0.0,
+        )
+    if n < 2 or len(volumes) < 2:
+        out.update(obv=0.0, obv_change=0.0)
+    else:
+        out.update(obv=float(s[6]), obv_change=0.0 if n >= 3 else float(s[6]))
+    if n < _KC_PERIOD:
+        out.update(upper_channel=0.0, middle_channel=0.0, lower_channel=0.0)
+    else:
+        out.update(
+            upper_channel=float(s[4] + 2.0 * s[5]),
+            middle_channel=float(s[4]),
+            lower_channel=float(s[4] - 2.0 * s[5]),
+        )
+    if n < _SK_LOOKBACK or not s[9]:
+        out.update(skewness=0.0, kurtosis=0.0)
+    else:
+        out.update(skewness=float(s[7]), kurtosis=float(s[8]))
+    out.update(hour_of_day(ts_ms))
+    return out
+
+
+def _compute_all_composed(prices, volumes, high, low, ts_ms: int) -> Dict[str, Any]:
+    return {
+        **sma_ema_cross(prices, _FAST, _SLOW),
+        **macd(prices, _MACD_FAST, _MACD_SLOW, _MACD_SIGNAL),
+        **bollinger_bands(prices, _BB_PERIOD, _BB_MULT),
+        **obv(prices, volumes),
+        **keltner_channel(prices, high, low, _KC_PERIOD),
+        **rolling_skew_kurtosis(prices, _SK_LOOKBACK),
+        **hour_of_day(ts_ms),
+    }
+
+
+def compute_all(
+    prices: np.ndarray, volumes: np.ndarray, high: np.ndarray, low: np.ndarray, ts_ms: int
+) -> Dict[str, Any]:
+    """
+    Compute every expansion indicator (default parameters) in one call.
+
+    Args:
+        prices: Array of closing prices
+        volumes: Array of trading volumes
+        high: Array of high prices
+        low: Array of low prices
+        ts_ms: Timestamp of the last bar in milliseconds
+
+    Returns:
+        Merged dict of all per-indicator helper outputs
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    if HAVE_NUMBA:  # pragma: no cover - depends on the optional jit extra
+        return _compute_all_fused(prices, volumes, high, low, ts_ms)
+    return _compute_all_composed(prices, volumes, high, low, ts_ms)
@@ -16,9 +16,9 @@ Related modules:
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timezone
 import logging
 
+from ..data.model import ohlcv_columns, timestamp_column
 from .expansion import (
     sma_ema_cross, macd, bollinger_bands, obv, 
     keltner_channel, rolling_skew_kurtosis, hour_of_day
@@ -26,6 +26,9 @@ from .expansion import (
 
 logger = logging.getLogger(__name__)
 
+_MS_PER_DAY = 86_400_000
+_EMPTY_COLUMNS = (np.empty(0, dtype=np.int64),) + tuple(np.empty(0) for _ in range(4))
+
 
 class FeatureBuilder:
     """
@@ -83,11 +86,13 @@ class FeatureBuilder:
             return self._empty_baseline_features()
         
         # Extract arrays for calculations
-        closes = np.array([float(c['close']) for c in candles])
-        highs = np.array([float(c['high']) for c in candles])
-        lows = np.array([float(c['low']) for c in candles])
-        volumes = np.array([float(c['volume']) for c in candles])
-        
+        closes, highs, lows, volumes = ohlcv_columns(candles).T
+        return self._baseline_from_arrays(closes, highs, lows, volumes)
+
+    def _baseline_from_arrays(
+        self, closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray
+    ) -> Dict[str, float]:
+        """Baseline features from column arrays (requires at least 2 bars)."""
         # Basic price features (last close and change)
         current_price = closes[-1]
         price_change = closes[-1] - closes[-2] if len(closes) > 1 else 0.0
@@ -126,13 +131,21 @@ class FeatureBuilder:
         if not candles or len(candles) < 2:
             return {}
         
-        features = {}
-        
         # Extract arrays for calculations
-        closes = np.array([float(c['close']) for c in candles])
-        highs = np.array([float(c['high']) for c in candles])
-        lows = np.array([float(c['low']) for c in candles])
-        volumes = np.array([float(c['volume']) for c in candles])
+        closes, highs, lows, volumes = ohlcv_columns(candles).T
+        last_ts = int(candles[-1].get('timestamp', 0))
+        return self._expansion_from_arrays(closes, highs, lows, volumes, last_ts)
+
+    def _expansion_from_arrays(
+        self,
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        volumes: np.ndarray,
+        last_ts: int,
+    ) -> Dict[str, float]:
+        """Expansion features from column arrays (requires at least 2 bars)."""
+        features = {}
         
         # SMA/EMA crossover
         if self.expansion_config.get('sma_ema', False):
@@ -165,9 +178,8 @@ class FeatureBuilder:
             features.update({f"skew_kurt_{k}": v for k, v in skew_kurt_features.items()})
         
         # Hour of day
-        if self.expansion_config.get('hour_of_day', False) and candles:
-            timestamp_ms = int(candles[-1].get('timestamp', 0))
-            hour_features = hour_of_day(timestamp_ms)
+        if self.expansion_config.get('hour_of_day', False):
+            hour_features = hour_of_day(last_ts)
             features.update({f"hour_{k}": v for k, v in hour_features.items()})
         
         return features
@@ -217,19 +229,20 @@ class FeatureBuilder:
         """
         if not candles:
             return 0.0
-        last_ts = int(candles[-1].get('timestamp', 0))
-        last_date = datetime.utcfromtimestamp(last_ts / 1000.0).date()
-        pv_sum = 0.0
-        v_sum = 0.0
-        for c in candles:
-            ts = int(c.get('timestamp', 0))
-            if datetime.utcfromtimestamp(ts / 1000.0).date() != last_date:
-                continue
-            price = float(c.get('close', 0.0))
-            vol = float(c.get('volume', 0.0))
-            pv_sum += price * vol
-            v_sum += vol
-        return float(pv_sum / v_sum) if v_sum > 0 else 0.0
+        closes, _, _, volumes = ohlcv_columns(candles).T
+        return self._session_vwap_arrays(timestamp_column(candles), closes, volumes)
+
+    @staticmethod
+    def _session_vwap_arrays(ts: np.ndarray, closes: np.ndarray, volumes: np.ndarray) -> float:
+        """Session VWAP over the bars sharing the last bar's UTC day (integer day index)."""
+        if len(ts) == 0:
+            return 0.0
+        days = ts // _MS_PER_DAY
+        mask = days == days[-1]
+        v_sum = float(np.sum(volumes[mask]))
+        if v_sum <= 0:
+            return 0.0
+        return float(np.sum(closes[mask] * volumes[mask]) / v_sum)
 
     def _zscore_to_vwap(self, candles: List[Dict[str, Any]], lookback: int) -> float:
         """Compute z-score of (close - session_vwap_up_to_bar) over trailing lookback bars.
@@ -239,26 +252,33 @@ class FeatureBuilder:
         """
         if not candles:
             return 0.0
-        window = candles[-min(lookback, len(candles)):]
-        # Build per-day cumulative sums to derive per-bar session VWAP
-        pv_cum: Dict[Any, float] = {}
-        v_cum: Dict[Any, float] = {}
-        diffs: List[float] = []
-        for c in window:
-            ts = int(c.get('timestamp', 0))
-            day = datetime.utcfromtimestamp(ts / 1000.0).date()
-            price = float(c.get('close', 0.0))
-            vol = float(c.get('volume', 0.0))
-            if day not in pv_cum:
-                pv_cum[day] = 0.0
-                v_cum[day] = 0.0
-            pv_cum[day] += price * vol
-            v_cum[day] += vol
-            vwap = (pv_cum[day] / v_cum[day]) if v_cum[day] > 0 else 0.0
-            diffs.append(price - vwap)
-        if len(diffs) < 2:
+        closes, _, _, volumes = ohlcv_columns(candles).T
+        return self._zscore_to_vwap_arrays(timestamp_column(candles), closes, volumes, lookback)
+
+    @staticmethod
+    def _zscore_to_vwap_arrays(
+        ts: np.ndarray, closes: np.ndarray, volumes: np.ndarray, lookback: int
+    ) -> float:
+        """Array form of `_zscore_to_vwap`; cumulative sums restart at each UTC day."""
+        n = len(ts)
+        if n < 2:
             return 0.0
-        arr = np.array(diffs, dtype=float)
+        w = min(lookback, n)
+        days = ts[-w:] // _MS_PER_DAY
+        price = closes[-w:]
+        pv = price * volumes[-w:]
+        vol = volumes[-w:]
+        pv_cum = np.empty(w, dtype=float)
+        v_cum = np.empty(w, dtype=float)
+        # Day boundaries within the window (bars are time-ordered)
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        ends = np.r_[starts[1:], w]
+        for a, b in zip(starts, ends):
+            pv_cum[a:b] = np.cumsum(pv[a:b])
+            v_cum[a:b] = np.cumsum(vol[a:b])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.where(v_cum > 0, pv_cum / v_cum, 0.0)
+        arr = price - vwap
         mu = float(np.mean(arr))
         sigma = float(np.std(arr))
         if sigma == 0.0:
@@ -286,23 +306,32 @@ class FeatureBuilder:
         """Compute Phase 1.1 indicators: RSI14, ATR14, session VWAP, z_vwap, rv_30m."""
         if not candles:
             return {"rsi14": 50.0, "atr14": 0.0, "vwap": 0.0, "z_vwap": 0.0, "rv_30m": 0.0}
-        closes = np.array([float(c['close']) for c in candles], dtype=float)
-        highs = np.array([float(c['high']) for c in candles], dtype=float)
-        lows = np.array([float(c['low']) for c in candles], dtype=float)
+        closes, highs, lows, volumes = ohlcv_columns(candles).T
+        return self._phase11_from_arrays(timestamp_column(candles), closes, highs, lows, volumes)
+
+    def _phase11_from_arrays(
+        self,
+        ts: np.ndarray,
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        volumes: np.ndarray,
+    ) -> Dict[str, float]:
+        """Phase 1.1 indicators from column arrays (requires at least 1 bar)."""
         # RSI(14)
         rsi_val = self._rsi_wilder(closes, self.window_rsi)
         # ATR(14)
         atr_val = self._atr_ewm(highs, lows, closes, self.window_atr)
         # Session VWAP
-        vwap_val = self._session_vwap_current(candles)
+        vwap_val = self._session_vwap_arrays(ts, closes, volumes)
         # Z-score to VWAP (50)
-        z_vwap_val = self._zscore_to_vwap(candles, self.window_z_vwap)
+        z_vwap_val = self._zscore_to_vwap_arrays(ts, closes, volumes, self.window_z_vwap)
         # Realized vol over last 30 bars
         rv_val = self._realized_vol(closes, self.window_rv)
         # Extras: CCI(20), StochRSI(14,3,3), MFI(14)
         cci_val = self._cci(highs, lows, closes, period=20)
         stoch_k, stoch_d = self._stochrsi(closes, rsi_period=14, k_period=3, d_period=3)
-        mfi_val = self._mfi(highs, lows, closes, np.array([float(c['volume']) for c in candles]), period=14)
+        mfi_val = self._mfi(highs, lows, closes, volumes, period=14)
         return {
             "rsi14": float(rsi_val),
             "atr14": float(atr_val),
@@ -325,23 +354,174 @@ class FeatureBuilder:
         Returns:
             Complete feature dictionary including baseline and expansion features
         """
-        # Compute baseline features
-        baseline_features = self.compute_baseline_features(candles)
-        
+        if not candles:
+            return self._latest_from_arrays(*_EMPTY_COLUMNS, symbol='unknown')
+        closes, highs, lows, volumes = ohlcv_columns(candles).T
+        return self._latest_from_arrays(
+            timestamp_column(candles), closes, highs, lows, volumes,
+            symbol=candles[-1].get('symbol', 'unknown'),
+        )
+
+    def compute_latest_arrays(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        timestamps: np.ndarray,
+        symbol: str = 'unknown',
+    ) -> Dict[str, Any]:
+        """
+        Compute all features for the latest data from column (SoA) arrays.
+
+        Equivalent to `compute_latest` on the same bars, without building
+        per-candle objects. Opens are not taken; no current indicator uses them.
+
+        Args:
+            highs, lows, closes, volumes: 1D float arrays, oldest bar first
+            timestamps: 1D int array of bar open times in epoch milliseconds
+            symbol: Symbol attached to the feature row
+
+        Returns:
+            Complete feature dictionary including baseline and expansion features
+        """
+        return self._latest_from_arrays(
+            np.asarray(timestamps, dtype=np.int64),
+            np.asarray(closes, dtype=float),
+            np.asarray(highs, dtype=float),
+            np.asarray(lows, dtype=float),
+            np.asarray(volumes, dtype=float),
+            symbol=symbol,
+        )
+
+    def compute_latest_batch(self, candles_by_symbol: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute latest features for several symbols in one call.
+
+        Baseline features are vectorized across symbols over a (n_symbols, n_bars)
+        matrix when every window has the same length; the remaining indicators are
+        computed per symbol. Results match `compute_latest` for each symbol.
+
+        Args:
+            candles_by_symbol: Mapping of symbol -> list of candle dictionaries
+
+        Returns:
+            Mapping of symbol -> feature dictionary (same shape as `compute_latest`)
+        """
+        symbols = list(candles_by_symbol)
+        if not symbols:
+            return {}
+        lengths = {len(candles_by_symbol[s]) for s in symbols}
+        n = lengths.pop() if len(lengths) == 1 else 0
+        if n < 2:
+            return {s: self.compute_latest(candles_by_symbol[s]) for s in symbols}
+
+        ohlcv = np.stack([ohlcv_columns(candles_by_symbol[s]) for s in symbols])
+        ts = np.stack([timestamp_column(candles_by_symbol[s]) for s in symbols])
+        return self.compute_latest_batch_arrays(
+            ohlcv[:, :, 1], ohlcv[:, :, 2], ohlcv[:, :, 0], ohlcv[:, :, 3], ts,
+            symbols=[candles_by_symbol[s][-1].get('symbol', 'unknown') for s in symbols],
+            keys=symbols,
+        )
+
+    def compute_latest_batch_arrays(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        timestamps: np.ndarray,
+        symbols: List[str],
+        keys: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Batched `compute_latest_arrays` over 2D (n_symbols, n_bars) column arrays.
+
+        Row i belongs to `symbols[i]`; results are keyed by `keys` (defaults to
+        `symbols`). Requires at least 2 bars per row.
+        """
+        closes = np.asarray(closes, dtype=float)
+        highs = np.asarray(highs, dtype=float)
+        lows = np.asarray(lows, dtype=float)
+        volumes = np.asarray(volumes, dtype=float)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if timestamps.ndim == 1:
+            timestamps = np.broadcast_to(timestamps, closes.shape)
+        baselines = self._baseline_features_batch(closes, highs, lows, volumes)
+        return {
+            key: self._latest_from_arrays(
+                timestamps[i], closes[i], highs[i], lows[i], volumes[i],
+                symbol=symbols[i], baseline=baselines[i],
+            )
+            for i, key in enumerate(keys if keys is not None else symbols)
+        }
+
+    def _baseline_features_batch(
+        self, closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray
+    ) -> List[Dict[str, float]]:
+        """Row-wise equivalent of `compute_baseline_features` over 2D (symbols, bars) arrays."""
+        current_price = closes[:, -1]
+        prev_close = closes[:, -2]
+        price_change = current_price - prev_close
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_change_pct = np.where(prev_close != 0, (price_change / prev_close) * 100, 0.0)
+            high_low_range = highs[:, -1] - lows[:, -1]
+            high_low_range_pct = np.where(
+                current_price != 0, (high_low_range / current_price) * 100, 0.0
+            )
+            current_volume = volumes[:, -1]
+            avg_volume = np.mean(volumes[:, -20:], axis=1)
+            volume_ratio = np.where(avg_volume != 0, current_volume / avg_volume, 1.0)
+        return [
+            {
+                "price": current_price[i],
+                "price_change": price_change[i],
+                "price_change_pct": price_change_pct[i],
+                "high_low_range": high_low_range[i],
+                "high_low_range_pct": high_low_range_pct[i],
+                "volume": current_volume[i],
+                "avg_volume": avg_volume[i],
+                "volume_ratio": volume_ratio[i],
+            }
+            for i in range(closes.shape[0])
+        ]
+
+    def _latest_from_arrays(
+        self,
+        ts: np.ndarray,
+        closes: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        volumes: np.ndarray,
+        symbol: str,
+        baseline: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, Any]:
+        """Merge baseline, expansion and Phase 1.1 features and attach metadata."""
+        n = len(closes)
+        if baseline is None:
+            if n < 2:
+                baseline = self._empty_baseline_features()
+            else:
+                baseline = self._baseline_from_arrays(closes, highs, lows, volumes)
         # Compute expansion features
-        expansion_features = self.compute_expansion_features(candles)
+        expansion_features = (
+            self._expansion_from_arrays(closes, highs, lows, volumes, int(ts[-1])) if n >= 2 else {}
+        )
         # Compute Phase 1.1 baseline indicators
-        phase11 = self.compute_phase11_features(candles)
+        if n:
+            phase11 = self._phase11_from_arrays(ts, closes, highs, lows, volumes)
+        else:
+            phase11 = {"rsi14": 50.0, "atr14": 0.0, "vwap": 0.0, "z_vwap": 0.0, "rv_30m": 0.0}
         
         # Combine all features
-        all_features = {**baseline_features, **expansion_features, **phase11}
+        all_features = {**baseline, **expansion_features, **phase11}
         
         # Add metadata
-        if candles:
-            all_features['timestamp'] = candles[-1].get('timestamp', 0)
-            all_features['symbol'] = candles[-1].get('symbol', 'unknown')
+        if n:
+            all_features['timestamp'] = int(ts[-1])
+            all_features['symbol'] = symbol
         
-        logger.debug(f"Computed {len(all_features)} features for {len(candles)} candles")
+        logger.debug(f"Computed {len(all_features)} features for {n} candles")
         return all_features
     
     def _empty_baseline_features(self) -> Dict[str, float]:
@@ -1,12 +1,49 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence
 import os
+import numpy as np
 import pandas as pd
-from ..exec.model import Position, Fill, Trade, LedgerRow
+from .._njit import HAVE_NUMBA, njit
+from ..exec.model import Position, Fill, FillColumns, Trade, LedgerRow
 from ..metrics.exec import get_realized_pnl_total, get_equity_gauge, get_account_equity_usd
 
 
+@njit(cache=True)
+def _apply_fills(qty, price, fee, pos_qty, pos_avg):
+    """Run the `Ledger.on_fill` position recurrence over one symbol's fills.
+
+    Returns (realized per fill, final qty, final avg price).
+    """
+    realized = np.empty(qty.shape[0])
+    for i in range(qty.shape[0]):
+        q = qty[i]
+        if pos_qty == 0.0:
+            pos_qty = q
+            pos_avg = price[i]
+            realized[i] = -fee[i]
+        elif (pos_qty > 0 and q > 0) or (pos_qty < 0 and q < 0):
+            new_qty = pos_qty + q
+            if new_qty != 0:
+                pos_avg = (pos_avg * abs(pos_qty) + price[i] * abs(q)) / abs(new_qty)
+            pos_qty = new_qty
+            realized[i] = -fee[i]
+        else:
+            reduce_qty = min(abs(pos_qty), abs(q))
+            direction = 1.0 if pos_qty > 0 else -1.0
+            realized[i] = (price[i] - pos_avg) * (reduce_qty * direction) - fee[i]
+            pos_qty = pos_qty + q
+            if pos_qty == 0:
+                pos_avg = 0.0
+    return realized, pos_qty, pos_avg
+
+
+if HAVE_NUMBA:  # pragma: no cover - compile once at import, not on the first batch
+    _w = np.ones(1)
+    _apply_fills(_w, _w, _w, 0.0, 0.0)
+    del _w
+
+
 class Ledger:
     def __init__(self, equity_start: float = 10_000.0):
         self.positions: Dict[str, Position] = {}
@@ -69,6 +106,50 @@ class Ledger:
             )
         )
 
+    def on_fills_batch(self, fc: FillColumns, symbols: Sequence[str], record_trades: bool = True) -> np.ndarray:
+        """Apply a column-wise batch of fills; equivalent to `on_fill` per row in order.
+
+        Rows are grouped per symbol (stable, so each symbol keeps its fill order)
+        and replayed by one kernel per symbol. Returns realized PnL per row.
+        With `record_trades=False` no per-fill `Trade` objects are built.
+        """
+        qty = np.asarray(fc.qty, dtype=np.float64)
+        price = np.asarray(fc.price, dtype=np.float64)
+        fee = np.asarray(fc.fee_usd, dtype=np.float64)
+        sid = np.asarray(fc.symbol_id)
+        realized = np.zeros(qty.shape[0])
+        order = np.argsort(sid, kind="stable")
+        uniq, starts = np.unique(sid[order], return_index=True)
+        for s_id, idx in zip(uniq, np.split(order, starts[1:])):
+            symbol = symbols[int(s_id)]
+            pos = self._get_pos(symbol)
+            r, pos.qty, pos.avg_price = _apply_fills(qty[idx], price[idx], fee[idx], pos.qty, pos.avg_price)
+            pos.qty, pos.avg_price = float(pos.qty), float(pos.avg_price)
+            realized[idx] = r
+            self.positions[symbol] = pos
+            gains = float(r[r > 0].sum())
+            if gains > 0:
+                self._realized_counter.labels(symbol).inc(gains)
+        self.realized_total += float(realized.sum())
+        if record_trades:
+            ts = np.asarray(fc.ts)
+            for i in range(qty.shape[0]):
+                q = float(qty[i])
+                self.trades.append(
+                    Trade(
+                        ts=int(ts[i]),
+                        symbol=symbols[int(sid[i])],
+                        side="buy" if q > 0 else "sell",
+                        qty=q,
+                        price=float(price[i]),
+                        fee=float(fee[i]),
+                        fee_currency="USD",
+                        fee_usd=float(fee[i]),
+                        realized_pnl=float(realized[i]),
+                    )
+                )
+        return realized
+
     def mark_to_market(self, ts: int, price_by_symbol: Dict[str, float]) -> None:
         unreal_total = 0.0
         for sym, pos in self.positions.items():
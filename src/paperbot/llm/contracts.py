@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import List, Literal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
 
 
 Market = Literal["crypto", "stocks"]
@@ -12,7 +12,8 @@ class Decision(BaseModel):
     run_id: str
     ts: int
     market: Market
-    symbol: str
+    # Constraints are declarative so pydantic-core checks them without Python callbacks
+    symbol: str = Field(min_length=1)
     side: Side
     size: float = Field(ge=0)
     max_notional_usd: float = Field(ge=0)
@@ -31,10 +32,3 @@ class Decision(BaseModel):
     slippage_model: str = ""
     profile: str = ""
 
-    @field_validator("symbol")
-    @classmethod
-    def non_empty(cls, v: str):
-        if not v:
-            raise ValueError("symbol required")
-        return v
-
@@ -25,7 +25,7 @@ def output_validate(
     confidence_floor: float,
     max_notional_usd: float,
 ) -> Decision:
-    d = Decision(**dec)
+    d = Decision.model_validate(dec)
     if d.symbol not in allow_symbols:
         raise ValueError("symbol not allowed")
     if d.market != market or d.symbol != symbol:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 import sqlite3
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, Tuple
 
 
 DDL = """
@@ -23,28 +23,53 @@ CREATE TABLE IF NOT EXISTS decisions (
 
 
 class SQLiteStore:
+    """Decision memory in SQLite.
+
+    One connection is kept open for the store's lifetime, in WAL mode with
+    synchronous=NORMAL, so each commit appends to the WAL without a full fsync.
+    """
+
     def __init__(self, path: str = "data/memory.sqlite"):
         os.makedirs(os.path.dirname(path), exist_ok=True)
         self.path = path
-        with sqlite3.connect(self.path) as con:
-            con.execute(DDL)
+        self._con = sqlite3.connect(self.path)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        with self._con:
+            self._con.execute(DDL)
 
     def insert(self, rec: Dict[str, Any]) -> None:
-        with sqlite3.connect(self.path) as con:
-            con.execute(
-                "INSERT INTO decisions(run_id,ts,market,symbol,side,size,max_notional_usd,confidence,reason,ttl_s,json) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
-                (
-                    rec.get("run_id"),
-                    rec.get("ts"),
-                    rec.get("market"),
-                    rec.get("symbol"),
-                    rec.get("side"),
-                    float(rec.get("size", 0.0)),
-                    float(rec.get("max_notional_usd", 0.0)),
-                    float(rec.get("confidence", 0.0)),
-                    ",".join(rec.get("reason", [])),
-                    int(rec.get("ttl_s", 0)),
-                    str(rec),
-                ),
-            )
+        self.insert_many([rec])
+
+    def insert_many(self, recs: Iterable[Dict[str, Any]]) -> None:
+        """Insert several decision records in a single transaction."""
+        rows = [_row(rec) for rec in recs]
+        if not rows:
+            return
+        with self._con:
+            self._con.executemany(INSERT_SQL, rows)
+
+    def close(self) -> None:
+        self._con.close()
+
+
+INSERT_SQL = (
+    "INSERT INTO decisions(run_id,ts,market,symbol,side,size,max_notional_usd,confidence,reason,ttl_s,json) "
+    "VALUES (?,?,?,?,?,?,?,?,?,?,?)"
+)
+
 
+def _row(rec: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        rec.get("run_id"),
+        rec.get("ts"),
+        rec.get("market"),
+        rec.get("symbol"),
+        rec.get("side"),
+        float(rec.get("size", 0.0)),
+        float(rec.get("max_notional_usd", 0.0)),
+        float(rec.get("confidence", 0.0)),
+        ",".join(rec.get("reason", [])),
+        int(rec.get("ttl_s", 0)),
+        str(rec),
+    )
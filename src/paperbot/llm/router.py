@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import yaml
+from ..config.yaml_cache import safe_load
 from typing import Any, Dict
 from .providers.gemini import GeminiClient
 from .providers.local_openai import LocalOpenAIClient
@@ -8,7 +8,7 @@ from .providers.local_openai import LocalOpenAIClient
 
 def load_llm_config(path: str = "config/llm.yaml") -> Dict[str, Any]:
     with open(path, "r") as f:
-        return yaml.safe_load(f) or {}
+        return safe_load(f) or {}
 
 
 def get_client(cfg: Dict[str, Any]):
@@ -2,24 +2,27 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 import time
 
+from ..metrics.exec import _safe_counter
+
 try:
-    from ..metrics.exec import _safe_counter  # type: ignore
+    import orjson
 except Exception:  # pragma: no cover
-    _safe_counter = None
+    orjson = None  # type: ignore
+
+
+def _dumps(obj: Dict[str, Any]) -> bytes:
+    """Compact UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 
 def _get_append_counters():
-    if _safe_counter is None:  # pragma: no cover
-        class _NoOp:
-            def labels(self, *a, **k):
-                return self
-            def inc(self, *a, **k):
-                return None
-        return _NoOp(), _NoOp()
+    # _safe_counter falls back to NULL_METRIC when metrics are disabled or unusable
     app = _safe_counter("decision_log_appends_total", "Decision records appended", ["market"])
     err = _safe_counter("decision_log_errors_total", "Decision log errors", ["reason", "market"])
     return app, err
@@ -44,15 +47,68 @@ def append_jsonl(path: str, rec: Dict[str, Any]) -> None:
     if missing:
         err.labels("missing_fields", market).inc()
         return
-    os.makedirs(os.path.dirname(path), exist_ok=True)
     try:
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(_dumps(rec) + b"\n")
         app.labels(market).inc()
     except Exception:
         err.labels("io_error", market).inc()
 
 
+def append_jsonl_many(path: str, recs: List[Dict[str, Any]]) -> None:
+    """Append several records with one open and one write (same checks as `append_jsonl`)."""
+    app, err = _get_append_counters()
+    valid: List[Dict[str, Any]] = []
+    appended: Dict[str, int] = {}
+    for rec in recs:
+        market = str(rec.get("market", "unknown"))
+        if validate_record(rec):
+            err.labels("missing_fields", market).inc()
+            continue
+        valid.append(rec)
+        appended[market] = appended.get(market, 0) + 1
+    if not valid:
+        return
+    try:
+        lines = [_dumps(rec) for rec in valid]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(b"\n".join(lines) + b"\n")
+        for market, n in appended.items():
+            app.labels(market).inc(n)
+    except Exception:
+        for market, n in appended.items():
+            err.labels("io_error", market).inc(n)
+
+
+def _pattern_payload(
+    event_type: str,
+    market: str,
+    symbol: str,
+    pattern: str,
+    rsi: Optional[float] = None,
+    side: Optional[str] = None,
+    ts: Optional[int] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    payload: Dict[str, Any] = {
+        "event": str(event_type),
+        "market": str(market),
+        "symbol": str(symbol),
+        "pattern": str(pattern),
+        "rsi": float(rsi) if rsi is not None else None,
+        "side": str(side) if side is not None else None,
+        "ts": int(ts if ts is not None else int(time.time() * 1000)),
+        "severity": "INFO",
+        "component": "strategy",
+        "schema_version": "v1",
+    }
+    if extra:
+        payload["extra"] = extra
+    return _dumps(payload).decode("utf-8")
+
+
 def log_pattern_event(
     event_type: str,
     market: str,
@@ -69,21 +125,29 @@ def log_pattern_event(
     """
     try:
         logger = logging.getLogger("paperbot.strategy")
-        payload: Dict[str, Any] = {
-            "event": str(event_type),
-            "market": str(market),
-            "symbol": str(symbol),
-            "pattern": str(pattern),
-            "rsi": float(rsi) if rsi is not None else None,
-            "side": str(side) if side is not None else None,
-            "ts": int(ts if ts is not None else int(time.time() * 1000)),
-            "severity": "INFO",
-            "component": "strategy",
-            "schema_version": "v1",
-        }
-        if extra:
-            payload["extra"] = extra
-        logger.info(json.dumps(payload, separators=(",", ":")))
+        # Skip building the JSON payload when INFO is filtered out
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(_pattern_payload(event_type, market, symbol, pattern, rsi, side, ts, extra))
+    except Exception:
+        # Logging must never throw
+        pass
+
+
+def log_pattern_events(events: List[Tuple[tuple, Dict[str, Any]]]) -> None:
+    """Emit several queued pattern events, one single-line JSON record each.
+
+    Each item is the `(args, kwargs)` that would be passed to `log_pattern_event`.
+    The logger level is checked once for the whole batch; records stay one
+    event each so Loki's `| json` parsing keeps working.
+    """
+    try:
+        logger = logging.getLogger("paperbot.strategy")
+        if not events or not logger.isEnabledFor(logging.INFO):
+            return
+        info = logger.info
+        for args, kwargs in events:
+            info(_pattern_payload(*args, **kwargs))
     except Exception:
         # Logging must never throw
         pass
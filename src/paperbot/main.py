@@ -17,78 +17,295 @@ Key related modules:
 - `paperbot.data.candles.CandleFetcher`
 - `paperbot.features.feature_builder.FeatureBuilder`
 """
+import dataclasses
+import json
 import logging
 import os
-import yaml
 import time
-import threading
-from paperbot.config.loader import load_settings
+from itertools import islice
+from paperbot.config.loader import load_settings, load_exchange_profile
+from paperbot.config.yaml_cache import load_yaml_cached
+from paperbot.metrics.core import scrape_registry
+from paperbot.data.model import Candle
 from paperbot.features.feature_builder import FeatureBuilder
+from paperbot.runtime.ticker import get_scheduler
 from prometheus_client import start_http_server, Counter
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional fast JSON encoder
+    orjson = None  # type: ignore
+
+# Strategy and execution modules are resolved once at import time; a failure
+# is recorded and reported by main() instead of breaking the import.
+try:
+    from paperbot.strategies.base import Signal
+    from paperbot.strategies.mr import MeanReversionStrategy
+    from paperbot.strategies.momentum import MomentumStrategy
+    from paperbot.strategies.runner import (
+        StrategyRunner,
+        record_pattern_detected,
+        record_pattern_intent,
+    )
+    _STRATEGIES_IMPORT_ERROR: Optional[Exception] = None
+except Exception as e:  # pragma: no cover
+    Signal = MeanReversionStrategy = MomentumStrategy = StrategyRunner = None  # type: ignore
+    record_pattern_detected = record_pattern_intent = None  # type: ignore
+    _STRATEGIES_IMPORT_ERROR = e
+
+try:
+    from paperbot.exec.simulator import ExecutionSimulator
+    from paperbot.risk.engine import RiskEngine
+    from paperbot.ledger.ledger import Ledger
+    from paperbot.metrics.exec import set_equity_gauges, get_mtm_tick_total
+    from paperbot.logs.decision_log import append_jsonl
+    _EXEC_IMPORT_ERROR: Optional[Exception] = None
+except Exception as e:  # pragma: no cover
+    ExecutionSimulator = RiskEngine = Ledger = None  # type: ignore
+    set_equity_gauges = get_mtm_tick_total = append_jsonl = None  # type: ignore
+    _EXEC_IMPORT_ERROR = e
+
+try:
+    from paperbot.llm.router import load_llm_config, get_client
+    from paperbot.llm.guards import output_validate
+    from paperbot.llm.memory.sqlite_store import SQLiteStore
+    from paperbot.metrics.llm import (
+        get_llm_calls_total,
+        inc_decision,
+        get_decisions_confidence_hist,
+    )
+except Exception:  # pragma: no cover - advisory demo is skipped when unavailable
+    load_llm_config = get_client = output_validate = SQLiteStore = None  # type: ignore
+    get_llm_calls_total = inc_decision = get_decisions_confidence_hist = None  # type: ignore
+
+try:
+    from paperbot.data.candles import CandleFetcher
+except Exception:  # pragma: no cover - ccxt only needed for online mode
+    CandleFetcher = None  # type: ignore
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a log payload (dict or dataclass) to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    if dataclasses.is_dataclass(obj):
+        obj = dataclasses.asdict(obj)
+    return json.dumps(obj, default=str)
+
+
+def _env_num(name: str, default, cast, raw: Optional[str] = None):
+    """Parse a numeric env knob, falling back to `default` (with a warning) if malformed."""
+    raw = os.getenv(name) if raw is None else raw
+    if raw is None:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        logging.warning("invalid %s=%r; using default %r", name, raw, default)
+        return default
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class EnvCfg:
+    """One-shot snapshot of the environment variables read by main()."""
+    prometheus_port: int
+    offline_demo: bool
+    pattern_obs_demo: bool
+    pattern_obs_demo_seconds: int
+    app_track: str
+    decision_log_path: str
+    hold_metrics_seconds: int
+    mtm_tick_seconds: int
+    enable_mtm_tick: Optional[str]
+    equity_start_usd: float
+
+    @classmethod
+    def from_env(cls) -> "EnvCfg":
+        getenv = os.getenv
+        return cls(
+            prometheus_port=int(getenv("PROMETHEUS_PORT", "8000")),
+            offline_demo=getenv("OFFLINE_DEMO", "0") == "1",
+            pattern_obs_demo=getenv("ENABLE_PATTERN_OBS_DEMO", "0") == "1",
+            pattern_obs_demo_seconds=_env_num("PATTERN_OBS_DEMO_SECONDS", 15, int),
+            app_track=getenv("APP_TRACK", "crypto"),
+            decision_log_path=getenv("DECISION_LOG_PATH", "data/decisions/phase2.jsonl"),
+            hold_metrics_seconds=_env_num("HOLD_METRICS_SECONDS", 0, int),
+            mtm_tick_seconds=_env_num("MTM_TICK_SECONDS", 15, int, getenv("MTM_TICK_SECONDS", getenv("EQUITY_TICK_SECONDS"))),
+            enable_mtm_tick=getenv("ENABLE_MTM_TICK"),
+            equity_start_usd=_env_num("EQUITY_START_USD", 10000.0, float),
+        )
+
+    def mtm_tick_enabled(self, default: bool) -> bool:
+        """ENABLE_MTM_TICK == "1", with a mode-specific default when unset."""
+        if self.enable_mtm_tick is None:
+            return default
+        return self.enable_mtm_tick == "1"
+
+
+_llm_ctx: Optional[Dict[str, Any]] = None
+
+
+def _get_llm_ctx() -> Dict[str, Any]:
+    """Build (once) the LLM advisory client, store, metrics and guard parameters."""
+    global _llm_ctx
+    if _llm_ctx is None:
+        llm_cfg = load_llm_config()
+        client = get_client(llm_cfg)
+        client_name = type(client).__name__.lower()
+        calls = get_llm_calls_total()
+        _llm_ctx = {
+            "client": client,
+            "store": SQLiteStore(),
+            "calls_ok": calls.labels(client_name, "true"),
+            "calls_err": calls.labels(client_name, "false"),
+            "dhist": get_decisions_confidence_hist(),
+            "allow": llm_cfg.get("symbol_allowlist", []),
+            "conf_floor": float(llm_cfg.get("confidence_floor", 0.6)),
+            "max_notional": float(llm_cfg.get("max_notional_usd", 200.0)),
+        }
+    return _llm_ctx
+
+
+def _run_llm_advisory(symbols: List[str]) -> bool:
+    """Run the advisory-only LLM decision pass over `symbols` plus a stocks symbol.
+
+    Decisions are validated, stored and counted; nothing is executed. Returns
+    False when the LLM stack is unavailable or fails to initialize.
+    """
+    try:
+        llm = _get_llm_ctx()
+    except Exception:
+        return False
+    client = llm["client"]
+    store = llm["store"]
+    calls_ok = llm["calls_ok"]
+    calls_err = llm["calls_err"]
+    dhist = llm["dhist"]
+    allow = llm["allow"]
+    conf_floor = llm["conf_floor"]
+    max_notional = llm["max_notional"]
+    # include a stocks symbol in advisory check
+    symbols_all = list(symbols) + ["AAPL"]
+    market_of = {s: ("stocks" if s.isalpha() else "crypto") for s in symbols_all}
+    base_ctx = {"max_notional_usd": max_notional}
+    rows: List[Dict[str, Any]] = []
+    for symbol in symbols_all:
+        market = market_of[symbol]
+        ctx = {**base_ctx, "symbol": symbol, "market": market}
+        try:
+            dec = client.generate_decision({}, ctx)
+            calls_ok.inc()
+            dec_valid = output_validate(
+                dec, allow, market, symbol, conf_floor, max_notional
+            )
+            row = dec_valid.model_dump()
+            rows.append(row)
+            inc_decision(market, symbol, dec_valid.side)
+            dhist.labels(market).observe(dec_valid.confidence)
+            logging.info("decision: %s", _dumps(row))
+        except Exception:
+            calls_err.inc()
+            continue
+    # One transaction for the whole advisory pass
+    try:
+        store.insert_many(rows)
+    except Exception:
+        logging.warning("failed to persist %d advisory decisions", len(rows))
+    logging.info("llm advisory demo complete")
+    return True
+
+
+# Feature overrides used by the offline demo to force strategy entries/exits
+_FORCED_ENTER = {"z_vwap": -1.7, "rsi14": 62.0, "rv_30m": 0.01}
+_FORCED_EXIT = {"z_vwap": -0.2, "rsi14": 61.0, "rv_30m": 0.01}
+
+
+def now_ms() -> int:
+    """Current wall-clock time in epoch milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+def _fmt(value: Any) -> str:
+    """Format a numeric feature with two decimals; 'N/A' when missing."""
+    return "N/A" if value is None else f"{value:.2f}"
+
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    envcfg = EnvCfg.from_env()
     # Resolve settings from YAML + environment; errors if API creds missing
     settings = load_settings()
     env_prefix = f"{settings.exchange.upper()}_{settings.environment.replace('-', '_').upper()}"
-    logging.info(f"Resolved env prefix: {env_prefix}")
-    logging.info(f"Exchange: {settings.exchange}, Environment: {settings.environment}")
+    logging.info("Resolved env prefix: %s", env_prefix)
+    logging.info("Exchange: %s, Environment: %s", settings.exchange, settings.environment)
     
     # Load config for feature builder (feature toggles, etc.)
-    with open("config/config.yaml", "r") as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_cached("config/config.yaml")
     
     # Start Prometheus metrics server
-    prom_port = int(os.getenv("PROMETHEUS_PORT", "8000"))
+    prom_port = envcfg.prometheus_port
     try:
-        start_http_server(prom_port)
-        logging.info(f"Prometheus metrics server started on :{prom_port}")
+        start_http_server(prom_port, registry=scrape_registry())
+        logging.info("Prometheus metrics server started on :%s", prom_port)
     except OSError as e:
-        logging.warning(f"Failed to start Prometheus server on :{prom_port}: {e}")
+        logging.warning("Failed to start Prometheus server on :%s: %s", prom_port, e)
 
     # Optional: Phase 2.5 Pattern Observability demo emitter (env-gated)
-    if os.getenv("ENABLE_PATTERN_OBS_DEMO", "0") == "1":
-        try:
-            from paperbot.strategies.runner import record_pattern_detected, record_pattern_intent
-        except Exception:
-            record_pattern_detected = record_pattern_intent = None  # type: ignore
-
-        interval_s = int(os.getenv("PATTERN_OBS_DEMO_SECONDS", "15"))
-
-        def _pattern_demo_loop():
-            symbol = "BTC/USDT"
-            market = os.getenv("APP_TRACK", "crypto")
-            pattern = "bullish_engulfing"
-            rsi_val: Optional[float] = 33.0
-            while True:
-                try:
-                    ts_det = int(time.time() * 1000)
-                    if record_pattern_detected is not None:
-                        record_pattern_detected(market, symbol, pattern, rsi_val or 0.0, ts_det)
-                    # Simulate small processing delay before intent
-                    time.sleep(0.5)
-                    ts_int = int(time.time() * 1000)
-                    if record_pattern_intent is not None:
-                        record_pattern_intent(market, symbol, pattern, "long", ts_det, ts_int)
-                except Exception:
-                    pass
-                time.sleep(max(1, interval_s))
-
-        threading.Thread(target=_pattern_demo_loop, daemon=True).start()
+    if envcfg.pattern_obs_demo:
+        interval_s = envcfg.pattern_obs_demo_seconds
+
+        symbol = "BTC/USDT"
+        market = envcfg.app_track
+        pattern = "bullish_engulfing"
+        rsi_val: Optional[float] = 33.0
+
+        def _pattern_demo_tick():
+            ts_det = now_ms()
+            if record_pattern_detected is not None:
+                record_pattern_detected(market, symbol, pattern, rsi_val or 0.0, ts_det)
+
+            def _emit_intent():
+                ts_int = now_ms()
+                if record_pattern_intent is not None:
+                    record_pattern_intent(market, symbol, pattern, "long", ts_det, ts_int)
+
+            # Simulate small processing delay before intent
+            get_scheduler().call_later(0.5, _emit_intent)
+
+        get_scheduler().every(0.5 + max(1, interval_s), _pattern_demo_tick)
         logging.info("Pattern observability demo enabled (ENABLE_PATTERN_OBS_DEMO=1)")
 
     # Define metrics
     CANDLES_FETCHED = Counter("candles_fetched_total", "Candles fetched", ["symbol"]) 
     FEATURES_COMPUTED = Counter("features_computed_total", "Features computed", ["symbol"]) 
-    SIGNALS_EMITTED = Counter("signals_emitted_total", "Signals emitted", ["strat", "side", "symbol"]) 
+    SIGNALS_EMITTED = Counter("signals_emitted_total", "Signals emitted", ["strat", "side"]) 
     SIGNALS_SUPPRESSED = Counter("signals_suppressed_total", "Signals suppressed", ["strat", "reason"]) 
+    # Pre-bind per-symbol children so hot loops skip the labels() lookup
+    candles_child = {s: CANDLES_FETCHED.labels(s) for s in settings.symbols}
+    features_child = {s: FEATURES_COMPUTED.labels(s) for s in settings.symbols}
+    # Skip building candle log payloads when INFO is filtered out
+    log_info_on = logging.getLogger().isEnabledFor(logging.INFO)
 
     # Feature computation pipeline (fetcher is created later if needed)
     feature_builder = FeatureBuilder(config)
 
+    # Prepare strategies once; shared by the offline demo and online modes
+    strategies_cfg = config.get("strategies", {})
+    enabled_strategies = []
+    if _STRATEGIES_IMPORT_ERROR is not None:
+        logging.warning("Failed to import strategies: %s", _STRATEGIES_IMPORT_ERROR)
+        strategies_cfg = {}
+
+    if strategies_cfg:
+        if strategies_cfg.get("mr", {}).get("enabled", False):
+            enabled_strategies.append(MeanReversionStrategy(strategies_cfg.get("mr", {})))
+        if strategies_cfg.get("momentum", {}).get("enabled", False):
+            enabled_strategies.append(MomentumStrategy(strategies_cfg.get("momentum", {})))
+    runner = StrategyRunner(enabled_strategies, signals_counter=SIGNALS_EMITTED, suppressed_counter=SIGNALS_SUPPRESSED)
+
     # Optional OFFLINE_DEMO mode: generate synthetic candles, avoid network
-    if os.getenv("OFFLINE_DEMO", "0") == "1":
+    if envcfg.offline_demo:
         logging.info("OFFLINE_DEMO=1: using synthetic candles")
         try:
             import numpy as np  # local import to keep main lean
@@ -97,168 +314,141 @@ def main() -> None:
             np = None
 
         candle_logs_remaining = 10
-        now_ms = int(time.time() * 1000)
+        demo_ts = now_ms()
         timeframe_ms = 60_000  # assumes 1m timeframe for demo
 
-        # Prepare strategies
-        strategies_cfg = config.get("strategies", {})
-        enabled_strategies = []
-        try:
-            from paperbot.strategies.mr import MeanReversionStrategy
-            from paperbot.strategies.momentum import MomentumStrategy
-            from paperbot.strategies.runner import StrategyRunner
-        except Exception as e:
-            logging.warning(f"Failed to import strategies: {e}")
-            strategies_cfg = {}
-
-        if strategies_cfg:
-            if strategies_cfg.get("mr", {}).get("enabled", False):
-                enabled_strategies.append(MeanReversionStrategy(strategies_cfg.get("mr", {})))
-            if strategies_cfg.get("momentum", {}).get("enabled", False):
-                enabled_strategies.append(MomentumStrategy(strategies_cfg.get("momentum", {})))
-        runner = StrategyRunner(enabled_strategies, signals_counter=SIGNALS_EMITTED, suppressed_counter=SIGNALS_SUPPRESSED)
-
         signals_remaining = 3
         forced_done = False
-        for symbol in settings.symbols:
-            # create ~20 synthetic candles per symbol
-            candles = []
-            price = 100.0
-            for i in range(20):
-                if np is not None:
-                    price += float(np.random.normal(0.0, 0.5))
-                    o = price + float(np.random.normal(0.0, 0.1))
-                    h = max(o, price) + 0.5
-                    l = min(o, price) - 0.5
-                    v = abs(float(np.random.normal(100.0, 10.0)))
-                else:
-                    # deterministic fallback
-                    o = price
-                    h = o + 0.5
-                    l = o - 0.5
-                    v = 100.0
-                candles.append({
-                    "timestamp": now_ms - (19 - i) * timeframe_ms,
-                    "open": o,
-                    "high": h,
-                    "low": l,
-                    "close": price,
-                    "volume": v,
-                    "symbol": symbol,
-                })
-
+        # Synthesize (symbols, bars) OHLCV column arrays in one pass
+        n_bars = 20
+        n_symbols = len(settings.symbols)
+        ts_row = [demo_ts - (n_bars - 1 - i) * timeframe_ms for i in range(n_bars)]
+        if np is not None:
+            rng = np.random.default_rng()
+            closes = 100.0 + rng.normal(0.0, 0.5, (n_symbols, n_bars)).cumsum(axis=1)
+            opens = closes + rng.normal(0.0, 0.1, (n_symbols, n_bars))
+            highs = np.maximum(opens, closes) + 0.5
+            lows = np.minimum(opens, closes) - 0.5
+            vols = np.abs(rng.normal(100.0, 10.0, (n_symbols, n_bars)))
+        else:
+            # deterministic fallback
+            opens = closes = vols = [[100.0] * n_bars] * n_symbols
+            highs = [[100.5] * n_bars] * n_symbols
+            lows = [[99.5] * n_bars] * n_symbols
+
+        for i, symbol in enumerate(settings.symbols):
             # Emit exactly 10 normalized candles across symbols
-            for c in candles:
-                if candle_logs_remaining <= 0:
-                    break
-                normalized = {
-                    "ts": c.get("timestamp"),
-                    "o": c.get("open"),
-                    "h": c.get("high"),
-                    "l": c.get("low"),
-                    "c": c.get("close"),
-                    "v": c.get("volume"),
-                    "timeframe": settings.timeframe,
-                    "symbol": symbol,
-                }
-                logging.info(f"candle: {normalized}")
-                CANDLES_FETCHED.labels(symbol).inc()
-                candle_logs_remaining -= 1
-
-            # Compute features and increment metrics
-            features = feature_builder.compute_latest(candles)
-            logging.info(f"{symbol} features: {features}")
-            FEATURES_COMPUTED.labels(symbol).inc()
+            take = min(n_bars, candle_logs_remaining)
+            if log_info_on:
+                for j in range(take):
+                    normalized = {
+                        "ts": ts_row[j],
+                        "o": float(opens[i][j]),
+                        "h": float(highs[i][j]),
+                        "l": float(lows[i][j]),
+                        "c": float(closes[i][j]),
+                        "v": float(vols[i][j]),
+                        "timeframe": settings.timeframe,
+                        "symbol": symbol,
+                    }
+                    logging.info("candle: %s", normalized)
+            if take:
+                candles_child[symbol].inc(take)
+            candle_logs_remaining -= take
+
+        # Compute features for all symbols in one batched call straight from the column arrays
+        if np is not None:
+            features_by_symbol = feature_builder.compute_latest_batch_arrays(
+                highs, lows, closes, vols, np.asarray(ts_row, dtype=np.int64),
+                symbols=list(settings.symbols),
+            )
+        else:
+            features_by_symbol = feature_builder.compute_latest_batch({
+                symbol: [
+                    Candle(ts_row[j], opens[i][j], highs[i][j], lows[i][j], closes[i][j], vols[i][j], symbol)
+                    for j in range(n_bars)
+                ]
+                for i, symbol in enumerate(settings.symbols)
+            })
+        for symbol, features in features_by_symbol.items():
+            logging.info("%s features: %s", symbol, features)
+            features_child[symbol].inc()
 
             # Run strategies and log up to 10 signals across all symbols
             if enabled_strategies and signals_remaining > 0:
                 signals = runner.on_feature_row(features)
-                for sig in signals:
-                    if signals_remaining <= 0:
-                        break
-                    logging.info(f"strategy signal: {sig.__dict__}")
-                    signals_remaining -= 1
+                take = min(len(signals), signals_remaining)
+                for sig in signals[:take]:
+                    logging.info("strategy signal: %s", _dumps(sig))
+                signals_remaining -= take
 
             # Deterministic forced signals (once) to demonstrate Phase 1.2
             if enabled_strategies and not forced_done and signals_remaining > 0:
                 # Force MR enter (z<=-1.6) and Momentum enter (rsi>=60) on first row
-                forced1 = dict(features)
-                forced1["z_vwap"] = -1.7
-                forced1["rsi14"] = 62.0
-                forced1["rv_30m"] = 0.01
+                forced1 = {**features, **_FORCED_ENTER}
                 # Force MR exit (z>=-0.3); keep RSI still high to avoid momentum exit
-                forced2 = dict(features)
-                forced2["z_vwap"] = -0.2
-                forced2["rsi14"] = 61.0
-                forced2["rv_30m"] = 0.01
+                forced2 = {**features, **_FORCED_EXIT}
                 for row in (forced1, forced2):
                     if signals_remaining <= 0:
                         break
                     s_list = runner.on_feature_row(row)
-                    for sig in s_list:
-                        if signals_remaining <= 0:
-                            break
-                        logging.info(f"strategy signal: {sig.__dict__}")
-                        signals_remaining -= 1
+                    take = min(len(s_list), signals_remaining)
+                    for sig in s_list[:take]:
+                        logging.info("strategy signal: %s", _dumps(sig))
+                    signals_remaining -= take
                 forced_done = True
 
         # --- Phase 2: Execution demo (offline) ---
-        try:
-            from paperbot.exec.simulator import ExecutionSimulator
-            from paperbot.risk.engine import RiskEngine
-            from paperbot.ledger.ledger import Ledger
-            from paperbot.metrics.exec import set_equity_gauges
-        except Exception as e:
-            logging.warning(f"Failed to import execution modules: {e}")
+        if _EXEC_IMPORT_ERROR is not None:
+            logging.warning("Failed to import execution modules: %s", _EXEC_IMPORT_ERROR)
             logging.info("candle demo complete")
             logging.info("strategy demo complete")
-            hold = int(os.getenv("HOLD_METRICS_SECONDS", "0"))
+            hold = envcfg.hold_metrics_seconds
             if hold > 0:
-                logging.info(f"holding metrics server for {hold}s before exit")
+                logging.info("holding metrics server for %ss before exit", hold)
                 time.sleep(hold)
             return
 
         exec_cfg = config.get("execution", {})
         risk_cfg = config.get("risk", {})
         # Load exchange execution profile
-        from paperbot.config.loader import load_exchange_profile
         profile = load_exchange_profile(settings.exchange, settings.environment)
         simulator = ExecutionSimulator(exec_cfg, profile=profile)
         ledger = Ledger(equity_start=10_000.0)
         risk_engine = RiskEngine(risk_cfg, equity_start=ledger.equity)
 
         fills_emitted = 0
+        next_ts = demo_ts + timeframe_ms
         # Use the last synthetic candle per symbol for fills and the shaped rows for entries
         for symbol in settings.symbols:
             # Create a shaped feature row to force an entry for each symbol
             forced = {
-                "timestamp": int(time.time() * 1000),
+                "timestamp": demo_ts,
                 "symbol": symbol,
                 "price": 100.0,
                 "atr14": 1.0,
             }
             # Use Momentum long for demo simplicity
             if enabled_strategies:
-                from paperbot.strategies.base import Signal
                 sig = Signal(ts=forced["timestamp"], symbol=symbol, strategy="momentum", side="long", strength=1.0, reason="demo", params={})
                 order = risk_engine.approve(sig, forced, ledger.equity)
                 if order:
-                    logging.info(f"order submitted: {order.__dict__}")
+                    logging.info("order submitted: %s", _dumps(order))
                     # fabricate a candle for this symbol
                     candles = [
-                        {"timestamp": forced["timestamp"], "open": 100.0, "high": 100.2, "low": 99.8, "close": 100.1, "volume": 100.0},
-                        {"timestamp": forced["timestamp"] + 60_000, "open": 100.1, "high": 100.3, "low": 99.9, "close": 100.15, "volume": 100.0},
+                        {"timestamp": demo_ts, "open": 100.0, "high": 100.2, "low": 99.8, "close": 100.1, "volume": 100.0},
+                        {"timestamp": next_ts, "open": 100.1, "high": 100.3, "low": 99.9, "close": 100.15, "volume": 100.0},
                     ]
                     # simulate partial fills across two bars
                     for cndl in candles:
                         fills = simulator.submit(order, cndl, features={"atr14": 1.0})
                         for f in fills:
-                            logging.info(f"fill: {f.__dict__}")
+                            logging.info("fill: %s", _dumps(f))
                             ledger.on_fill(f)
                         fills_emitted += len(fills)
                     # MTM at close
                     ledger.mark_to_market(forced["timestamp"], {symbol: cndl["close"]})
-        logging.info(f"fees emitted: {fills_emitted}")
+        logging.info("fees emitted: %s", fills_emitted)
         # First equity gauge snapshot (mock stocks alongside crypto to provide two markets)
         try:
             set_equity_gauges({
@@ -273,70 +463,30 @@ def main() -> None:
 
         # Optional: start a lightweight MTM ticker (does not affect core demo determinism)
         try:
-            from paperbot.metrics.exec import set_equity_gauges, get_mtm_tick_total
-            tick_secs = int(os.getenv("MTM_TICK_SECONDS", os.getenv("EQUITY_TICK_SECONDS", "15")))
-            enable_tick = os.getenv("ENABLE_MTM_TICK", "0") == "1"
-            hold = int(os.getenv("HOLD_METRICS_SECONDS", "0"))
+            tick_secs = envcfg.mtm_tick_seconds
+            enable_tick = envcfg.mtm_tick_enabled(default=False)
+            hold = envcfg.hold_metrics_seconds
             if enable_tick and tick_secs > 0 and hold > 0:
                 mtm_counter = get_mtm_tick_total()
 
                 # Capture last known prices for a simple MTM tick; in demo we reuse last close
                 last_prices = {s: 100.0 for s in settings.symbols}
 
-                def _mtm_loop(duration_s: int):
-                    deadline = time.time() + duration_s
-                    while time.time() < deadline:
-                        # Recompute equity snapshot and emit gauges
-                        try:
-                            # Reuse last price (demo); in online mode, fetcher would supply fresh prices
-                            ledger.mark_to_market(int(time.time() * 1000), last_prices)
-                            set_equity_gauges({
-                                "crypto": float(ledger.equity),
-                            })
-                            mtm_counter.labels("crypto").inc()
-                        except Exception:
-                            pass
-                        time.sleep(tick_secs)
-
-                t = threading.Thread(target=_mtm_loop, args=(hold,), daemon=True)
-                t.start()
+                def _mtm_tick():
+                    # Recompute equity snapshot and emit gauges
+                    # Reuse last price (demo); in online mode, fetcher would supply fresh prices
+                    ledger.mark_to_market(now_ms(), last_prices)
+                    set_equity_gauges({
+                        "crypto": float(ledger.equity),
+                    })
+                    mtm_counter.labels("crypto").inc()
+
+                get_scheduler().every(tick_secs, _mtm_tick, duration_s=hold)
         except Exception:
             pass
         # LLM Advisory demo (advisory only; no live orders)
-        try:
-            from paperbot.llm.router import load_llm_config, get_client
-            from paperbot.llm.guards import output_validate
-            from paperbot.llm.memory.sqlite_store import SQLiteStore
-            from paperbot.metrics.llm import get_llm_calls_total, get_decisions_count_total, get_decisions_confidence_hist
-            import json
-            llm_cfg = load_llm_config()
-            client = get_client(llm_cfg)
-            calls = get_llm_calls_total()
-            dcount = get_decisions_count_total()
-            dhist = get_decisions_confidence_hist()
-            store = SQLiteStore()
-            allow = llm_cfg.get("symbol_allowlist", [])
-            conf_floor = float(llm_cfg.get("confidence_floor", 0.6))
-            max_notional = float(llm_cfg.get("max_notional_usd", 200.0))
-            # include a stocks symbol in advisory check
-            symbols_all = list(settings.symbols) + ["AAPL"]
-            for sym in symbols_all:
-                market = "stocks" if sym.isalpha() else "crypto"
-                ctx = {"symbol": sym, "market": market, "max_notional_usd": max_notional}
-                try:
-                    dec = client.generate_decision({}, ctx)
-                    calls.labels(type(client).__name__.lower(), "true").inc()
-                    dec_valid = output_validate(
-                        dec, allow, market, sym, conf_floor, max_notional
-                    )
-                    store.insert(dec_valid.model_dump())
-                    dcount.labels(market, sym, dec_valid.side).inc()
-                    dhist.labels(market).observe(dec_valid.confidence)
-                    logging.info(f"decision: {json.dumps(dec_valid.model_dump())}")
-                except Exception:
-                    calls.labels(type(client).__name__.lower(), "false").inc()
-                    continue
-            # Second equity snapshot before finishing advisory
+        if _run_llm_advisory(settings.symbols):
+            # Second equity snapshot after the advisory pass
             try:
                 set_equity_gauges({
                     "crypto": float(ledger.equity) * 1.001,
@@ -345,16 +495,12 @@ def main() -> None:
                 logging.info("equity gauges set (second)")
             except Exception:
                 pass
-            logging.info("llm advisory demo complete")
-        except Exception:
-            pass
         # Decision log for execution demo
         try:
-            from paperbot.logs.decision_log import append_jsonl
-            market = os.getenv("APP_TRACK", "crypto")
-            path = os.getenv("DECISION_LOG_PATH", "data/decisions/phase2.jsonl")
+            market = envcfg.app_track
+            path = envcfg.decision_log_path
             append_jsonl(path, {
-                "ts": int(time.time()*1000),
+                "ts": now_ms(),
                 "symbol": "*",
                 "market": market,
                 "strategy": "execution",
@@ -374,171 +520,113 @@ def main() -> None:
         logging.info("strategy demo complete")
         logging.info("execution demo complete")
         # Optional: keep the metrics server alive for inspection
-        hold = int(os.getenv("HOLD_METRICS_SECONDS", "0"))
+        hold = envcfg.hold_metrics_seconds
         if hold > 0:
-            logging.info(f"holding metrics server for {hold}s before exit")
+            logging.info("holding metrics server for %ss before exit", hold)
             time.sleep(hold)
         return
 
     # Exchange client + feature computation pipeline for live/demo network mode
-    from paperbot.data.candles import CandleFetcher
+    if CandleFetcher is None:
+        raise RuntimeError("CandleFetcher unavailable (is ccxt installed?); use OFFLINE_DEMO=1")
     fetcher = CandleFetcher(settings)
-    # Prepare strategies for online mode
-    strategies_cfg = config.get("strategies", {})
-    enabled_strategies = []
-    try:
-        from paperbot.strategies.mr import MeanReversionStrategy
-        from paperbot.strategies.momentum import MomentumStrategy
-        from paperbot.strategies.runner import StrategyRunner
-    except Exception as e:
-        logging.warning(f"Failed to import strategies: {e}")
-        strategies_cfg = {}
-
-    if strategies_cfg:
-        if strategies_cfg.get("mr", {}).get("enabled", False):
-            enabled_strategies.append(MeanReversionStrategy(strategies_cfg.get("mr", {})))
-        if strategies_cfg.get("momentum", {}).get("enabled", False):
-            enabled_strategies.append(MomentumStrategy(strategies_cfg.get("momentum", {})))
-    runner = StrategyRunner(enabled_strategies, signals_counter=SIGNALS_EMITTED, suppressed_counter=SIGNALS_SUPPRESSED)
     signals_remaining = 10
     
     # Log exactly 10 normalized candles across all symbols, then compute features
     candle_logs_remaining = 10
-    for symbol in settings.symbols:
-        logging.info(f"Processing {symbol}...")
-        # Need ~20 candles for some optional indicators (e.g., Bands)
-        candles = fetcher.fetch_candles(symbol, limit=20)
-        
-        # Add symbol to each candle for feature building
-        for candle in candles:
-            candle['symbol'] = symbol
+    all_candles = {}
+    # Need ~20 candles for some optional indicators (e.g., Bands); fetch all symbols concurrently
+    fetched = fetcher.fetch_candles_many(settings.symbols, limit=20)
+    for symbol, candles in fetched.items():
+        logging.info("Processing %s...", symbol)
         
         # Emit up to `candle_logs_remaining` normalized candles across symbols
-        for c in candles:
-            if candle_logs_remaining <= 0:
-                break
-            # Normalize keys to concise schema for logs
-            normalized = {
-                "ts": c.get("timestamp"),
-                "o": c.get("open"),
-                "h": c.get("high"),
-                "l": c.get("low"),
-                "c": c.get("close"),
-                "v": c.get("volume"),
-                "timeframe": settings.timeframe,
-                "symbol": symbol,
-            }
-            logging.info(f"candle: {normalized}")
-            CANDLES_FETCHED.labels(symbol).inc()
-            candle_logs_remaining -= 1
-        
-        # Compute features for the latest candle window
-        features = feature_builder.compute_latest(candles)
-        
+        take = min(len(candles), candle_logs_remaining)
+        if log_info_on:
+            for c in islice(candles, take):
+                # Normalize keys to concise schema for logs
+                normalized = {
+                    "ts": c.timestamp,
+                    "o": c.open,
+                    "h": c.high,
+                    "l": c.low,
+                    "c": c.close,
+                    "v": c.volume,
+                    "timeframe": settings.timeframe,
+                    "symbol": symbol,
+                }
+                logging.info("candle: %s", normalized)
+        if take:
+            candles_child[symbol].inc(take)
+        candle_logs_remaining -= take
+        all_candles[symbol] = candles
+
+    # Compute features for the latest candle window of every symbol at once
+    features_by_symbol = feature_builder.compute_latest_batch(all_candles)
+    # Expansion log flags are read once; skip them entirely when INFO is filtered
+    expansion_config = config.get('features', {}).get('expansion', {})
+    want_sma_ema = log_info_on and bool(expansion_config.get('sma_ema'))
+    want_bb = log_info_on and bool(expansion_config.get('bollinger'))
+    want_obv = log_info_on and bool(expansion_config.get('obv'))
+    want_hour = log_info_on and bool(expansion_config.get('hour_of_day'))
+    for symbol, features in features_by_symbol.items():
         # Log the feature row
-        logging.info(f"{symbol} features: {features}")
-        FEATURES_COMPUTED.labels(symbol).inc()
+        logging.info("%s features: %s", symbol, features)
+        features_child[symbol].inc()
         
         # Log selected expansion features if enabled via config
-        expansion_config = config.get('features', {}).get('expansion', {})
-        if expansion_config.get('sma_ema', False):
-            logging.info(f"{symbol} SMA/EMA: sma={features.get('sma_ema_sma', 'N/A'):.2f}, "
-                        f"ema={features.get('sma_ema_ema', 'N/A'):.2f}, "
-                        f"signal={features.get('sma_ema_crossover_signal', 'N/A')}")
+        get = features.get
+        if want_sma_ema:
+            logging.info("%s SMA/EMA: sma=%s, ema=%s, signal=%s", symbol,
+                         _fmt(get('sma_ema_sma')), _fmt(get('sma_ema_ema')),
+                         get('sma_ema_crossover_signal', 'N/A'))
         
-        if expansion_config.get('bollinger', False):
-            logging.info(f"{symbol} Bollinger: upper={features.get('bb_upper_band', 'N/A'):.2f}, "
-                        f"middle={features.get('bb_middle_band', 'N/A'):.2f}, "
-                        f"lower={features.get('bb_lower_band', 'N/A'):.2f}")
+        if want_bb:
+            logging.info("%s Bollinger: upper=%s, middle=%s, lower=%s", symbol,
+                         _fmt(get('bb_upper_band')), _fmt(get('bb_middle_band')),
+                         _fmt(get('bb_lower_band')))
         
-        if expansion_config.get('obv', False):
-            logging.info(f"{symbol} OBV: obv={features.get('obv_obv', 'N/A'):.2f}, "
-                        f"change={features.get('obv_obv_change', 'N/A'):.2f}")
+        if want_obv:
+            logging.info("%s OBV: obv=%s, change=%s", symbol,
+                         _fmt(get('obv_obv')), _fmt(get('obv_obv_change')))
         
-        if expansion_config.get('hour_of_day', False):
-            logging.info(f"{symbol} Hour: {features.get('hour_hour_int', 'N/A')} "
-                        f"({features.get('hour_hour_cat', 'N/A')})")
+        if want_hour:
+            logging.info("%s Hour: %s (%s)", symbol,
+                         get('hour_hour_int', 'N/A'), get('hour_hour_cat', 'N/A'))
 
         # Run strategies and log up to 10 signals across all symbols
         if enabled_strategies and signals_remaining > 0:
             signals = runner.on_feature_row(features)
-            for sig in signals:
-                if signals_remaining <= 0:
-                    break
-                logging.info(f"strategy signal: {sig.__dict__}")
-                signals_remaining -= 1
+            take = min(len(signals), signals_remaining)
+            for sig in signals[:take]:
+                logging.info("strategy signal: %s", _dumps(sig))
+            signals_remaining -= take
     
     logging.info("candle demo complete")
     # Optional: start a lightweight MTM ticker for online/demo mode
     try:
-        from paperbot.metrics.exec import set_equity_gauges, get_mtm_tick_total
-        tick_secs = int(os.getenv("MTM_TICK_SECONDS", os.getenv("EQUITY_TICK_SECONDS", "15")))
-        enable_tick = os.getenv("ENABLE_MTM_TICK", "1") == "1"
+        tick_secs = envcfg.mtm_tick_seconds
+        enable_tick = envcfg.mtm_tick_enabled(default=True)
         # Online mode may not have a ledger; synthesize a basic equity tracker from start equity
-        equity_usd = float(os.getenv("EQUITY_START_USD", "10000"))
+        equity_usd = envcfg.equity_start_usd
         mtm_counter = get_mtm_tick_total()
 
         if enable_tick and tick_secs > 0:
-            def _mtm_loop_online():
-                while True:
-                    try:
-                        # Emit a steady equity value as a heartbeat; strategies can update later when ledger is introduced
-                        set_equity_gauges({"crypto": equity_usd})
-                        mtm_counter.labels("crypto").inc()
-                    except Exception:
-                        pass
-                    time.sleep(tick_secs)
-
-            threading.Thread(target=_mtm_loop_online, daemon=True).start()
+            def _mtm_tick_online():
+                # Emit a steady equity value as a heartbeat; strategies can update later when ledger is introduced
+                set_equity_gauges({"crypto": equity_usd})
+                mtm_counter.labels("crypto").inc()
+
+            get_scheduler().every(tick_secs, _mtm_tick_online)
     except Exception:
         pass
     logging.info("strategy demo complete")
     # ---- Phase 3.0: LLM Advisory (offline advisory; simulated only) ----
-    try:
-        from paperbot.llm.router import load_llm_config, get_client
-        from paperbot.llm.guards import output_validate
-        from paperbot.llm.memory.sqlite_store import SQLiteStore
-        from paperbot.metrics.llm import get_llm_calls_total, get_decisions_count_total, get_decisions_confidence_hist
-        import json
-        llm_cfg = load_llm_config()
-        client = get_client(llm_cfg)
-        calls = get_llm_calls_total()
-        dcount = get_decisions_count_total()
-        dhist = get_decisions_confidence_hist()
-        store = SQLiteStore()
-        allow = llm_cfg.get("symbol_allowlist", [])
-        conf_floor = float(llm_cfg.get("confidence_floor", 0.6))
-        max_notional = float(llm_cfg.get("max_notional_usd", 200.0))
-        # include a stocks symbol in advisory check
-        symbols_all = list(settings.symbols) + ["AAPL"]
-        for symbol in symbols_all:
-            market = "stocks" if symbol.isalpha() else "crypto"
-            ctx = {
-                "symbol": symbol,
-                "market": market,
-                "max_notional_usd": max_notional,
-            }
-            try:
-                dec = client.generate_decision({}, ctx)
-                dec_ok = True
-                calls.labels(type(client).__name__.lower(), str(dec_ok).lower()).inc()
-                dec_valid = output_validate(
-                    dec, allow, market, symbol, conf_floor, max_notional
-                )
-                store.insert(dec_valid.model_dump())
-                dcount.labels(market, symbol, dec_valid.side).inc()
-                dhist.labels(market).observe(dec_valid.confidence)
-                logging.info(f"decision: {json.dumps(dec_valid.model_dump())}")
-            except Exception:
-                calls.labels(type(client).__name__.lower(), "false").inc()
-                continue
-        logging.info("llm advisory demo complete")
-    except Exception:
-        pass
+    _run_llm_advisory(settings.symbols)
     # Optional: keep the metrics server alive for inspection
-    hold = int(os.getenv("HOLD_METRICS_SECONDS", "0"))
+    hold = envcfg.hold_metrics_seconds
     if hold > 0:
-        logging.info(f"holding metrics server for {hold}s before exit")
+        logging.info("holding metrics server for %ss before exit", hold)
         time.sleep(hold)
 
 if __name__ == "__main__":
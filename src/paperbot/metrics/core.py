@@ -1,16 +1,36 @@
 """Core metrics helpers for Paperbot.
 
 Provides a thin wrapper to start the Prometheus HTTP server while tolerating
-bind failures (useful in constrained environments and tests).
+bind failures (useful in constrained environments and tests), and picks the
+registry to expose when metrics are written by several processes.
 """
 
 import logging
+import os
 from typing import Optional
 
 try:
-    from prometheus_client import start_http_server
+    from prometheus_client import start_http_server, CollectorRegistry, REGISTRY
+    from prometheus_client import multiprocess
 except Exception:  # pragma: no cover
     start_http_server = None  # type: ignore
+    CollectorRegistry = REGISTRY = multiprocess = None  # type: ignore
+
+
+def scrape_registry():
+    """Return the registry the exporter should serve.
+
+    When `PROMETHEUS_MULTIPROC_DIR` is set (forked workers, process pools),
+    metrics from every process are aggregated by a `MultiProcessCollector` on
+    a private registry; otherwise the default REGISTRY is served.
+    """
+    if CollectorRegistry is None:
+        return None
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
 
 
 def start_server_safe(port: int) -> Optional[int]:
@@ -22,7 +42,7 @@ def start_server_safe(port: int) -> Optional[int]:
         logging.warning("Prometheus client not available; metrics disabled")
         return None
     try:
-        start_http_server(port)
+        start_http_server(port, registry=scrape_registry())
         logging.info(f"Prometheus metrics server started on :{port}")
         return port
     except OSError as e:
@@ -1,195 +1,197 @@
 from __future__ import annotations
 
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Any, Dict
 import os
 from prometheus_client import Counter, Gauge, Histogram, REGISTRY
 
-_orders_submitted: Optional[Counter] = None
-_orders_blocked: Optional[Counter] = None
-_fills_total: Optional[Counter] = None
-_fees_paid_total: Optional[Counter] = None
-_realized_pnl_total: Optional[Counter] = None
-_equity_gauge: Optional[Gauge] = None
-_killswitch_trips: Optional[Counter] = None
-_killswitch_active: Optional[Gauge] = None
-_fees_paid_usd_total: Optional[Counter] = None
-_account_equity_usd: Optional[Gauge] = None
-_mtm_tick_total: Optional[Counter] = None
-_pattern_detected_total: Optional[Counter] = None
-_pattern_intent_total: Optional[Counter] = None
-_pattern_to_intent_latency: Optional[Histogram] = None
-
-
-class _NoOp:
+
+class NullMetric:
+    """No-op stand-in for a missing or unusable Prometheus metric (or child)."""
+
     def labels(self, *args, **kwargs):
         return self
     def inc(self, *args, **kwargs):
         return None
     def set(self, *args, **kwargs):
         return None
+    def observe(self, *args, **kwargs):
+        return None
 
 
-def _safe_counter(name: str, doc: str, labelnames):
-    if os.getenv("DISABLE_PROMETHEUS", "0") == "1":
-        return _NoOp()
-    try:
-        return Counter(name, doc, labelnames)
-    except ValueError:
-        # Try to find existing collector in default REGISTRY (by name)
-        try:
-            coll = getattr(REGISTRY, "_names_to_collectors", {}).get(name)
-            if coll is not None:
-                return coll
-            for coll in list(getattr(REGISTRY, "_collector_to_names", {}).keys()):  # type: ignore[attr-defined]
-                if getattr(coll, "_name", None) == name:
-                    return coll
-        except Exception:
-            pass
-        return _NoOp()
+NULL_METRIC = NullMetric()
+
 
+def bind_child(metric, **labels):
+    """Return `metric.labels(**labels)`, or NULL_METRIC when unbound or binding fails.
 
-def _safe_gauge(name: str, doc: str):
-    if os.getenv("DISABLE_PROMETHEUS", "0") == "1":
-        return _NoOp()
+    Binding is checked once here so hot paths can call `.inc()` without try/except.
+    """
+    if metric is None:
+        return NULL_METRIC
     try:
-        return Gauge(name, doc)
-    except ValueError:
-        try:
-            for coll in list(REGISTRY._collector_to_names.keys()):  # type: ignore[attr-defined]
-                if isinstance(coll, Gauge) and getattr(coll, "_name", None) == name:
-                    return coll
-        except Exception:
-            pass
-        return _NoOp()
+        return metric.labels(**labels)
+    except Exception:
+        return NULL_METRIC
 
 
-def _safe_gauge_labels(name: str, doc: str, labelnames):
-    if os.getenv("DISABLE_PROMETHEUS", "0") == "1":
-        return _NoOp()
-    try:
-        return Gauge(name, doc, labelnames)
-    except ValueError:
-        try:
-            for coll in list(REGISTRY._collector_to_names.keys()):  # type: ignore[attr-defined]
-                if isinstance(coll, Gauge) and getattr(coll, "_name", None) == name:
-                    return coll
-        except Exception:
-            pass
-        return _NoOp()
-    try:
-        return Gauge(name, doc)
-    except ValueError:
-        try:
-            for coll in list(REGISTRY._collector_to_names.keys()):  # type: ignore[attr-defined]
-                if isinstance(coll, Gauge) and getattr(coll, "_name", None) == name:
-                    return coll
-        except Exception:
-            pass
-        return _NoOp()
+_children: Dict[tuple, Any] = {}
+
+
+def bind(metric, *labelvalues):
+    """Return `metric.labels(*labelvalues)`, memoized per (metric, label values).
+
+    Saves the per-event label validation/hash done by prometheus_client on hot paths.
+    """
+    key = (metric, labelvalues)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labelvalues)
+    return child
+
+
+# Resolved once at import; call `_refresh_prom_env()` after changing the env var (tests)
+_PROM_DISABLED: bool = os.environ.get("DISABLE_PROMETHEUS") == "1"
+
+
+def _refresh_prom_env() -> bool:
+    """Re-read DISABLE_PROMETHEUS from the environment and return the new flag.
+
+    Also clears the `lru_cache`d getters in `_CACHED_GETTERS` so they rebuild
+    under the new flag, and drops the `bind` memo so it does not keep the old
+    collectors alive. Handles already held elsewhere (e.g. on a Ledger or
+    RiskEngine) are not affected.
+    """
+    global _PROM_DISABLED
+    _PROM_DISABLED = os.environ.get("DISABLE_PROMETHEUS") == "1"
+    _children.clear()
+    for getter in _CACHED_GETTERS:
+        getter.cache_clear()
+    return _PROM_DISABLED
 
 
-def _safe_histogram(name: str, doc: str, labelnames=None, buckets=None):
-    if os.getenv("DISABLE_PROMETHEUS", "0") == "1":
-        return _NoOp()
+_collector_cache: Dict[str, Any] = {}
+
+
+def _existing_collector(name: str, kind=None, registry=None):
+    """Find an already-registered collector by metric name.
+
+    With no `registry`, checks the local cache and then the default REGISTRY's
+    name -> collector dict; otherwise only the given registry is consulted.
+    """
+    coll = _collector_cache.get(name) if registry is None else None
+    if coll is None:
+        reg = REGISTRY if registry is None else registry
+        coll = getattr(reg, "_names_to_collectors", {}).get(name)
+    if coll is not None and kind is not None and not isinstance(coll, kind):
+        return None
+    return coll
+
+
+def _register(name: str, kind, factory, registry=None):
+    """Create (or reuse) a collector via `factory(registry)`.
+
+    Collectors on the default REGISTRY are cached by name. A caller-supplied
+    `registry` (e.g. a fresh CollectorRegistry in tests) bypasses that cache.
+    """
+    if _PROM_DISABLED:
+        return NULL_METRIC
+    if registry is None:
+        coll = _collector_cache.get(name)
+        if coll is not None and (kind is None or isinstance(coll, kind)):
+            return coll
     try:
-        if labelnames is not None and buckets is not None:
-            return Histogram(name, doc, labelnames, buckets=buckets)
-        elif labelnames is not None:
-            return Histogram(name, doc, labelnames)
-        elif buckets is not None:
-            return Histogram(name, doc, buckets=buckets)
-        else:
-            return Histogram(name, doc)
+        coll = factory(REGISTRY if registry is None else registry)
     except ValueError:
-        try:
-            coll = getattr(REGISTRY, "_names_to_collectors", {}).get(name)
-            if coll is not None:
-                return coll
-            for coll in list(getattr(REGISTRY, "_collector_to_names", {}).keys()):  # type: ignore[attr-defined]
-                if getattr(coll, "_name", None) == name:
-                    return coll
-        except Exception:
-            pass
-        return _NoOp()
+        # Already registered (e.g. module imported under two package names)
+        coll = _existing_collector(name, kind, registry)
+        if coll is None:
+            return NULL_METRIC
+    if registry is None:
+        _collector_cache[name] = coll
+    return coll
+
+
+def _safe_counter(name: str, doc: str, labelnames, registry=None):
+    return _register(name, None, lambda reg: Counter(name, doc, labelnames, registry=reg), registry)
+
+
+def _safe_gauge(name: str, doc: str, registry=None):
+    return _register(name, Gauge, lambda reg: Gauge(name, doc, registry=reg), registry)
 
 
+def _safe_gauge_labels(name: str, doc: str, labelnames, registry=None):
+    return _register(name, Gauge, lambda reg: Gauge(name, doc, labelnames, registry=reg), registry)
+
+
+def _safe_histogram(name: str, doc: str, labelnames=None, buckets=None, registry=None):
+    def _make(reg):
+        kwargs: Dict[str, Any] = {"registry": reg}
+        if buckets is not None:
+            kwargs["buckets"] = buckets
+        return Histogram(name, doc, labelnames or (), **kwargs)
+    return _register(name, None, _make, registry)
+
+
+@lru_cache(maxsize=None)
 def get_orders_submitted_total():
-    global _orders_submitted
-    if _orders_submitted is None:
-        _orders_submitted = _safe_counter("orders_submitted_total", "Orders submitted", ["type", "symbol"])
-    return _orders_submitted
+    return _safe_counter("orders_submitted_total", "Orders submitted", ["type", "symbol"])
 
 
+@lru_cache(maxsize=None)
 def get_orders_blocked_total():
-    global _orders_blocked
-    if _orders_blocked is None:
-        _orders_blocked = _safe_counter("orders_blocked_total", "Orders blocked", ["reason", "symbol"])
-    return _orders_blocked
+    return _safe_counter("orders_blocked_total", "Orders blocked", ["reason", "symbol"])
 
 
+@lru_cache(maxsize=None)
 def get_fills_total():
-    global _fills_total
-    if _fills_total is None:
-        _fills_total = _safe_counter("fills_total", "Fills produced", ["liquidity", "symbol"])
-    return _fills_total
+    return _safe_counter("fills_total", "Fills produced", ["liquidity", "symbol"])
 
 
+@lru_cache(maxsize=None)
 def get_fees_paid_total():
-    global _fees_paid_total
-    if _fees_paid_total is None:
-        _fees_paid_total = _safe_counter("fees_paid_total", "Fees paid", ["symbol"])
-    return _fees_paid_total
+    return _safe_counter("fees_paid_total", "Fees paid", ["symbol"])
 
 
+@lru_cache(maxsize=None)
 def get_fees_paid_usd_total():
     """Counter: fees paid in USD, labeled by market and symbol.
 
     Note: This runs in parallel with legacy `fees_paid_total` for one release.
     """
-    global _fees_paid_usd_total
-    if _fees_paid_usd_total is None:
-        _fees_paid_usd_total = _safe_counter(
-            "fees_paid_usd_total", "Fees paid in USD", ["market", "symbol"]
-        )
-    return _fees_paid_usd_total
+    return _safe_counter(
+        "fees_paid_usd_total", "Fees paid in USD", ["market", "symbol"]
+    )
 
 
+@lru_cache(maxsize=None)
 def get_realized_pnl_total():
-    global _realized_pnl_total
-    if _realized_pnl_total is None:
-        _realized_pnl_total = _safe_counter("realized_pnl_total", "Realized PnL", ["symbol"])
-    return _realized_pnl_total
+    return _safe_counter("realized_pnl_total", "Realized PnL", ["symbol"])
 
 
+@lru_cache(maxsize=None)
 def get_equity_gauge():
-    global _equity_gauge
-    if _equity_gauge is None:
-        # Labeled by symbol; use symbol="total" for account equity snapshots
-        _equity_gauge = _safe_gauge_labels("equity_gauge", "Equity value", ["symbol"])
-    return _equity_gauge
+    # Labeled by symbol; use symbol="total" for account equity snapshots
+    return _safe_gauge_labels("equity_gauge", "Equity value", ["symbol"])
 
 
+@lru_cache(maxsize=None)
 def get_account_equity_usd():
     """Gauge: account equity in USD, labeled by market.
 
     Note: This runs in parallel with legacy `equity_gauge` for one release.
     """
-    global _account_equity_usd
-    if _account_equity_usd is None:
-        _account_equity_usd = _safe_gauge_labels(
-            "account_equity_usd", "Account equity in USD", ["market"]
-        )
-    return _account_equity_usd
+    return _safe_gauge_labels(
+        "account_equity_usd", "Account equity in USD", ["market"]
+    )
 
 
+@lru_cache(maxsize=None)
 def get_mtm_tick_total():
     """Counter: count of MTM ticks executed per market."""
-    global _mtm_tick_total
-    if _mtm_tick_total is None:
-        _mtm_tick_total = _safe_counter(
-            "mtm_tick_total", "Mark-to-market ticks executed", ["market"]
-        )
-    return _mtm_tick_total
+    return _safe_counter(
+        "mtm_tick_total", "Mark-to-market ticks executed", ["market"]
+    )
 
 
 def set_equity_gauges(equity_by_market: Dict[str, float]) -> None:
@@ -200,95 +202,97 @@ def set_equity_gauges(equity_by_market: Dict[str, float]) -> None:
     g = get_account_equity_usd()
     for mkt, val in equity_by_market.items():
         try:
-            g.labels(market=str(mkt)).set(float(val))  # type: ignore[attr-defined]
+            bind(g, str(mkt)).set(float(val))  # type: ignore[attr-defined]
         except Exception:
             # Metrics are optional in constrained environments
             continue
 
 
+@lru_cache(maxsize=None)
 def get_killswitch_trips_total():
-    global _killswitch_trips
-    if _killswitch_trips is None:
-        _killswitch_trips = _safe_counter("killswitch_trips_total", "Kill switch trips", [])
-    return _killswitch_trips
+    return _safe_counter("killswitch_trips_total", "Kill switch trips", [])
 
 
+@lru_cache(maxsize=None)
 def get_killswitch_active():
     """Gauge: kill switch state by market (1 active, 0 inactive)."""
-    global _killswitch_active
-    if _killswitch_active is None:
-        _killswitch_active = _safe_gauge_labels(
-            "paperbot_killswitch_active", "Kill switch active state", ["market"]
-        )
-    return _killswitch_active
+    return _safe_gauge_labels(
+        "paperbot_killswitch_active", "Kill switch active state", ["market"]
+    )
 
 
 def set_killswitch_state(market: str, active: bool) -> None:
     gauge = get_killswitch_active()
     try:
-        gauge.labels(market=str(market)).set(1 if active else 0)  # type: ignore[attr-defined]
+        bind(gauge, str(market)).set(1 if active else 0)  # type: ignore[attr-defined]
     except Exception:
         pass
 
 
 # ---- Phase 2.5: Pattern observability ----
 
+@lru_cache(maxsize=None)
 def get_pattern_detected_total():
     """Counter: pattern_detected_total{market,symbol,pattern}"""
-    global _pattern_detected_total
-    if _pattern_detected_total is None:
-        _pattern_detected_total = _safe_counter(
-            "pattern_detected_total", "Candlestick patterns detected", ["market", "symbol", "pattern"]
-        )
-    return _pattern_detected_total
+    return _safe_counter(
+        "pattern_detected_total", "Candlestick patterns detected", ["market", "symbol", "pattern"]
+    )
 
 
+@lru_cache(maxsize=None)
 def get_pattern_intent_total():
     """Counter: pattern_intent_total{market,pattern,side}"""
-    global _pattern_intent_total
-    if _pattern_intent_total is None:
-        _pattern_intent_total = _safe_counter(
-            "pattern_intent_total", "Intents emitted for patterns", ["market", "pattern", "side"]
-        )
-    return _pattern_intent_total
+    return _safe_counter(
+        "pattern_intent_total", "Intents emitted for patterns", ["market", "pattern", "side"]
+    )
 
 
+@lru_cache(maxsize=None)
 def get_pattern_to_intent_latency():
     """Histogram: pattern_to_intent_latency_seconds
 
     Buckets: [0.5, 1, 2, 5, 10, 30, 60]
     """
-    global _pattern_to_intent_latency
-    if _pattern_to_intent_latency is None:
-        _pattern_to_intent_latency = _safe_histogram(
-            "pattern_to_intent_latency_seconds",
-            "Latency seconds from pattern detection to intent emission",
-            buckets=(0.5, 1, 2, 5, 10, 30, 60),
-        )
-    return _pattern_to_intent_latency
+    return _safe_histogram(
+        "pattern_to_intent_latency_seconds",
+        "Latency seconds from pattern detection to intent emission",
+        buckets=(0.5, 1, 2, 5, 10, 30, 60),
+    )
+
+
+# Every lru_cached getter above; cleared by `_refresh_prom_env`
+_CACHED_GETTERS = (
+    get_orders_submitted_total,
+    get_orders_blocked_total,
+    get_fills_total,
+    get_fees_paid_total,
+    get_fees_paid_usd_total,
+    get_realized_pnl_total,
+    get_equity_gauge,
+    get_account_equity_usd,
+    get_mtm_tick_total,
+    get_killswitch_trips_total,
+    get_killswitch_active,
+    get_pattern_detected_total,
+    get_pattern_intent_total,
+    get_pattern_to_intent_latency,
+)
 
 
 def inc_pattern_detected(market: str, symbol: str, pattern: str) -> None:
-    try:
-        get_pattern_detected_total().labels(market, symbol, pattern).inc()
-    except Exception:
-        pass
+    if _PROM_DISABLED:
+        return
+    bind(get_pattern_detected_total(), market, symbol, pattern).inc()
 
 
 def inc_pattern_intent(market: str, pattern: str, side: str) -> None:
-    try:
-        get_pattern_intent_total().labels(market, pattern, side).inc()
-    except Exception:
-        pass
+    if _PROM_DISABLED:
+        return
+    bind(get_pattern_intent_total(), market, pattern, side).inc()
 
 
 def observe_pattern_to_intent_latency(seconds: float) -> None:
-    if seconds is None:
+    # guard: only positive observations
+    if _PROM_DISABLED or seconds is None or seconds < 0:
         return
-    try:
-        if seconds < 0:
-            # guard: only positive observations
-            return
-        get_pattern_to_intent_latency().observe(float(seconds))
-    except Exception:
-        pass
+    get_pattern_to_intent_latency().observe(float(seconds))
@@ -11,13 +11,15 @@ Histogram:
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from prometheus_client import Counter, Histogram
 
 _llm_calls: Optional[Counter] = None
 _llm_tokens: Optional[Counter] = None
 _decisions_count: Optional[Counter] = None
 _decisions_conf_hist: Optional[Histogram] = None
+# (market, symbol, side) -> bound decisions_count_total child
+_decision_children: Dict[Tuple[str, str, str], Any] = {}
 
 
 def get_llm_calls_total():
@@ -65,6 +67,15 @@ def get_decisions_count_total():
     return _decisions_count
 
 
+def inc_decision(market: str, symbol: str, side: str) -> None:
+    """Increment decisions_count_total, resolving `.labels()` once per label tuple."""
+    key = (market, symbol, side)
+    child = _decision_children.get(key)
+    if child is None:
+        child = _decision_children[key] = get_decisions_count_total().labels(market, symbol, side)
+    child.inc()
+
+
 def get_decisions_confidence_hist():
     global _decisions_conf_hist
     if _decisions_conf_hist is None:
@@ -8,36 +8,60 @@ Saves PNGs to a destination path (ensures parent directories exist).
 from __future__ import annotations
 
 import os
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import threading
+from typing import List, Dict, Any
 
 import matplotlib
+import numpy as np
+
+from paperbot.data.model import timestamp_column
 
 # Use a non-interactive backend for headless environments
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt  # noqa: E402
 import matplotlib.dates as mdates  # noqa: E402
+from matplotlib.collections import LineCollection, PolyCollection  # noqa: E402
+
+_MS_PER_DAY = 86_400_000
+# PNG resolution; report images are viewed in a browser, so a modest DPI is enough
+REPORT_DPI = int(os.getenv("REPORT_DPI", "90"))
+
+# One Figure/Axes per process, cleared between renders instead of reallocated
+_FIG = None
+_AX = None
+_FIG_LOCK = threading.Lock()
+
+
+def _figure():
+    global _FIG, _AX
+    if _FIG is None:
+        _FIG, _AX = plt.subplots(figsize=(10, 4))
+    return _FIG, _AX
 
 
 def _session_vwap_series(candles: List[Dict[str, Any]]) -> List[float]:
     """Compute per-bar session VWAP (UTC day.reset) across the provided candles."""
-    vwap_series: List[float] = []
-    pv_sum = 0.0
-    v_sum = 0.0
-    current_day: Optional[datetime.date] = None
-    for c in candles:
-        ts = int(c.get("timestamp", 0))
-        day = datetime.utcfromtimestamp(ts / 1000.0).date()
-        if current_day is None or day != current_day:
-            pv_sum = 0.0
-            v_sum = 0.0
-            current_day = day
-        price = float(c.get("close", 0.0))
-        vol = float(c.get("volume", 0.0))
-        pv_sum += price * vol
-        v_sum += vol
-        vwap_series.append(pv_sum / v_sum if v_sum > 0 else 0.0)
-    return vwap_series
+    n = len(candles)
+    if n == 0:
+        return []
+    ts = timestamp_column(candles)
+    price = np.fromiter((c.get("close", 0.0) for c in candles), dtype=np.float64, count=n)
+    vol = np.fromiter((c.get("volume", 0.0) for c in candles), dtype=np.float64, count=n)
+    pv_cum = np.cumsum(price * vol)
+    v_cum = np.cumsum(vol)
+    # Restart the running sums at each UTC day boundary by subtracting the prefix
+    days = ts // _MS_PER_DAY
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    seg_start = np.zeros(n, dtype=np.intp)
+    seg_start[starts] = starts
+    seg_start = np.maximum.accumulate(seg_start)
+    pv_prefix = np.r_[0.0, pv_cum][seg_start]
+    v_prefix = np.r_[0.0, v_cum][seg_start]
+    pv_sess = pv_cum - pv_prefix
+    v_sess = v_cum - v_prefix
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.where(v_sess > 0, pv_sess / v_sess, 0.0)
+    return vwap.tolist()
 
 
 def save_candlestick_png(
@@ -57,38 +81,54 @@ def save_candlestick_png(
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
     # Prepare OHLC arrays
-    times = [mdates.date2num(datetime.utcfromtimestamp(c["timestamp"] / 1000.0)) for c in candles]
-    opens = [float(c["open"]) for c in candles]
-    highs = [float(c["high"]) for c in candles]
-    lows = [float(c["low"]) for c in candles]
-    closes = [float(c["close"]) for c in candles]
-
-    fig, ax = plt.subplots(figsize=(10, 4))
-    ax.set_title(f"{symbol} — {timeframe} candlesticks")
-
-    # Draw wicks
-    for t, h, l in zip(times, highs, lows):
-        ax.vlines(t, l, h, color="black", linewidth=0.8)
-
-    # Draw bodies
-    width = 0.6 * (times[1] - times[0]) if len(times) > 1 else 0.01
-    for t, o, c in zip(times, opens, closes):
-        color = "green" if c >= o else "red"
-        lower = min(o, c)
-        height = abs(c - o)
-        ax.add_patch(plt.Rectangle((t - width / 2, lower), width, max(height, 1e-9), color=color, alpha=0.6))
-
-    if overlay_session_vwap:
-        vwap = _session_vwap_series(candles)
-        ax.plot(times, vwap, color="blue", linewidth=1.0, label="session VWAP")
-        ax.legend(loc="best")
-
-    # Format x-axis as time
-    ax.xaxis_date()
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M\n%m-%d"))
-    ax.grid(True, linestyle=":", alpha=0.5)
-
-    fig.tight_layout()
-    fig.savefig(out_path, dpi=120)
-    plt.close(fig)
+    n = len(candles)
+    # Single pass over the candles; ms timestamps are exact in float64
+    ohlc = np.array(
+        [(c["timestamp"], c["open"], c["high"], c["low"], c["close"]) for c in candles],
+        dtype=np.float64,
+    )
+    ts, opens, highs, lows, closes = ohlc.T
+    times = mdates.date2num(ts.astype(np.int64).astype("datetime64[ms]"))
+
+    with _FIG_LOCK:
+        fig, ax = _figure()
+        ax.clear()
+        try:
+            ax.set_title(f"{symbol} — {timeframe} candlesticks")
+
+            # Draw wicks: one segment per bar in a single collection
+            wicks = np.column_stack([times, lows, times, highs]).reshape(-1, 2, 2)
+            ax.add_collection(LineCollection(wicks, colors="black", linewidths=0.8, rasterized=True))
+
+            # Draw bodies: one rectangle (4 vertices) per bar in a single collection
+            width = 0.6 * (times[1] - times[0]) if n > 1 else 0.01
+            left = times - width / 2
+            right = times + width / 2
+            lower = np.minimum(opens, closes)
+            upper = lower + np.maximum(np.abs(closes - opens), 1e-9)
+            bodies = np.stack(
+                [np.column_stack([left, lower]), np.column_stack([right, lower]),
+                 np.column_stack([right, upper]), np.column_stack([left, upper])],
+                axis=1,
+            )
+            colors = np.where(closes >= opens, "green", "red")
+            ax.add_collection(
+                PolyCollection(bodies, facecolors=colors, edgecolors=colors, alpha=0.6, rasterized=True)
+            )
+            ax.autoscale_view()
+
+            if overlay_session_vwap:
+                vwap = _session_vwap_series(candles)
+                ax.plot(times, vwap, color="blue", linewidth=1.0, label="session VWAP")
+                ax.legend(loc="best")
+
+            # Format x-axis as time
+            ax.xaxis_date()
+            ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M\n%m-%d"))
+            ax.grid(True, linestyle=":", alpha=0.5)
+
+            fig.tight_layout()
+            fig.savefig(out_path, dpi=REPORT_DPI, pil_kwargs={"optimize": True, "compress_level": 6})
+        finally:
+            ax.clear()
     return os.path.abspath(out_path)
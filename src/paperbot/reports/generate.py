@@ -9,7 +9,9 @@ Usage (venv):
 from __future__ import annotations
 
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
@@ -26,9 +28,30 @@ def _template_env(template_dir: str) -> Environment:
     )
 
 
+_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+
+@lru_cache(maxsize=1)
+def _get_template():
+    return _template_env(_TEMPLATE_DIR).get_template("report.html.j2")
+
+
+def _render_one(symbol: str, candles: List[Dict[str, Any]], timeframe: str, img_dir: str, out_dir: str) -> Dict[str, Any]:
+    """Render one symbol's PNG from already-fetched candles (runs inside a worker)."""
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    fname = f"{symbol.replace('/', '-')}_{timeframe}_{ts}.png"
+    out_png = os.path.join(img_dir, fname)
+    abs_path = save_candlestick_png(candles, symbol, timeframe, out_png, overlay_session_vwap=True)
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "image": os.path.relpath(abs_path, start=out_dir),
+        "bars": len(candles),
+    }
+
+
 def main() -> None:
     settings = load_settings()
-    fetcher = CandleFetcher(settings)
 
     # Where to write artifacts
     out_dir = os.environ.get("REPORT_DIR", "reports")
@@ -37,24 +60,19 @@ def main() -> None:
 
     bars = int(os.getenv("REPORT_BARS", "120"))
 
-    entries = []
-    for symbol in settings.symbols:
-        candles: List[Dict[str, Any]] = fetcher.fetch_candles(symbol, limit=bars)
-        ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        fname = f"{symbol.replace('/', '-')}_{settings.timeframe}_{ts}.png"
-        out_png = os.path.join(img_dir, fname)
-        abs_path = save_candlestick_png(candles, symbol, settings.timeframe, out_png, overlay_session_vwap=True)
-        entries.append({
-            "symbol": symbol,
-            "timeframe": settings.timeframe,
-            "image": os.path.relpath(abs_path, start=out_dir),
-            "bars": len(candles),
-        })
+    # Fetch every symbol concurrently (I/O), then render each in its own process (CPU)
+    symbols = list(settings.symbols)
+    candles_by_symbol = CandleFetcher(settings).fetch_candles_many(symbols, limit=bars)
+    workers = max(1, min(len(symbols), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [
+            ex.submit(_render_one, symbol, candles_by_symbol[symbol], settings.timeframe, img_dir, out_dir)
+            for symbol in symbols
+        ]
+        entries = [f.result() for f in futures]
 
     # Render HTML
-    template_dir = os.path.join(os.path.dirname(__file__), "templates")
-    env = _template_env(template_dir)
-    tpl = env.get_template("report.html.j2")
+    tpl = _get_template()
     html = tpl.render(generated_at=datetime.utcnow().isoformat() + "Z", entries=entries)
 
     out_html = os.path.join(out_dir, "index.html")
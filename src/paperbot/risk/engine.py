@@ -1,143 +1,243 @@
 from __future__ import annotations
 
+import math
 import time
-from typing import Any, Dict, Optional
-from ..metrics.exec import get_orders_blocked_total, get_killswitch_trips_total
+from functools import lru_cache
+from typing import Any, Dict, Optional, Set
+from ..metrics.exec import bind, get_orders_blocked_total, get_killswitch_trips_total
 from ..strategies.base import Signal
 from ..exec.model import Order, new_id
 from ..events.schema import EventEnvelope, RiskBlocked, DailyLossLimitBreach
-from ..events.bus import publish as publish_event
-from .killswitch import check_killswitch, set_killswitch_state as record_killswitch_state
+from ..events.bus import publish as publish_event, publish_batched
+from .killswitch import check_killswitch, set_killswitch_state as record_killswitch_state, state_version as killswitch_version
 from .halt_flags import (
+    DAILY_STOP_BIT,
     HALT_DAILY_STOP,
     HALT_KILL_SWITCH,
+    KILL_SWITCH_BIT,
+    bits as halt_bits,
     get_flag as get_halt_flag,
     set_flag as set_halt_flag,
     snapshot as snapshot_halt_flags,
 )
 
 
+@lru_cache(maxsize=4096)
+def _classify_market(symbol: str, default_market: str) -> str:
+    """Alphabetic-only symbols are equities; everything else keeps the engine's market."""
+    return "stocks" if symbol.isalpha() else default_market
+
+
+def _make_sizer(risk_frac: float, atr_stop_mult: float, max_value_frac: float):
+    """Build the entry sizer with the engine's fixed parameters bound as closure constants.
+
+    The returned `size(equity, atr14, price)` gives `(qty, block_reason)`, where
+    `block_reason` is None when the entry passes the qty and notional checks.
+    """
+    fabs = math.fabs
+
+    def size(equity: float, atr14: float, price: float):
+        stop_dist = atr14 * atr_stop_mult
+        if not stop_dist > 1e-9:  # also catches NaN
+            stop_dist = 1e-9
+        qty = (equity * risk_frac) / stop_dist
+        if qty <= 0:
+            return qty, "qty_zero"
+        # Enforce per-symbol notional cap
+        if equity > 0:
+            notional_frac = fabs(qty * price) / equity if price > 0 else 1.0
+            if notional_frac > max_value_frac:
+                return qty, "symbol_value_cap"
+        return qty, None
+
+    return size
+
+
 class RiskEngine:
+    __slots__ = (
+        "_risk_frac",
+        "_atr_stop_mult",
+        "atr_tp_mult",
+        "_daily_loss_cap_pct",
+        "max_positions",
+        "_max_position_value_per_symbol",
+        "_equity_start_of_day",
+        "_loss_threshold",
+        "market",
+        "killswitch_on",
+        "daily_stop_active",
+        "is_active",
+        "open_positions",
+        "_ks_version",
+        "_ks_market_active",
+        "_size",
+        "orders_blocked",
+        "killswitch_trips",
+    )
+
     def __init__(self, config: Dict[str, Any], equity_start: float, market: str = "crypto"):
         cfg = config or {}
-        self.risk_frac = float(cfg.get("risk_frac", 0.0025))
-        self.atr_stop_mult = float(cfg.get("atr_stop_mult", 1.5))
+        self._risk_frac = float(cfg.get("risk_frac", 0.0025))
+        self._atr_stop_mult = float(cfg.get("atr_stop_mult", 1.5))
         self.atr_tp_mult = float(cfg.get("atr_tp_mult", 1.0))
-        self.daily_loss_cap_pct = float(cfg.get("daily_loss_cap_pct", 0.01))
+        self._daily_loss_cap_pct = float(cfg.get("daily_loss_cap_pct", 0.01))
         self.max_positions = int(cfg.get("max_positions", 3))
-        self.max_position_value_per_symbol = float(cfg.get("max_position_value_per_symbol", 0.2))
-        self.equity_start_of_day = float(equity_start)
+        self._max_position_value_per_symbol = float(cfg.get("max_position_value_per_symbol", 0.2))
+        self._rebuild_sizer()
+        self.reset_day(equity_start)
         self.market = market or "crypto"
-        existing_kill = bool(check_killswitch(self.market))
+        self._ks_version = -1
+        self._ks_market_active = False
+        existing_kill = self._market_killswitch()
         flag_kill = get_halt_flag(HALT_KILL_SWITCH)
         self.killswitch_on = existing_kill or flag_kill
         self.daily_stop_active = get_halt_flag(HALT_DAILY_STOP)
         self.is_active = self.daily_stop_active or self.killswitch_on
-        self.open_positions: Dict[str, bool] = {}
-        # Metrics
+        # Symbols with an open position
+        self.open_positions: Set[str] = set()
+        # Metric handles (getters are cached); per-instance so tests can override them
         self.orders_blocked = get_orders_blocked_total()
         self.killswitch_trips = get_killswitch_trips_total()
         record_killswitch_state(self.market, self.killswitch_on)
 
+    # Sizing parameters are baked into the `_size` closure; writes rebuild it
+    @property
+    def risk_frac(self) -> float:
+        return self._risk_frac
+
+    @risk_frac.setter
+    def risk_frac(self, value: float) -> None:
+        self._risk_frac = float(value)
+        self._rebuild_sizer()
+
+    @property
+    def atr_stop_mult(self) -> float:
+        return self._atr_stop_mult
+
+    @atr_stop_mult.setter
+    def atr_stop_mult(self, value: float) -> None:
+        self._atr_stop_mult = float(value)
+        self._rebuild_sizer()
+
+    @property
+    def max_position_value_per_symbol(self) -> float:
+        return self._max_position_value_per_symbol
+
+    @max_position_value_per_symbol.setter
+    def max_position_value_per_symbol(self, value: float) -> None:
+        self._max_position_value_per_symbol = float(value)
+        self._rebuild_sizer()
+
+    def _rebuild_sizer(self) -> None:
+        self._size = _make_sizer(self._risk_frac, self._atr_stop_mult, self._max_position_value_per_symbol)
+
+    # Inputs of the cached daily-stop threshold; writes recompute it
+    @property
+    def equity_start_of_day(self) -> float:
+        return self._equity_start_of_day
+
+    @equity_start_of_day.setter
+    def equity_start_of_day(self, value: float) -> None:
+        self._equity_start_of_day = float(value)
+        self._update_loss_threshold()
+
+    @property
+    def daily_loss_cap_pct(self) -> float:
+        return self._daily_loss_cap_pct
+
+    @daily_loss_cap_pct.setter
+    def daily_loss_cap_pct(self, value: float) -> None:
+        self._daily_loss_cap_pct = float(value)
+        self._update_loss_threshold()
+
+    def _update_loss_threshold(self) -> None:
+        self._loss_threshold = self._equity_start_of_day * (1.0 - self._daily_loss_cap_pct)
+
+    def _blocked(self, reason: str, symbol: str):
+        """Return the memoized `orders_blocked_total{reason,symbol}` child."""
+        return bind(self.orders_blocked, reason, symbol)
+
+    def _reject(self, reason: str, ts: int, market: str, symbol: str, strategy: str, side: str) -> None:
+        """Count a blocked order and publish its RiskBlocked event (best effort)."""
+        self._blocked(reason, symbol).inc()
+        try:
+            # Fields are already typed here, so skip pydantic validation
+            evt = RiskBlocked.model_construct(ts=ts, market=market, symbol=symbol, strategy=strategy, side=side, reason=reason)
+            publish_batched(EventEnvelope.model_construct(correlation_id=f"{symbol}:{strategy}", event=evt))
+        except Exception:
+            pass
+        return None
+
     def on_realized_pnl(self, equity: float, timestamp: Optional[int] = None) -> None:
         """Update risk state after realized PnL adjustments.
 
         When the account draws down beyond the configured daily cap, trigger a
         session-level daily stop without engaging the global kill switch.
         """
-        threshold = self.equity_start_of_day * (1.0 - self.daily_loss_cap_pct)
-        if equity <= threshold:
-            if not self.daily_stop_active:
-                self.killswitch_trips.inc()
-                self._trigger_daily_stop(equity, timestamp)
+        if equity <= self._loss_threshold and not self.daily_stop_active:
+            self.killswitch_trips.inc()
+            self._trigger_daily_stop(equity, timestamp)
+
+    def _market_killswitch(self) -> bool:
+        """Kill switch state for this engine's market, re-read only after a state change."""
+        version = killswitch_version()
+        if version != self._ks_version:
+            self._ks_market_active = bool(check_killswitch(self.market))
+            self._ks_version = version
+        return self._ks_market_active
+
+    def reset_day(self, equity_start: float) -> None:
+        """Start a new trading day from `equity_start` (recomputes the loss threshold)."""
+        self.equity_start_of_day = equity_start
 
     def approve(self, signal: Signal, features: Dict[str, Any], equity: float) -> Optional[Order]:
-        ts = int(features.get("timestamp", signal.ts))
-        market = self.market if not signal.symbol.isalpha() else "stocks"
-        kill_switch_active = self.killswitch_on or get_halt_flag(HALT_KILL_SWITCH) or check_killswitch(self.market)
-        daily_stop_active = self.daily_stop_active or get_halt_flag(HALT_DAILY_STOP)
+        fget = features.get
+        symbol = signal.symbol
+        side = signal.side
+        strategy = signal.strategy
+        ts = int(fget("timestamp", signal.ts))
+        market = _classify_market(symbol, self.market)
+        flags = halt_bits()
+        kill_switch_active = self.killswitch_on or (flags & KILL_SWITCH_BIT) or self._market_killswitch()
+        daily_stop_active = self.daily_stop_active or (flags & DAILY_STOP_BIT)
         self.killswitch_on = bool(kill_switch_active)
         self.daily_stop_active = bool(daily_stop_active)
         self.is_active = self.daily_stop_active or self.killswitch_on
         if self.is_active:
             reason = "daily_stop" if self.daily_stop_active else "killswitch"
-            self.orders_blocked.labels(reason, signal.symbol).inc()
-            try:
-                evt = RiskBlocked(
-                    ts=ts,
-                    market=market,
-                    symbol=signal.symbol,
-                    strategy=signal.strategy,
-                    side=signal.side,
-                    reason=reason,
-                )
-                publish_event(EventEnvelope(correlation_id=signal.symbol+":"+signal.strategy, event=evt))
-            except Exception:
-                pass
-            return None
+            return self._reject(reason, ts, market, symbol, strategy, side)
 
-        symbol = signal.symbol
-        side = signal.side
-        price = float(features.get("price", 0.0)) or float(features.get("close", 0.0))
-        atr14 = float(features.get("atr14", 0.0))
+        price = float(fget("price", 0.0)) or float(fget("close", 0.0))
+        atr14 = float(fget("atr14", 0.0))
 
         # Manage max positions
-        open_count = sum(1 for v in self.open_positions.values() if v)
-        if side in ("long", "short") and open_count >= self.max_positions and not self.open_positions.get(symbol, False):
-            self.orders_blocked.labels("max_positions", symbol).inc()
-            try:
-                evt = RiskBlocked(
-                    ts=ts,
-                    market="crypto",
-                    symbol=symbol,
-                    strategy=signal.strategy,
-                    side=signal.side,
-                    reason="max_positions",
-                )
-                publish_event(EventEnvelope(correlation_id=symbol+":"+signal.strategy, event=evt))
-            except Exception:
-                pass
-            return None
+        open_positions = self.open_positions
+        is_open = symbol in open_positions
+        if side in ("long", "short") and len(open_positions) >= self.max_positions and not is_open:
+            return self._reject("max_positions", ts, "crypto", symbol, strategy, side)
 
         # flat = exit if open
         if side == "flat":
-            if self.open_positions.get(symbol, False):
-                order_side = "sell" if features.get("position_side", "long") == "long" else "buy"
+            if is_open:
+                open_positions.discard(symbol)
+                order_side = "sell" if fget("position_side", "long") == "long" else "buy"
                 return Order(
                     id=new_id(), ts=ts, symbol=symbol, side=order_side, type="market",
-                    qty=abs(float(features.get("position_qty", 0.0))) or 0.0, price=None,
-                    strategy=signal.strategy, reason=signal.reason, params=signal.params,
+                    qty=abs(float(fget("position_qty", 0.0))) or 0.0, price=None,
+                    strategy=strategy, reason=signal.reason, params=signal.params,
                 )
             return None
 
         # Sizing for entries
-        stop_dist = max(atr14 * self.atr_stop_mult, 1e-9)
-        qty = (equity * self.risk_frac) / stop_dist
-        if qty <= 0:
-            self.orders_blocked.labels("qty_zero", symbol).inc()
-            try:
-                evt = RiskBlocked(ts=ts, market="crypto", symbol=symbol, strategy=signal.strategy, side=signal.side, reason="qty_zero")
-                publish_event(EventEnvelope(correlation_id=symbol+":"+signal.strategy, event=evt))
-            except Exception:
-                pass
-            return None
-        # Enforce per-symbol notional cap
-        if equity > 0:
-            notional_frac = abs(qty * price) / equity if price > 0 else 1.0
-            if notional_frac > self.max_position_value_per_symbol:
-                self.orders_blocked.labels("symbol_value_cap", symbol).inc()
-                try:
-                    evt = RiskBlocked(ts=ts, market="crypto", symbol=symbol, strategy=signal.strategy, side=signal.side, reason="symbol_value_cap")
-                    publish_event(EventEnvelope(correlation_id=symbol+":"+signal.strategy, event=evt))
-                except Exception:
-                    pass
-                return None
+        qty, block = self._size(equity, atr14, price)
+        if block is not None:
+            return self._reject(block, ts, "crypto", symbol, strategy, side)
 
         order_side = "buy" if side == "long" else "sell"
-        self.open_positions[symbol] = True
+        open_positions.add(symbol)
         return Order(
             id=new_id(), ts=ts, symbol=symbol, side=order_side, type="market",
-            qty=float(qty), price=None, strategy=signal.strategy, reason=signal.reason, params=signal.params,
+            qty=float(qty), price=None, strategy=strategy, reason=signal.reason, params=signal.params,
         )
 
     def _trigger_daily_stop(self, equity: float, timestamp: Optional[int]) -> None:
@@ -148,7 +248,7 @@ class RiskEngine:
         if self.equity_start_of_day:
             pct_drop = max(0.0, (self.equity_start_of_day - float(equity)) / self.equity_start_of_day)
         ts = timestamp if timestamp is not None else int(time.time() * 1000)
-        self.killswitch_on = bool(get_halt_flag(HALT_KILL_SWITCH) or check_killswitch(self.market))
+        self.killswitch_on = bool(get_halt_flag(HALT_KILL_SWITCH) or self._market_killswitch())
         record_killswitch_state(self.market, self.killswitch_on)
         try:
             evt = DailyLossLimitBreach(
@@ -1,51 +1,86 @@
 """Global risk halt flags used to coordinate session-wide stop states.
 
-These flags are intentionally simple (module-level dict) because the
+These flags are intentionally simple (a module-level bitmask) because the
 current runtime is a single-process paper trading bot. If/when we migrate
 execution into a distributed service, this module becomes the seam for
 backing the flags with Redis or another shared datastore.
+
+Flags are addressed by name (`HALT_DAILY_STOP`, ...) and stored as bits of a
+single int, so hot paths can read every flag with one load via `bits()`.
 """
 from __future__ import annotations
 
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
 HALT_DAILY_STOP = "DAILY_STOP"
 HALT_KILL_SWITCH = "KILL_SWITCH"
 
+DAILY_STOP_BIT = 1 << 0
+KILL_SWITCH_BIT = 1 << 1
+
 # Maintain a predictable set of flags so callers can snapshot safely.
-_default_flags = {
-    HALT_DAILY_STOP: False,
-    HALT_KILL_SWITCH: False,
+_bit_of: Dict[str, int] = {
+    HALT_DAILY_STOP: DAILY_STOP_BIT,
+    HALT_KILL_SWITCH: KILL_SWITCH_BIT,
 }
 
-_flags: Dict[str, bool] = dict(_default_flags)
+_bits = 0
+# Read-only snapshot of the current flags; dropped whenever the flags change
+_snapshot_cache: Optional[Mapping[str, bool]] = None
+
+
+def _bit(name: str) -> int:
+    global _snapshot_cache
+    bit = _bit_of.get(name)
+    if bit is None:
+        _snapshot_cache = None
+        # Allow discovery of new flags without crashing; assign the next bit.
+        bit = _bit_of[name] = 1 << len(_bit_of)
+    return bit
 
 
 def set_flag(name: str, active: bool) -> None:
     """Set a halt flag to the provided boolean state."""
-    if name not in _flags:
-        # Allow discovery of new flags without crashing; default to bool.
-        _flags[name] = bool(active)
-        return
-    _flags[name] = bool(active)
+    global _bits, _snapshot_cache
+    bit = _bit(name)
+    new = _bits | bit if active else _bits & ~bit
+    if new != _bits:
+        _bits = new
+        _snapshot_cache = None
 
 
 def get_flag(name: str) -> bool:
     """Return the current boolean state for a halt flag (defaults False)."""
-    return bool(_flags.get(name, False))
+    bit = _bit_of.get(name)
+    return bit is not None and bool(_bits & bit)
+
+
+def bits() -> int:
+    """Return the raw flag bitmask (test with `DAILY_STOP_BIT` / `KILL_SWITCH_BIT`)."""
+    return _bits
 
 
 def reset_flags() -> None:
     """Reset all known halt flags to their default (False)."""
-    for key in list(_flags.keys()):
-        _flags[key] = _default_flags.get(key, False)
+    global _bits, _snapshot_cache
+    _bits = 0
+    _snapshot_cache = None
+
 
+def snapshot() -> Mapping[str, bool]:
+    """Return a read-only name -> state mapping of the current halt flags.
 
-def snapshot() -> Dict[str, bool]:
-    """Return a shallow copy of the current halt flag states."""
-    return dict(_flags)
+    The mapping is cached and only rebuilt after a flag changes.
+    """
+    global _snapshot_cache
+    snap = _snapshot_cache
+    if snap is None:
+        b = _bits
+        snap = _snapshot_cache = MappingProxyType({name: bool(b & bit) for name, bit in _bit_of.items()})
+    return snap
 
 
 def any_active() -> bool:
     """Convenience helper: return True if any halt flag is active."""
-    return any(bool(val) for val in _flags.values())
+    return _bits != 0
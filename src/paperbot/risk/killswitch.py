@@ -1,33 +1,65 @@
 from __future__ import annotations
 
+from array import array
 from typing import Dict
 
 from paperbot.metrics.exec import set_killswitch_state as _set_state_metric
 
 
-_state: Dict[str, bool] = {}
+# Per-market state: market -> slot in a byte array (markets are few and fixed)
+_idx: Dict[str, int] = {}
+_arr = array("b")
+# Derived from _arr on every write so readers avoid scanning it
+_any_active = False
+# Bumped whenever a market's state changes; lets callers memoize per-market reads
+_version = 0
+
+
+def _changed() -> None:
+    global _any_active, _version
+    _any_active = any(_arr)
+    _version += 1
+
+
+def _slot(market_key: str) -> int:
+    i = _idx.get(market_key)
+    if i is None:
+        i = _idx[market_key] = len(_arr)
+        _arr.append(0)
+    return i
 
 
 def set_killswitch_state(market: str, active: bool) -> None:
     """Record kill switch state and update Prometheus gauge."""
     market_key = market or "unknown"
-    _state[market_key] = bool(active)
-    _set_state_metric(market_key, bool(active))
+    active = bool(active)
+    i = _slot(market_key)
+    if _arr[i] != active:
+        _arr[i] = active
+        _changed()
+    _set_state_metric(market_key, active)
+
+
+def state_version() -> int:
+    """Monotonic counter of kill switch state changes."""
+    return _version
 
 
 def check_killswitch(market: str | None = None) -> bool:
     """Return True if kill switch active for a market or any market."""
     if market is None:
-        return any(_state.values())
-    return _state.get(market or "unknown", False)
+        return _any_active
+    i = _idx.get(market or "unknown")
+    return i is not None and _arr[i] == 1
 
 
 def reset_killswitch(market: str | None = None) -> None:
     """Clear kill switch state (primarily for tests)."""
     if market is None:
-        keys = list(_state.keys())
+        keys = list(_idx.keys())
     else:
         keys = [market or "unknown"]
     for key in keys:
-        _state[key] = False
+        _arr[_slot(key)] = 0
         _set_state_metric(key, False)
+    _changed()
@@ -0,0 +1 @@
+"""Runtime helpers (periodic task scheduling)."""
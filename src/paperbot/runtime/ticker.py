@@ -0,0 +1,120 @@
+"""
+Single-thread scheduler for periodic background tasks.
+
+What it does:
+- Runs registered callbacks (`every`, `call_later`) from one daemon thread
+  instead of one sleeping thread per task.
+- Orders pending runs in a heap keyed by monotonic due time; the thread sleeps
+  on a condition until the next task is due or a new task is added.
+
+Where it is used:
+- `paperbot.main` for MTM/equity ticks and the pattern observability demo.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (due, seq, interval or None, fn, deadline or None)
+_Entry = Tuple[float, int, Optional[float], Callable[[], None], Optional[float]]
+
+
+class Scheduler:
+    """Cooperative scheduler draining all periodic callbacks on one thread.
+
+    Callbacks should be short; exceptions are logged at debug level and do
+    not stop the schedule.
+    """
+
+    def __init__(self, name: str = "paperbot-ticker"):
+        self._name = name
+        self._heap: List[_Entry] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def every(
+        self,
+        interval_s: float,
+        fn: Callable[[], None],
+        duration_s: Optional[float] = None,
+        first_delay_s: float = 0.0,
+    ) -> None:
+        """Run `fn` every `interval_s` seconds, optionally only for `duration_s`."""
+        now = time.monotonic()
+        deadline = now + duration_s if duration_s is not None else None
+        self._push((now + first_delay_s, next(self._seq), float(interval_s), fn, deadline))
+
+    def call_later(self, delay_s: float, fn: Callable[[], None]) -> None:
+        """Run `fn` once after `delay_s` seconds."""
+        self._push((time.monotonic() + delay_s, next(self._seq), None, fn, None))
+
+    def start(self) -> "Scheduler":
+        with self._cond:
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._heap.clear()
+            self._cond.notify()
+        t, self._thread = self._thread, None
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout=1.0)
+
+    def _push(self, entry: _Entry) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self._heap:
+                        wait = self._heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._stopped:
+                    return
+                due, seq, interval, fn, deadline = heapq.heappop(self._heap)
+            try:
+                fn()
+            except Exception:
+                # Periodic tasks are best-effort (metrics/demo); keep the schedule running
+                logger.debug("scheduled task %r failed", fn, exc_info=True)
+            if interval is not None:
+                nxt = due + interval
+                now = time.monotonic()
+                if nxt < now:
+                    # Skip missed runs rather than bursting to catch up
+                    nxt = now + interval
+                if deadline is None or nxt < deadline:
+                    self._push((nxt, seq, interval, fn, deadline))
+
+
+_default: Optional[Scheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """Process-wide scheduler, started on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Scheduler().start()
+        return _default
@@ -10,11 +10,25 @@ Per Phase 1.2 scope, strategies emit signals only (no sizing yet).
 from dataclasses import dataclass
 from typing import Any, Dict, Optional, Literal
 
+import numpy as np
+
 
 Side = Literal["long", "short", "flat"]
 
+# Integer position-state codes for strategies' per-symbol state arrays
+FLAT, LONG, SHORT = 0, 1, 2
+
+
+def grow_zeros(arr: np.ndarray, size: int) -> np.ndarray:
+    """Return `arr` zero-padded to at least `size` rows (capacity doubles)."""
+    if size <= len(arr):
+        return arr
+    out = np.zeros(max(size, 2 * len(arr), 8), dtype=arr.dtype)
+    out[: len(arr)] = arr
+    return out
+
 
-@dataclass
+@dataclass(slots=True)
 class Signal:
     """A normalized trading signal.
 
@@ -4,8 +4,35 @@ from __future__ import annotations
 Momentum strategy: long-only using RSI bands with optional confirmation bars.
 """
 
-from typing import Any, Dict, Optional
-from .base import Strategy, Signal
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .._njit import HAVE_NUMBA, njit
+from ..metrics.exec import NULL_METRIC, bind_child
+from .base import FLAT, LONG, Signal, Strategy, grow_zeros
+
+# Outcomes of one `_momentum_step`
+EMIT_NONE, EMIT_ENTER, EMIT_EXIT, EMIT_SUPPRESSED = 0, 1, 2, 3
+
+
+@njit(cache=True)
+def _momentum_step(state, confirm, rsi, enter_long, exit_long, confirm_bars):
+    """One bar of the momentum state machine: return (state, confirm, emit code)."""
+    hit = rsi >= enter_long if state == FLAT else rsi <= exit_long
+    if not hit:
+        return state, 0, EMIT_NONE
+    if confirm_bars > 0:
+        confirm += 1
+        if confirm < confirm_bars:
+            return state, confirm, EMIT_SUPPRESSED
+    if state == FLAT:
+        return LONG, 0, EMIT_ENTER
+    return FLAT, 0, EMIT_EXIT
+
+
+if HAVE_NUMBA:  # pragma: no cover - compile once at import, not on the first bar
+    _momentum_step(FLAT, 0, 50.0, 60.0, 50.0, 0)
 
 
 class MomentumStrategy(Strategy):
@@ -14,74 +41,87 @@ class MomentumStrategy(Strategy):
         self.enter_long = float(config.get("enter_long_if_rsi_at_least", 60))
         self.exit_long = float(config.get("exit_long_if_rsi_at_most", 50))
         self.confirm_bars = int(config.get("confirm_bars", 0))
-        self._state: Dict[str, str] = {}
-        self._confirm: Dict[str, int] = {}
+        # Per-symbol state as parallel arrays indexed via _idx (state: FLAT | LONG)
+        self._idx: Dict[str, int] = {}
+        self._state_arr = np.zeros(8, dtype=np.int8)
+        self._confirm_arr = np.zeros(8, dtype=np.int32)
         self._suppressed_counter = None
+        self._suppressed_child = NULL_METRIC
 
     def bind_metrics(self, suppressed_counter):
         """Optionally bind a Prometheus counter for suppressed signals."""
         self._suppressed_counter = suppressed_counter
+        self._suppressed_child = bind_child(suppressed_counter, strat=self.name, reason="debounce")
 
-    def _inc_confirm(self, symbol: str) -> int:
-        self._confirm[symbol] = self._confirm.get(symbol, 0) + 1
-        return self._confirm[symbol]
+    def _slot(self, symbol: str) -> int:
+        i = self._idx.get(symbol)
+        if i is None:
+            i = self._idx[symbol] = len(self._idx)
+            self._state_arr = grow_zeros(self._state_arr, i + 1)
+            self._confirm_arr = grow_zeros(self._confirm_arr, i + 1)
+        return i
 
-    def _reset_confirm(self, symbol: str) -> None:
-        self._confirm[symbol] = 0
-
-    def on_bar(self, features: Dict[str, Any]) -> Optional[Signal]:
-        symbol = str(features.get("symbol", ""))
-        ts = int(features.get("timestamp", 0))
-        rsi = float(features.get("rsi14", 50.0))
-        state = self._state.get(symbol, "flat")
-
-        params = {
+    def _params(self) -> Dict[str, Any]:
+        return {
             "enter_long_if_rsi_at_least": self.enter_long,
             "exit_long_if_rsi_at_most": self.exit_long,
             "confirm_bars": self.confirm_bars,
         }
 
-        # Enter long from flat
-        if state == "flat":
-            if rsi >= self.enter_long:
-                if self.confirm_bars > 0:
-                    cnt = self._inc_confirm(symbol)
-                    if cnt < self.confirm_bars:
-                        if self._suppressed_counter is not None:
-                            try:
-                                self._suppressed_counter.labels(strat=self.name, reason="debounce").inc()
-                            except Exception:
-                                pass
-                        return None
-                # confirmed
-                self._reset_confirm(symbol)
-                self._state[symbol] = "long"
-                denom = max(1.0, (self.enter_long - self.exit_long))
-                strength = max(0.0, min(1.0, (rsi - self.exit_long) / denom))
-                return Signal(ts=ts, symbol=symbol, strategy=self.name, side="long",
-                              strength=strength, reason=f"enter_long:rsi>={self.enter_long}",
-                              params=params)
-            else:
-                self._reset_confirm(symbol)
-
-        # Exit to flat from long
-        if state == "long":
-            if rsi <= self.exit_long:
-                if self.confirm_bars > 0:
-                    cnt = self._inc_confirm(symbol)
-                    if cnt < self.confirm_bars:
-                        if self._suppressed_counter is not None:
-                            try:
-                                self._suppressed_counter.labels(strat=self.name, reason="debounce").inc()
-                            except Exception:
-                                pass
-                        return None
-                self._reset_confirm(symbol)
-                self._state[symbol] = "flat"
-                return Signal(ts=ts, symbol=symbol, strategy=self.name, side="flat",
-                              strength=1.0, reason=f"exit_long:rsi<={self.exit_long}",
-                              params=params)
-            else:
-                self._reset_confirm(symbol)
+    def _suppressed(self, n: int = 1) -> None:
+        self._suppressed_child.inc(n)
+
+    def _enter_signal(self, ts: int, symbol: str, rsi: float) -> Signal:
+        denom = max(1.0, (self.enter_long - self.exit_long))
+        strength = max(0.0, min(1.0, (rsi - self.exit_long) / denom))
+        return Signal(ts=ts, symbol=symbol, strategy=self.name, side="long",
+                      strength=strength, reason=f"enter_long:rsi>={self.enter_long}",
+                      params=self._params())
 
+    def _exit_signal(self, ts: int, symbol: str) -> Signal:
+        return Signal(ts=ts, symbol=symbol, strategy=self.name, side="flat",
+                      strength=1.0, reason=f"exit_long:rsi<={self.exit_long}",
+                      params=self._params())
+
+    def on_bar(self, features: Dict[str, Any]) -> Optional[Signal]:
+        get = features.get
+        symbol = str(get("symbol", ""))
+        ts = int(get("timestamp", 0))
+        rsi = float(get("rsi14", 50.0))
+        i = self._slot(symbol)
+        state, confirm, emit = _momentum_step(
+            int(self._state_arr[i]), int(self._confirm_arr[i]), rsi,
+            self.enter_long, self.exit_long, self.confirm_bars,
+        )
+        self._state_arr[i] = state
+        self._confirm_arr[i] = confirm
+        if emit == EMIT_ENTER:
+            return self._enter_signal(ts, symbol, rsi)
+        if emit == EMIT_EXIT:
+            return self._exit_signal(ts, symbol)
+        if emit == EMIT_SUPPRESSED:
+            self._suppressed()
         return None
+
+    def on_bars(self, symbol: str, ts: Sequence[int], rsi: Sequence[float]) -> List[Signal]:
+        """Replay consecutive bars for one symbol; same signals as calling `on_bar` per bar."""
+        rsi_list = np.asarray(rsi, dtype=float).tolist()
+        i = self._slot(symbol)
+        state = int(self._state_arr[i])
+        confirm = int(self._confirm_arr[i])
+        enter_long, exit_long, cb = self.enter_long, self.exit_long, self.confirm_bars
+        out: List[Signal] = []
+        suppressed = 0
+        for k, value in enumerate(rsi_list):
+            state, confirm, emit = _momentum_step(state, confirm, value, enter_long, exit_long, cb)
+            if emit == EMIT_ENTER:
+                out.append(self._enter_signal(int(ts[k]), symbol, value))
+            elif emit == EMIT_EXIT:
+                out.append(self._exit_signal(int(ts[k]), symbol))
+            elif emit == EMIT_SUPPRESSED:
+                suppressed += 1
+        self._state_arr[i] = state
+        self._confirm_arr[i] = confirm
+        if suppressed:
+            self._suppressed(suppressed)
+        return out
@@ -5,8 +5,12 @@ Mean Reversion strategy using z-score to session VWAP with hysteresis and a
 realized-volatility gate.
 """
 
-from typing import Any, Dict, Optional
-from .base import Strategy, Signal
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..metrics.exec import NULL_METRIC, bind_child
+from .base import FLAT, LONG, SHORT, Signal, Strategy, grow_zeros
 
 
 class MeanReversionStrategy(Strategy):
@@ -18,31 +22,26 @@ class MeanReversionStrategy(Strategy):
         self.enter_short_if_above = float(config.get("enter_short_if_above", 1.5))
         self.exit_short_if_below = float(config.get("exit_short_if_below", 0.3))
         self.vol_gate_rv_30m_max = float(config.get("vol_gate_rv_30m_max", 0.03))
-        # Per-symbol state: "long" | "short" | "flat"
-        self._state: Dict[str, str] = {}
+        # Per-symbol state (FLAT | LONG | SHORT) in an array indexed via _idx
+        self._idx: Dict[str, int] = {}
+        self._state_arr = np.zeros(8, dtype=np.int8)
         self._suppressed_counter = None
+        self._suppressed_child = NULL_METRIC
 
     def bind_metrics(self, suppressed_counter):
         """Optionally bind a Prometheus counter for suppressed signals."""
         self._suppressed_counter = suppressed_counter
+        self._suppressed_child = bind_child(suppressed_counter, strat=self.name, reason="vol_gate")
 
-    def on_bar(self, features: Dict[str, Any]) -> Optional[Signal]:
-        symbol = str(features.get("symbol", ""))
-        ts = int(features.get("timestamp", 0))
-        z_vwap = float(features.get("z_vwap", 0.0))
-        rv_30m = float(features.get("rv_30m", 0.0))
-
-        # Volatility gate: suppress entries when realized vol is too high
-        if rv_30m >= self.vol_gate_rv_30m_max:
-            if self._suppressed_counter is not None:
-                try:
-                    self._suppressed_counter.labels(strat=self.name, reason="vol_gate").inc()
-                except Exception:
-                    pass
-            return None
+    def _slot(self, symbol: str) -> int:
+        i = self._idx.get(symbol)
+        if i is None:
+            i = self._idx[symbol] = len(self._idx)
+            self._state_arr = grow_zeros(self._state_arr, i + 1)
+        return i
 
-        state = self._state.get(symbol, "flat")
-        params = {
+    def _params(self) -> Dict[str, Any]:
+        return {
             "enter_long_if_below": self.enter_long_if_below,
             "exit_long_if_above": self.exit_long_if_above,
             "enter_short_if_above": self.enter_short_if_above,
@@ -50,32 +49,83 @@ class MeanReversionStrategy(Strategy):
             "vol_gate_rv_30m_max": self.vol_gate_rv_30m_max,
         }
 
+    def _suppressed(self, n: int = 1) -> None:
+        self._suppressed_child.inc(n)
+
+    def _step(self, state: int, ts: int, symbol: str, z_vwap: float):
+        """Apply one bar's entry/exit rules; return (new_state, signal or None)."""
         # Entries from flat
-        if state == "flat":
+        if state == FLAT:
             if z_vwap <= self.enter_long_if_below:
                 strength = min(1.0, abs(z_vwap) / 2.5)
-                self._state[symbol] = "long"
-                return Signal(ts=ts, symbol=symbol, strategy=self.name, side="long",
-                              strength=strength, reason=f"enter_long:z<={self.enter_long_if_below}",
-                              params=params)
+                return LONG, Signal(ts=ts, symbol=symbol, strategy=self.name, side="long",
+                                    strength=strength, reason=f"enter_long:z<={self.enter_long_if_below}",
+                                    params=self._params())
             if z_vwap >= self.enter_short_if_above:
                 strength = min(1.0, abs(z_vwap) / 2.5)
-                self._state[symbol] = "short"
-                return Signal(ts=ts, symbol=symbol, strategy=self.name, side="short",
-                              strength=strength, reason=f"enter_short:z>={self.enter_short_if_above}",
-                              params=params)
+                return SHORT, Signal(ts=ts, symbol=symbol, strategy=self.name, side="short",
+                                     strength=strength, reason=f"enter_short:z>={self.enter_short_if_above}",
+                                     params=self._params())
 
         # Exits via hysteresis
-        if state == "long" and z_vwap >= self.exit_long_if_above:
-            self._state[symbol] = "flat"
-            return Signal(ts=ts, symbol=symbol, strategy=self.name, side="flat",
-                          strength=1.0, reason=f"exit_long:z>={self.exit_long_if_above}",
-                          params=params)
-
-        if state == "short" and z_vwap <= self.exit_short_if_below:
-            self._state[symbol] = "flat"
-            return Signal(ts=ts, symbol=symbol, strategy=self.name, side="flat",
-                          strength=1.0, reason=f"exit_short:z<={self.exit_short_if_below}",
-                          params=params)
-
-        return None
+        elif state == LONG:
+            if z_vwap >= self.exit_long_if_above:
+                return FLAT, Signal(ts=ts, symbol=symbol, strategy=self.name, side="flat",
+                                    strength=1.0, reason=f"exit_long:z>={self.exit_long_if_above}",
+                                    params=self._params())
+
+        elif state == SHORT and z_vwap <= self.exit_short_if_below:
+            return FLAT, Signal(ts=ts, symbol=symbol, strategy=self.name, side="flat",
+                                strength=1.0, reason=f"exit_short:z<={self.exit_short_if_below}",
+                                params=self._params())
+
+        return state, None
+
+    def on_bar(self, features: Dict[str, Any]) -> Optional[Signal]:
+        get = features.get
+        rv_30m = float(get("rv_30m", 0.0))
+
+        # Volatility gate: suppress entries when realized vol is too high
+        if rv_30m >= self.vol_gate_rv_30m_max:
+            self._suppressed()
+            return None
+
+        symbol = str(get("symbol", ""))
+        ts = int(get("timestamp", 0))
+        z_vwap = float(get("z_vwap", 0.0))
+
+        i = self._slot(symbol)
+        prev = int(self._state_arr[i])
+        state, sig = self._step(prev, ts, symbol, z_vwap)
+        if state != prev:
+            self._state_arr[i] = state
+        return sig
+
+    def on_bars(
+        self, symbol: str, ts: Sequence[int], z_vwap: Sequence[float], rv_30m: Sequence[float]
+    ) -> List[Signal]:
+        """Replay consecutive bars for one symbol; same signals as calling `on_bar` per bar.
+
+        The volatility gate and the entry/exit thresholds are evaluated for the
+        whole series at once; only bars that can change state are stepped.
+        """
+        z = np.asarray(z_vwap, dtype=float)
+        gated = np.asarray(rv_30m, dtype=float) >= self.vol_gate_rv_30m_max
+        # Bars that could trigger any transition, whatever the current state
+        active = ~gated & (
+            (z <= self.enter_long_if_below) | (z >= self.enter_short_if_above)
+            | (z >= self.exit_long_if_above) | (z <= self.exit_short_if_below)
+        )
+        i = self._slot(symbol)
+        state = prev = int(self._state_arr[i])
+        out: List[Signal] = []
+        for k in np.flatnonzero(active).tolist():
+            state, sig = self._step(state, int(ts[k]), symbol, float(z[k]))
+            if sig is not None:
+                out.append(sig)
+        if state != prev:
+            self._state_arr[i] = state
+        n_gated = int(gated.sum())
+        if n_gated:
+            self._suppressed(n_gated)
+        return out
@@ -4,12 +4,14 @@ from __future__ import annotations
 StrategyRunner dispatches feature rows to strategies and tracks metrics.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from .base import Strategy, Signal
+import atexit
+import logging
 import os
-from ..logs.decision_log import append_jsonl
-from ..events.schema import OrderIntent, EventEnvelope
-from ..events.bus import publish as publish_event
+from ..logs.decision_log import append_jsonl_many
+from ..events.schema import OrderIntent
+from ..events.bus import publish_raw_many as publish_events
 try:
     from ..metrics.exec import (
         inc_pattern_detected,
@@ -21,17 +23,55 @@ except Exception:  # pragma: no cover
     inc_pattern_detected = inc_pattern_intent = observe_pattern_to_intent_latency = None  # type: ignore
 
 try:
-    from ..logs.decision_log import log_pattern_event
+    from ..logs.decision_log import log_pattern_event, log_pattern_events
 except Exception:  # pragma: no cover
-    log_pattern_event = None  # type: ignore
+    log_pattern_event = log_pattern_events = None  # type: ignore
 
 try:
     from prometheus_client import Counter
 except Exception:  # pragma: no cover - metrics optional in tests
     Counter = None  # type: ignore
 
+log = logging.getLogger(__name__)
+
+# Default OrderIntent run_id, so raw intent dicts match OrderIntent.model_dump()
+_INTENT_RUN_ID = OrderIntent.model_fields["run_id"].default
+
+# Feature keys recorded as `features_used` in decision records
+_DECISION_FEATURES = ("rsi14", "z_vwap", "atr14")
+
+# Decision record layout with the constant fields filled in; per-signal records
+# are shallow copies (key order is kept, so the JSON lines are unchanged)
+_DECISION_TEMPLATE: Dict[str, Any] = {
+    "ts": None,
+    "symbol": None,
+    "market": None,
+    "strategy": None,
+    "action": None,
+    "confidence": None,
+    "features_used": None,
+    "signals_used": None,
+    "risk_context": "n/a",
+    "flow_evidence": "runner:on_bar",
+    "gates_passed": (),
+    "gates_failed": (),
+    "outcome": "emitted",
+}
+
 
 class StrategyRunner:
+    __slots__ = (
+        "strategies",
+        "signals_counter",
+        "suppressed_counter",
+        "_sig_children",
+        "_on_bar",
+        "_market",
+        "_strict",
+        "_decision_log_path",
+        "_decision_log_enabled",
+    )
+
     def __init__(
         self,
         strategies: List[Strategy],
@@ -39,8 +79,12 @@ class StrategyRunner:
         suppressed_counter: Optional["Counter"] = None,
     ):
         self.strategies = strategies
+        self.rebind()
         self.signals_counter = signals_counter
+        # signals_counter children keyed by (strat, side), bound on first use
+        self._sig_children: Dict[Tuple[str, str], Any] = {}
         self.suppressed_counter = suppressed_counter
+        self.refresh_env()
         # Bind optional suppressed counter into strategies that support it
         for strat in self.strategies:
             if hasattr(strat, "bind_metrics"):
@@ -49,60 +93,132 @@ class StrategyRunner:
                 except Exception:
                     pass
 
+    def rebind(self) -> None:
+        """Re-resolve the strategies' on_bar methods (after changing `self.strategies`)."""
+        # Bound on_bar methods, resolved once instead of per row and strategy
+        self._on_bar = tuple(strat.on_bar for strat in self.strategies)
+
+    def refresh_env(self) -> None:
+        """(Re)read APP_TRACK, DECISION_LOG_PATH/_ENABLED and PAPERBOT_STRICT; they are cached for the hot path.
+
+        DECISION_LOG_ENABLED=0 skips building decision records altogether. With
+        PAPERBOT_STRICT=1, errors while recording signals propagate instead of
+        being logged at debug level.
+        """
+        self._market = os.getenv("APP_TRACK", "crypto")
+        self._strict = os.getenv("PAPERBOT_STRICT", "0") == "1"
+        self._decision_log_path = os.getenv("DECISION_LOG_PATH", "data/decisions/phase2.jsonl")
+        self._decision_log_enabled = os.getenv("DECISION_LOG_ENABLED", "1") != "0"
+
     def on_feature_row(self, row: Dict[str, Any]) -> List[Signal]:
         signals: List[Signal] = []
-        for strat in self.strategies:
-            out = strat.on_bar(row)
+        for on_bar in self._on_bar:
+            out = on_bar(row)
             if out is not None:
                 signals.append(out)
-                if self.signals_counter is not None:
-                    try:
-                        self.signals_counter.labels(strat=out.strategy, side=out.side, symbol=out.symbol).inc()
-                    except Exception:
-                        # Ignore metrics failures in tests
-                        pass
-                # Decision log record (v2 groundwork)
-                try:
-                    market = os.getenv("APP_TRACK", "crypto")
-                    rec = {
-                        "ts": int(row.get("timestamp", out.ts)),
-                        "symbol": out.symbol,
-                        "market": market,
-                        "strategy": out.strategy,
-                        "action": out.side,
-                        "confidence": float(out.strength),
-                        "features_used": [k for k in ("rsi14","z_vwap","atr14") if k in row],
-                        "signals_used": [out.strategy],
-                        "risk_context": "n/a",
-                        "flow_evidence": "runner:on_bar",
-                        "gates_passed": [],
-                        "gates_failed": [],
-                        "outcome": "emitted",
-                    }
-                    path = os.getenv("DECISION_LOG_PATH", "data/decisions/phase2.jsonl")
-                    append_jsonl(path, rec)
-                except Exception:
-                    pass
-                # Emit an order_intent event (minimal) for strong signals
-                try:
-                    intent = OrderIntent(
-                        ts=int(row.get("timestamp", out.ts)),
-                        market=os.getenv("APP_TRACK", "crypto"),
-                        symbol=out.symbol,
-                        strategy=out.strategy,
-                        side=out.side,
-                        confidence=float(out.strength),
-                        notional_usd=float(row.get("price", row.get("close", 0.0))) * 1.0,
-                    )
-                    env = EventEnvelope(correlation_id=out.symbol + ":" + out.strategy, event=intent)
-                    publish_event(env)
-                except Exception:
-                    pass
+        if _PENDING_PATTERN_LOGS:
+            flush_pattern_logs()
+        if signals:
+            try:
+                self._emit(row, signals)
+            except Exception:
+                # Metrics/logging/events must not break the trading loop (unless strict)
+                if self._strict:
+                    raise
+                log.debug("strategy runner: emit failed", exc_info=True)
         return signals
 
+    def _emit(self, row: Dict[str, Any], signals: List[Signal]) -> None:
+        """Count, decision-log and publish one row's signals.
+
+        Order intents are published in one pipeline and then decision records
+        appended in one write, after all strategies have run.
+        """
+        counter = self.signals_counter
+        children = self._sig_children
+        # Row-level values shared by every record of this row
+        market = self._market
+        row_ts = row.get("timestamp")
+        notional_usd = float(row.get("price", row.get("close", 0.0)))
+        decisions: Optional[List[Dict[str, Any]]] = None
+        if self._decision_log_enabled:
+            decisions = []
+            template = _DECISION_TEMPLATE.copy()
+            template["market"] = market
+            template["features_used"] = [k for k in _DECISION_FEATURES if k in row]
+        # (correlation_id, order_intent dict) pairs
+        intents: List[Tuple[str, Dict[str, Any]]] = []
+        for out in signals:
+            symbol = out.symbol
+            strategy = out.strategy
+            side = out.side
+            if counter is not None:
+                key = (strategy, side)
+                child = children.get(key)
+                if child is None:
+                    child = children[key] = counter.labels(strat=strategy, side=side)
+                child.inc()
+            ts = int(out.ts if row_ts is None else row_ts)
+            confidence = float(out.strength)
+            # Decision log record (v2 groundwork)
+            if decisions is not None:
+                rec = template.copy()
+                rec["ts"] = ts
+                rec["symbol"] = symbol
+                rec["strategy"] = strategy
+                rec["action"] = side
+                rec["confidence"] = confidence
+                rec["signals_used"] = (strategy,)
+                decisions.append(rec)
+            # Emit an order_intent event (minimal) for strong signals; the dict
+            # mirrors OrderIntent.model_dump() and is validated by consumers
+            intents.append((f"{symbol}:{strategy}", {
+                "event_type": "order_intent",
+                "ts": ts,
+                "run_id": _INTENT_RUN_ID,
+                "market": market,
+                "symbol": symbol,
+                "strategy": strategy,
+                "side": side,
+                "confidence": confidence,
+                "tags": [],
+                "notional_usd": notional_usd,
+            }))
+        # Intents first: a decision-log failure must not drop them
+        publish_events(intents)
+        if decisions is not None:
+            append_jsonl_many(self._decision_log_path, decisions)
+
 
 # ---- Phase 2.5: Pattern observability helpers ----
 
+# PATTERN_LOG_BATCH=1 queues pattern log lines (as log_pattern_event args) and
+# emits them on `flush_pattern_logs()` (each feature row, and at exit), still one
+# single-line JSON record per event.
+_BATCH_PATTERN_LOGS = os.getenv("PATTERN_LOG_BATCH", "0") == "1"
+_PENDING_PATTERN_LOGS: List[Tuple[tuple, Dict[str, Any]]] = []
+
+
+def _log_pattern(*args: Any, **kwargs: Any) -> None:
+    if _BATCH_PATTERN_LOGS:
+        _PENDING_PATTERN_LOGS.append((args, kwargs))
+    elif log_pattern_event is not None:
+        log_pattern_event(*args, **kwargs)
+
+
+def flush_pattern_logs() -> None:
+    """Emit queued pattern log lines (one record per event, in queue order)."""
+    if not _PENDING_PATTERN_LOGS:
+        return
+    pending = _PENDING_PATTERN_LOGS[:]
+    del _PENDING_PATTERN_LOGS[: len(pending)]
+    if log_pattern_events is not None:
+        log_pattern_events(pending)
+
+
+atexit.register(flush_pattern_logs)
+
+
 def record_pattern_detected(market: str, symbol: str, pattern: str, rsi: float, ts: int) -> None:
     """Increment detection counter and emit structured log."""
     try:
@@ -111,8 +227,7 @@ def record_pattern_detected(market: str, symbol: str, pattern: str, rsi: float,
     except Exception:
         pass
     try:
-        if log_pattern_event is not None:
-            log_pattern_event("pattern_detected", market, symbol, pattern, rsi=rsi, ts=ts)
+        _log_pattern("pattern_detected", market, symbol, pattern, rsi=rsi, ts=ts)
     except Exception:
         pass
 
@@ -132,21 +247,21 @@ def record_pattern_intent(
     except Exception:
         pass
     try:
-        latency_s = max(0.0, (ts_intent - ts_detected) / 1000.0)
         if observe_pattern_to_intent_latency is not None:
-            observe_pattern_to_intent_latency(latency_s)
+            # Clamp in integer ms, then one multiply to the histogram's base unit (seconds)
+            latency_ms = ts_intent - ts_detected
+            observe_pattern_to_intent_latency(latency_ms * 0.001 if latency_ms > 0 else 0.0)
     except Exception:
         pass
     try:
-        if log_pattern_event is not None:
-            log_pattern_event(
-                "pattern_intent",
-                market,
-                symbol,
-                pattern,
-                side=side,
-                ts=ts_intent,
-                extra={"ts_detected": ts_detected},
-            )
+        _log_pattern(
+            "pattern_intent",
+            market,
+            symbol,
+            pattern,
+            side=side,
+            ts=ts_intent,
+            extra={"ts_detected": ts_detected},
+        )
     except Exception:
         pass
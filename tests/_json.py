@@ -0,0 +1,8 @@
+"""JSON decoding for tests: orjson's C parser when installed, stdlib json otherwise."""
+
+try:
+    from orjson import loads
+except ImportError:  # pragma: no cover - orjson is optional
+    from json import loads
+
+__all__ = ["loads"]
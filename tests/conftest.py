@@ -0,0 +1,17 @@
+"""Shared pytest hooks.
+
+Tests marked `serial` are put in one xdist group so that, under
+`pytest -n auto --dist loadgroup`, they run sequentially on a single worker.
+Each worker is its own process, so the Prometheus registry and killswitch
+state are already isolated; only on-disk state under data/ is shared.
+"""
+
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        if item.get_closest_marker("serial") is not None:
+            item.add_marker(pytest.mark.xdist_group("serial"))
@@ -0,0 +1,23 @@
+import os
+
+from src.paperbot.config import yaml_cache
+from src.paperbot.config.yaml_cache import load_yaml_cached, clear_yaml_cache
+
+
+def test_yaml_cache_hit_returns_copy_and_reloads_on_change(tmp_path, mocker):
+    clear_yaml_cache()
+    p = tmp_path / "cfg.yaml"
+    p.write_text("a: 1\nitems: [1, 2]\n")
+    spy = mocker.spy(yaml_cache, "safe_load")
+
+    first = load_yaml_cached(str(p))
+    first["items"].append(3)
+    second = load_yaml_cached(str(p))
+    assert second == {"a": 1, "items": [1, 2]}
+    assert spy.call_count == 1
+
+    p.write_text("a: 22\nitems: []\n")
+    st = os.stat(p)
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert load_yaml_cached(str(p)) == {"a": 22, "items": []}
+    assert spy.call_count == 2
@@ -0,0 +1,60 @@
+import asyncio
+
+from src.paperbot.config.loader import Settings, FetchConfig
+from src.paperbot.data.candles import CandleFetcher
+
+
+class _FakeAsyncExchange:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+
+    async def fetch_ohlcv(self, symbol, timeframe=None, limit=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        base = 1000 if symbol.startswith("BTC") else 2000
+        return [[base + i, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(limit)]
+
+    async def close(self):
+        self.closed = True
+
+
+def _settings():
+    return Settings(
+        exchange="binance",
+        environment="spot-testnet",
+        symbols=["BTC/USDT", "ETH/USDT", "SOL/USDT"],
+        timeframe="1m",
+        api_key="k",
+        api_secret="s",
+        fetch=FetchConfig(rate_limit_ms=0, backoff_initial_ms=0, backoff_max_ms=0),
+    )
+
+
+def test_fetch_candles_many_is_bounded_and_keyed_by_symbol(monkeypatch):
+    fake = _FakeAsyncExchange()
+    fetcher = CandleFetcher(_settings())
+    monkeypatch.setattr(fetcher, "_init_async_exchange", lambda: fake)
+    out = fetcher.fetch_candles_many(["BTC/USDT", "ETH/USDT", "SOL/USDT"], limit=3, max_concurrency=2)
+    assert list(out) == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    first = out["BTC/USDT"][0]
+    assert first == (1000, 1.0, 2.0, 0.5, 1.5, 10.0, "BTC/USDT")
+    assert first["close"] == first.close == 1.5
+    assert first.get("symbol") == "BTC/USDT"
+    assert len(out["ETH/USDT"]) == 3
+    assert fake.max_in_flight == 2
+    assert fake.closed
+
+
+def test_candle_dict_lookups_only_see_fields():
+    import pytest
+    from src.paperbot.data.model import Candle
+
+    c = Candle(1, 1.0, 2.0, 0.5, 1.5, 10.0, "BTC/USDT")
+    assert c["close"] == 1.5 and c.get("symbol") == "BTC/USDT"
+    assert c.get("count") is None and c.get("index", 0) == 0
+    with pytest.raises(KeyError):
+        c["count"]
@@ -1,8 +1,12 @@
 import os
 import logging
+
+import pytest
+
 from src.paperbot import main as main_mod
 
 
+@pytest.mark.serial
 def test_offline_execution_demo_emits_orders_and_fills(monkeypatch, caplog):
     monkeypatch.setenv("OFFLINE_DEMO", "1")
     monkeypatch.setenv("BINANCE_SPOT_TESTNET_API_KEY", "foo")
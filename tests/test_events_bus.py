@@ -1,6 +1,7 @@
 import os
 import socket
 import time
+from collections import deque
 
 import pytest
 
@@ -26,3 +27,121 @@ def test_bus_publish_consume_roundtrip():
     msg = next(it)
     assert msg is None or isinstance(msg, tuple)
 
+
+def test_publish_batched_delivers_in_order_on_flush(monkeypatch):
+    sent = []
+    monkeypatch.setattr(bus, "publish_many", sent.extend)
+    monkeypatch.setattr(bus, "_BATCH_INTERVAL_S", 60.0)
+    envs = [
+        EventEnvelope(correlation_id=f"c{i}", event=OrderIntent(ts=i, market='crypto', symbol='BTC/USDT', strategy='s', side='long', confidence=0.9, notional_usd=100.0))
+        for i in range(3)
+    ]
+    for env in envs:
+        bus.publish_batched(env)
+    bus.flush()
+    assert [e.correlation_id for e in sent] == ["c0", "c1", "c2"]
+
+
+def test_publish_many_uses_one_pipeline(monkeypatch):
+    class _Pipe:
+        def __init__(self):
+            self.cmds = []
+            self.executed = 0
+
+        def xadd(self, stream, fields):
+            self.cmds.append(stream)
+
+        def execute(self):
+            self.executed += 1
+
+    pipe = _Pipe()
+
+    class _Redis:
+        def pipeline(self, transaction=True):
+            return pipe
+
+    monkeypatch.setattr(bus, "_get_redis", lambda: _Redis())
+    envs = [
+        EventEnvelope(correlation_id=f"c{i}", event=OrderIntent(ts=i, market='crypto', symbol='BTC/USDT', strategy='s', side='long', confidence=0.9, notional_usd=100.0))
+        for i in range(3)
+    ]
+    bus.publish_many(envs)
+    assert pipe.cmds == [bus.STREAM_EVENTS] * 3
+    assert pipe.executed == 1
+
+
+def test_drain_sends_each_batch_in_one_pipeline(monkeypatch):
+    batches = []
+
+    class _Pipe:
+        def __init__(self):
+            self.cmds = 0
+
+        def xadd(self, stream, fields):
+            self.cmds += 1
+
+        def execute(self):
+            batches.append(self.cmds)
+
+    class _Redis:
+        def pipeline(self, transaction=True):
+            return _Pipe()
+
+    monkeypatch.setattr(bus, "_get_redis", lambda: _Redis())
+    monkeypatch.setattr(bus, "_BATCH_MAX", 4)
+    pending = deque(
+        EventEnvelope(correlation_id=f"c{i}", event=OrderIntent(ts=i, market='crypto', symbol='BTC/USDT', strategy='s', side='long', confidence=0.9, notional_usd=100.0))
+        for i in range(6)
+    )
+    monkeypatch.setattr(bus, "_pending", pending)
+    bus.flush()
+    # One pipeline execute() per drained batch of up to _BATCH_MAX events
+    assert batches == [4, 2]
+
+
+def test_publish_raw_many_matches_model_wire_format(monkeypatch):
+    sent = []
+    monkeypatch.setattr(bus, "_send_many", sent.append)
+    intent = OrderIntent(ts=1, market='crypto', symbol='BTC/USDT', strategy='s', side='long', confidence=0.9, notional_usd=100.0)
+    bus.publish_many([EventEnvelope(correlation_id="c0", event=intent)])
+    bus.publish_raw_many([("c0", intent.model_dump())])
+    assert sent[0] == sent[1]
+
+
+def test_publish_many_skips_unserializable_event(monkeypatch):
+    sent = []
+    real_line = bus._line
+
+    def _line(env):
+        if env.correlation_id == "bad":
+            raise TypeError("Type is not JSON serializable: numpy.int64")
+        return real_line(env)
+
+    monkeypatch.setattr(bus, "_line", _line)
+    monkeypatch.setattr(bus, "_send_many", sent.append)
+    intent = OrderIntent(ts=1, market='crypto', symbol='BTC/USDT', strategy='s', side='long', confidence=0.9, notional_usd=100.0)
+    bus.publish_many([EventEnvelope(correlation_id="bad", event=intent), EventEnvelope(correlation_id="ok", event=intent)])
+    assert len(sent) == 1 and len(sent[0]) == 1 and '"ok"' in sent[0][0]
+
+
+def test_drain_survives_publish_errors_and_worker_restarts(monkeypatch):
+    calls = []
+
+    def _boom(batch):
+        calls.append(len(batch))
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(bus, "publish_many", _boom)
+    monkeypatch.setattr(bus, "_pending", deque([object(), object()]))
+    assert bus._drain() == 2
+    assert calls == [2]
+
+    class _Dead:
+        def is_alive(self):
+            return False
+
+    started = []
+    monkeypatch.setattr(bus, "_worker", _Dead())
+    monkeypatch.setattr(bus.threading, "Thread", lambda **kw: type("T", (), {"start": lambda self: started.append(kw["name"]), "is_alive": lambda self: True})())
+    bus.publish_batched(object())
+    assert started == ["paperbot-events"]
@@ -40,3 +40,58 @@ def test_account_equity_usd_set_after_mtm():
     # Gauge should be set for inferred market=crypto
     val = REGISTRY.get_sample_value("account_equity_usd", {"market": "crypto"})
     assert val is not None and val > 0.0
+
+
+def test_disable_prometheus_flag_is_cached_until_refresh(monkeypatch):
+    from src.paperbot.metrics import exec as mexec
+
+    monkeypatch.setattr(mexec, "_PROM_DISABLED", False)
+    monkeypatch.setenv("DISABLE_PROMETHEUS", "1")
+    try:
+        assert mexec._PROM_DISABLED is False
+        mexec.bind(mexec.get_fills_total(), "taker", "BTC/USDT")
+        assert mexec._refresh_prom_env() is True
+        assert mexec._children == {}
+        assert isinstance(mexec._safe_counter("disabled_probe_total", "probe", ["x"]), mexec.NullMetric)
+        # Cached getters are rebuilt under the new flag
+        assert isinstance(mexec.get_fills_total(), mexec.NullMetric)
+    finally:
+        monkeypatch.delenv("DISABLE_PROMETHEUS")
+        assert mexec._refresh_prom_env() is False
+    assert not isinstance(mexec.get_fills_total(), mexec.NullMetric)
+
+
+def test_cached_getters_list_is_complete():
+    from src.paperbot.metrics import exec as mexec
+
+    cached = {
+        name for name, obj in vars(mexec).items()
+        if name.startswith("get_") and hasattr(obj, "cache_clear")
+    }
+    assert cached == {g.__name__ for g in mexec._CACHED_GETTERS}
+
+
+def test_safe_factories_accept_private_registry():
+    from prometheus_client import CollectorRegistry
+    from src.paperbot.metrics import exec as mexec
+
+    reg = CollectorRegistry()
+    c = mexec._safe_counter("orders_submitted_total", "Orders submitted", ["type", "symbol"], registry=reg)
+    c.labels("market", "BTC/USDT").inc()
+    assert reg.get_sample_value("orders_submitted_total", {"type": "market", "symbol": "BTC/USDT"}) == 1.0
+    # Same name on the same private registry reuses the collector instead of raising
+    assert mexec._safe_counter("orders_submitted_total", "Orders submitted", ["type", "symbol"], registry=reg) is c
+    h = mexec._safe_histogram("probe_latency_seconds", "probe", buckets=(1, 2), registry=reg)
+    h.observe(1.5)
+    assert reg.get_sample_value("probe_latency_seconds_count") == 1.0
+
+
+def test_scrape_registry_uses_multiprocess_collector_when_configured(monkeypatch, tmp_path):
+    from src.paperbot.metrics.core import scrape_registry
+
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    assert scrape_registry() is REGISTRY
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    reg = scrape_registry()
+    assert reg is not REGISTRY
+    assert list(reg.collect()) == []
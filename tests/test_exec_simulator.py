@@ -96,3 +96,37 @@ def test_fee_conversion_non_usd_pair_updates_ledger():
     ledger = Ledger(equity_start=10_000.0)
     ledger.on_fill(f)
     assert pytest.approx(-5.4, rel=1e-6) == ledger.realized_total
+
+
+def test_order_and_fill_are_slotted():
+    from src.paperbot.exec.model import Fill, Order
+
+    f = Fill(order_id="1", ts=1, symbol="BTC/USDT", qty=1.0, price=1.0, fee=0.0,
+             fee_currency="USDT", fee_usd=0.0, liquidity="taker")
+    o = Order(id="1", ts=1, symbol="BTC/USDT", side="buy", type="market", qty=1.0, price=None,
+              strategy="mr", reason="t", params={})
+    assert not hasattr(f, "__dict__") and not hasattr(o, "__dict__")
+
+
+def test_new_id_fast_counter_mode(monkeypatch):
+    from src.paperbot.exec import model
+
+    monkeypatch.setattr(model, "_FAST_IDS", True)
+    a, b = model.new_id(), model.new_id()
+    assert a != b
+    assert a.startswith(model._id_prefix) and b.startswith(model._id_prefix)
+    monkeypatch.setattr(model, "_FAST_IDS", False)
+    assert len(model.new_id()) == 32
+
+
+def test_simulator_events_built_without_validation_still_validate(monkeypatch):
+    from src.paperbot.exec import simulator as sim_mod
+
+    sent = []
+    monkeypatch.setattr(sim_mod, "publish_event", sent.append)
+    sim = ExecutionSimulator({"slippage_bps_market": 10, "taker_bps": 5, "liquidity_fraction": 1.0})
+    order = Order(id=new_id(), ts=1, symbol="BTC/USDT", side="buy", type="market", qty=1.0, price=None, strategy="t", reason="t", params={})
+    sim.submit(order, {"timestamp": 2, "close": 100.0})
+    assert {env.event.event_type for env in sent} >= {"order_submitted", "order_filled"}
+    for env in sent:
+        assert type(env.event).model_validate(env.event.model_dump()) == env.event
@@ -43,3 +43,49 @@ def test_extra_indicators_present_and_sane():
     assert 0.0 <= feats["stochrsi_k"] <= 1.0
     assert 0.0 <= feats["stochrsi_d"] <= 1.0
     assert 0.0 <= feats["mfi14"] <= 100.0
+
+
+def test_compute_latest_batch_matches_per_symbol():
+    rng = np.random.default_rng(1)
+    fb = FeatureBuilder({})
+    by_symbol = {}
+    for sym in ("AAA/USDT", "BBB/USDT", "CCC/USDT"):
+        prices = 100 + np.cumsum(rng.normal(0, 0.5, 40))
+        candles = make_candles(prices, volumes=rng.uniform(1, 5, 40))
+        for c in candles:
+            c["symbol"] = sym
+        by_symbol[sym] = candles
+    batch = fb.compute_latest_batch(by_symbol)
+    assert list(batch) == list(by_symbol)
+    for sym, candles in by_symbol.items():
+        single = fb.compute_latest(candles)
+        assert batch[sym].keys() == single.keys()
+        for k, v in single.items():
+            if isinstance(v, float):
+                assert np.isclose(batch[sym][k], v), k
+            else:
+                assert batch[sym][k] == v, k
+
+
+def test_compute_latest_accepts_candle_tuples():
+    from src.paperbot.data.model import Candle
+
+    rng = np.random.default_rng(2)
+    prices = 100 + np.cumsum(rng.normal(0, 0.5, 60))
+    dicts = make_candles(prices, volumes=rng.uniform(1, 5, 60))
+    tuples = [Candle(**c) for c in dicts]
+    fb = FeatureBuilder({})
+    assert fb.compute_latest(tuples) == fb.compute_latest(dicts)
+
+
+def test_compute_latest_arrays_matches_candles():
+    rng = np.random.default_rng(3)
+    prices = 100 + np.cumsum(rng.normal(0, 0.5, 80))
+    candles = make_candles(prices, volumes=rng.uniform(1, 5, 80))
+    fb = FeatureBuilder({})
+    cols = {k: np.array([c[k] for c in candles]) for k in ("high", "low", "close", "volume", "timestamp")}
+    out = fb.compute_latest_arrays(
+        cols["high"], cols["low"], cols["close"], cols["volume"], cols["timestamp"],
+        symbol="TEST/XYZ",
+    )
+    assert out == fb.compute_latest(candles)
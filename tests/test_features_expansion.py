@@ -8,6 +8,17 @@ from src.paperbot.features.expansion import (
     sma_ema_cross, macd, bollinger_bands, obv,
     keltner_channel, rolling_skew_kurtosis, hour_of_day
 )
+from src.paperbot.features import expansion_fused
+from src.paperbot.features.expansion_fused import compute_all
+
+
+@pytest.fixture(scope="session")
+def fat_tail_prices():
+    """Fat-tailed price series: Student-t(3) noise plus +/-20 outliers every 10th bar."""
+    rng = np.random.default_rng(42)
+    prices = 100 + rng.standard_t(3, 100)
+    prices[::10] += rng.choice([-20, 20], size=10)
+    return prices
 
 
 class TestSMAEMACross:
@@ -135,6 +146,12 @@ class TestOBV:
         assert result['obv'] == 0.0
         assert result['obv_change'] == 0.0
 
+    def test_obv_flat_bars_add_nothing(self):
+        """Unchanged closes contribute zero volume."""
+        prices = np.array([100, 101, 101, 100, 102])
+        volumes = np.array([1, 10, 100, 1000, 10000])
+        assert obv(prices, volumes)['obv'] == 10 - 1000 + 10000
+
 
 class TestKeltnerChannel:
     """Test Keltner Channel calculations."""
@@ -178,21 +195,30 @@ class TestRollingSkewKurtosis:
         assert abs(result['skewness']) < 1.0
         assert abs(result['kurtosis']) < 3.0
     
-    def test_skew_kurtosis_fat_tails(self):
+    def test_skew_kurtosis_fat_tails(self, fat_tail_prices):
         """Test with fat-tailed distribution."""
-        # Generate fat-tailed data with more extreme values
-        np.random.seed(42)
-        # Use more extreme t-distribution or add outliers
-        prices = 100 + np.random.standard_t(3, 100)
-        # Add some outliers to ensure fat tails
-        prices[::10] += np.random.choice([-20, 20], size=10)
-        result = rolling_skew_kurtosis(prices, lookback=50)
+        result = rolling_skew_kurtosis(fat_tail_prices, lookback=50)
         
         # With outliers, we should see some fat tail behavior
         # Just check that the calculation works, not specific values
         assert isinstance(result['kurtosis'], float)
         assert isinstance(result['skewness'], float)
     
+    def test_matches_two_pass_moments(self, fat_tail_prices):
+        """One-pass moments agree with the standardized-moment definitions."""
+        for lookback in (5, 20, 50):
+            recent = fat_tail_prices[-lookback:]
+            r = np.diff(recent) / recent[:-1]
+            z = (r - r.mean()) / r.std()
+            result = rolling_skew_kurtosis(fat_tail_prices, lookback=lookback)
+            assert result['skewness'] == pytest.approx(np.mean(z ** 3), rel=1e-9)
+            assert result['kurtosis'] == pytest.approx(np.mean(z ** 4) - 3, rel=1e-9)
+
+    def test_flat_prices_return_zero(self):
+        """Zero variance yields zeros rather than NaN."""
+        result = rolling_skew_kurtosis(np.full(30, 100.0), lookback=20)
+        assert result == {"skewness": 0.0, "kurtosis": 0.0}
+
     def test_insufficient_data(self):
         """Test behavior with insufficient data."""
         prices = np.array([100, 101, 102])
@@ -225,6 +251,15 @@ class TestHourOfDay:
         assert result['hour_int'] == 0
         assert result['hour_cat'] == "hour_00"
     
+    def test_hour_of_day_matches_datetime_utc_hour(self):
+        """Integer hour math agrees with datetime's UTC hour."""
+        from datetime import datetime, timezone
+        for ts_ms in (1704123000000, 1704067199999, 1704067200000, 1_700_000_000_123, 86_400_000 * 365):
+            expected = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).hour
+            result = hour_of_day(ts_ms)
+            assert result['hour_int'] == result['hour'] == expected
+            assert result['hour_cat'] == f"hour_{expected:02d}"
+
     def test_hour_of_day_invalid_timestamp(self):
         """Test with invalid timestamp."""
         timestamp_ms = 0
@@ -271,3 +306,20 @@ class TestFeatureIntegration:
         assert isinstance(hour_result['hour_int'], int)
         assert isinstance(hour_result['hour_cat'], str)
 
+        # The fused entry point returns exactly the merged per-indicator outputs
+        merged = {**sma_ema_result, **macd_result, **bb_result, **obv_result,
+                  **keltner_result, **skew_kurt_result, **hour_result}
+        assert compute_all(prices, volumes, high, low, 1704123000000) == merged
+
+    def test_fused_pass_matches_per_indicator_helpers(self, fat_tail_prices):
+        """The single-pass kernel agrees with the per-indicator helpers."""
+        volumes = np.linspace(1000, 2000, len(fat_tail_prices))
+        high, low = fat_tail_prices + 2, fat_tail_prices - 2
+        for n in (5, 12, 18, 25, len(fat_tail_prices)):
+            args = (fat_tail_prices[:n], volumes[:n], high[:n], low[:n], 1704123000000)
+            fused = expansion_fused._compute_all_fused(*args)
+            composed = expansion_fused._compute_all_composed(*args)
+            assert list(fused) == list(composed)
+            for k, v in composed.items():
+                assert fused[k] == pytest.approx(v, rel=1e-9, abs=1e-9), k
+
@@ -1,5 +1,8 @@
+import numpy as np
+import pytest
+
 from src.paperbot.ledger.ledger import Ledger
-from src.paperbot.exec.model import Fill
+from src.paperbot.exec.model import Fill, FillColumns
 
 
 def test_ledger_open_reduce_and_mtm(tmp_path):
@@ -37,3 +40,37 @@ def test_ledger_open_reduce_and_mtm(tmp_path):
     # MTM with price 105
     led.mark_to_market(3, {"BTC/USDT": 105.0})
     assert led.equity > 10_000.0
+
+
+def test_ledger_fills_batch_matches_per_fill_replay():
+    symbols = ["BTC/USDT", "ETH/USDT"]
+    rng = np.random.default_rng(7)
+    n = 200
+    fc = FillColumns(
+        ts=np.arange(n),
+        symbol_id=rng.integers(0, 2, n),
+        qty=rng.choice([-2.0, -1.0, -0.5, 0.5, 1.0, 2.0], n),
+        price=100 + rng.standard_normal(n).cumsum(),
+        fee_usd=np.full(n, 0.01),
+        liquidity=np.array(["taker"] * n),
+    )
+    ref = Ledger()
+    for i in range(n):
+        ref.on_fill(
+            Fill(
+                order_id=str(i), ts=int(fc.ts[i]), symbol=symbols[fc.symbol_id[i]], qty=float(fc.qty[i]),
+                price=float(fc.price[i]), fee=0.01, fee_currency="USD", fee_usd=0.01, liquidity="taker",
+            )
+        )
+    led = Ledger()
+    realized = led.on_fills_batch(fc, symbols)
+    assert led.realized_total == pytest.approx(ref.realized_total)
+    assert realized.tolist() == pytest.approx([t.realized_pnl for t in ref.trades])
+    assert [t.symbol for t in led.trades] == [t.symbol for t in ref.trades]
+    for sym in symbols:
+        assert led.positions[sym].qty == pytest.approx(ref.positions[sym].qty)
+        assert led.positions[sym].avg_price == pytest.approx(ref.positions[sym].avg_price)
+
+    bare = Ledger()
+    bare.on_fills_batch(fc, symbols, record_trades=False)
+    assert bare.trades == [] and bare.realized_total == pytest.approx(ref.realized_total)
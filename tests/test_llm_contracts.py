@@ -33,3 +33,19 @@ def test_decision_schema_bounds():
             features_used=[],
         )
 
+
+def test_decision_rejects_empty_symbol():
+    with pytest.raises(Exception):
+        Decision(
+            run_id="r1",
+            ts=1,
+            market="crypto",
+            symbol="",
+            side="buy",
+            size=0.0,
+            max_notional_usd=1.0,
+            confidence=0.5,
+            reason=[],
+            ttl_s=1,
+            features_used=[],
+        )
@@ -1,9 +1,9 @@
-import json
-
 import pytest
 
 from src.paperbot.llm.guards import GuardrailError, output_validate
 
+from ._json import loads
+
 
 def make_decision(size: float, max_notional: float = 200.0):
     return {
@@ -52,7 +52,7 @@ def test_output_validate_notional_guard_blocks(caplog):
                 0.6,
                 200.0,
             )
-    log_messages = [json.loads(rec.message) for rec in caplog.records if rec.levelname == "ERROR"]
+    log_messages = [loads(rec.message) for rec in caplog.records if rec.levelname == "ERROR"]
     assert any(msg.get("event") == "llm_guard_denied" for msg in log_messages)
 
 
@@ -69,7 +69,7 @@ def test_output_validate_converts_size_to_notional(caplog):
                 0.6,
                 200.0,
             )
-    entries = [json.loads(rec.message) for rec in caplog.records if rec.levelname == "ERROR"]
+    entries = [loads(rec.message) for rec in caplog.records if rec.levelname == "ERROR"]
     assert entries, "expected guardrail log entry"
     payload = entries[-1]
     assert payload.get("price_source") == "quote_price"
@@ -19,3 +19,32 @@ def test_sqlite_store_insert(tmp_path):
     st.insert(rec)
     # simple existence check by reading raw file
     assert db.exists()
+
+
+def test_sqlite_store_insert_many_single_transaction(tmp_path):
+    import sqlite3
+
+    db = tmp_path / "mem.sqlite"
+    st = SQLiteStore(str(db))
+    recs = [
+        {"run_id": f"r{i}", "ts": i, "market": "crypto", "symbol": "BTC/USDT", "side": "flat",
+         "size": 0.0, "max_notional_usd": 100.0, "confidence": 0.7, "reason": ["a", "b"], "ttl_s": 5}
+        for i in range(3)
+    ]
+    st.insert_many(recs)
+    st.insert_many([])
+    with sqlite3.connect(str(db)) as con:
+        rows = con.execute("SELECT run_id, reason FROM decisions ORDER BY ts").fetchall()
+    assert rows == [("r0", "a,b"), ("r1", "a,b"), ("r2", "a,b")]
+
+
+def test_sqlite_store_uses_wal(tmp_path):
+    import sqlite3
+
+    db = tmp_path / "mem.sqlite"
+    st = SQLiteStore(str(db))
+    st.insert({"run_id": "r1", "ts": 1, "reason": []})
+    st.close()
+    with sqlite3.connect(str(db)) as con:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert con.execute("SELECT COUNT(*) FROM decisions").fetchone()[0] == 1
@@ -1,4 +1,5 @@
-from src.paperbot.metrics.llm import get_llm_calls_total, get_llm_tokens_total, get_decisions_count_total, get_decisions_confidence_hist
+from src.paperbot.metrics import llm as llm_metrics
+from src.paperbot.metrics.llm import get_llm_calls_total, get_llm_tokens_total, get_decisions_count_total, get_decisions_confidence_hist, inc_decision
 
 
 def test_llm_metrics_increment():
@@ -11,3 +12,26 @@ def test_llm_metrics_increment():
     hist = get_decisions_confidence_hist()
     hist.labels("crypto").observe(0.7)
     assert True
+
+
+def test_inc_decision_binds_child_once(monkeypatch):
+    class _Counter:
+        def __init__(self):
+            self.bound = []
+            self.n = 0
+
+        def labels(self, *labels):
+            self.bound.append(labels)
+            return self
+
+        def inc(self, amount=1):
+            self.n += amount
+
+    counter = _Counter()
+    monkeypatch.setattr(llm_metrics, "_decisions_count", counter)
+    monkeypatch.setattr(llm_metrics, "_decision_children", {})
+    inc_decision("crypto", "ETH/USDT", "buy")
+    inc_decision("crypto", "ETH/USDT", "buy")
+    inc_decision("stocks", "AAPL", "flat")
+    assert counter.n == 3
+    assert counter.bound == [("crypto", "ETH/USDT", "buy"), ("stocks", "AAPL", "flat")]
@@ -1,31 +1,30 @@
-from prometheus_client import REGISTRY
+from src.paperbot.metrics.exec import get_account_equity_usd, get_fees_paid_usd_total, set_equity_gauges
 
-from src.paperbot.metrics.exec import get_fees_paid_usd_total, set_equity_gauges
 
-
-def _sample(metric: str, labels: dict) -> float:
-    val = REGISTRY.get_sample_value(metric, labels)
-    return 0.0 if val is None else float(val)
+def _sample(metric_obj, labels: dict) -> float:
+    # Read the labelled child directly instead of scanning REGISTRY.collect()
+    return float(metric_obj.labels(**labels)._value.get())
 
 
 def test_fees_paid_usd_total_sum_of_two_increments():
     fees = get_fees_paid_usd_total()
     labels = {"market": "crypto", "symbol": "TEST/USDT"}
-    before = _sample("fees_paid_usd_total", labels)
+    before = _sample(fees, labels)
     fees.labels(**labels).inc(1.25)
     fees.labels(**labels).inc(0.75)
-    after = _sample("fees_paid_usd_total", labels)
+    after = _sample(fees, labels)
     assert round(after - before, 6) == round(2.0, 6)
 
 
 def test_account_equity_usd_set_twice():
+    equity = get_account_equity_usd()
     labels = {"market": "crypto"}
     # Set once, verify value
     set_equity_gauges({"crypto": 10_000.0})
-    first = _sample("account_equity_usd", labels)
+    first = _sample(equity, labels)
     assert first == 10_000.0
     # Set again, verify updated value
     set_equity_gauges({"crypto": 10_250.5})
-    second = _sample("account_equity_usd", labels)
+    second = _sample(equity, labels)
     assert second == 10_250.5
 
@@ -14,13 +14,13 @@ def test_record_pattern_helpers_emit_metrics_and_logs(caplog, monkeypatch):
     ts_det = 1_000  # ms
     ts_int = 1_600  # ms -> 0.6s latency
 
+    cnt_before = REGISTRY.get_sample_value("pattern_to_intent_latency_seconds_count") or 0.0
     record_pattern_detected(market, symbol, pattern, rsi=33.0, ts=ts_det)
     record_pattern_intent(market, symbol, pattern, side=side, ts_detected=ts_det, ts_intent=ts_int)
 
     # Logs contain JSON with event types
-    log_out = "\n".join([r.message for r in caplog.records])
-    assert '"event":"pattern_detected"' in log_out
-    assert '"event":"pattern_intent"' in log_out
+    assert any('"event":"pattern_detected"' in r.message for r in caplog.records)
+    assert any('"event":"pattern_intent"' in r.message for r in caplog.records)
 
     # Counters incremented
     v_det = REGISTRY.get_sample_value(
@@ -36,6 +36,23 @@ def test_record_pattern_helpers_emit_metrics_and_logs(caplog, monkeypatch):
     # Histogram observed with positive value
     v_cnt = REGISTRY.get_sample_value("pattern_to_intent_latency_seconds_count")
     v_sum = REGISTRY.get_sample_value("pattern_to_intent_latency_seconds_sum")
-    assert v_cnt is not None and v_cnt >= 1.0
+    assert v_cnt is not None and v_cnt - cnt_before == 1.0
     assert v_sum is not None and v_sum > 0.0
 
+
+def test_pattern_logs_batched_until_flush(caplog, monkeypatch):
+    from src.paperbot.strategies import runner
+
+    caplog.set_level(logging.INFO)
+    monkeypatch.setattr(runner, "_BATCH_PATTERN_LOGS", True)
+    record_pattern_detected("crypto", "ETH/USDT", "hammer", rsi=30.0, ts=1)
+    record_pattern_intent("crypto", "ETH/USDT", "hammer", side="long", ts_detected=1, ts_intent=2)
+    assert not [r for r in caplog.records if "hammer" in r.getMessage()]
+
+    runner.flush_pattern_logs()
+    # One single-line JSON record per event, in queue order
+    recs = [r.getMessage() for r in caplog.records if "hammer" in r.getMessage()]
+    assert len(recs) == 2
+    assert all("\n" not in m for m in recs)
+    assert '"event":"pattern_detected"' in recs[0]
+    assert '"event":"pattern_intent"' in recs[1]
@@ -0,0 +1,30 @@
+import pytest
+
+from src.paperbot.reports.charts import _session_vwap_series
+
+
+def test_session_vwap_series_resets_at_utc_day_boundary():
+    day_ms = 86_400_000
+    candles = [
+        {"timestamp": day_ms - 120_000, "close": 10.0, "volume": 1.0},
+        {"timestamp": day_ms - 60_000, "close": 20.0, "volume": 3.0},
+        {"timestamp": day_ms, "close": 30.0, "volume": 0.0},
+        {"timestamp": day_ms + 60_000, "close": 40.0, "volume": 2.0},
+    ]
+    assert _session_vwap_series(candles) == pytest.approx([10.0, 17.5, 0.0, 40.0])
+    assert _session_vwap_series([]) == []
+
+
+def test_save_candlestick_png_writes_file(tmp_path):
+    from src.paperbot.reports.charts import save_candlestick_png
+
+    candles = [
+        {"timestamp": 1_700_000_000_000 + i * 60_000, "open": 100.0 + i, "high": 102.0 + i,
+         "low": 99.0 + i, "close": 101.0 + (-1) ** i, "volume": 5.0}
+        for i in range(12)
+    ]
+    # The figure is reused between calls, so render twice
+    for name in ("a.png", "b.png"):
+        out = save_candlestick_png(candles, "BTC/USDT", "1m", str(tmp_path / "img" / name))
+        with open(out, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
@@ -1,3 +1,5 @@
+import pytest
+
 from src.paperbot.risk.engine import RiskEngine
 from src.paperbot.risk.killswitch import reset_killswitch, check_killswitch
 from src.paperbot.risk.halt_flags import (
@@ -9,15 +11,26 @@ from src.paperbot.risk.halt_flags import (
 from src.paperbot.strategies.base import Signal
 
 
+@pytest.fixture(autouse=True)
+def _clean_halts():
+    reset_killswitch()
+    reset_halt_flags()
+    yield
+    reset_killswitch()
+    reset_halt_flags()
+
+
+@pytest.fixture
+def sizing_cfg():
+    return {"risk_frac": 0.0025, "atr_stop_mult": 1.5, "max_position_value_per_symbol": 0.2}
+
+
 def make_signal(symbol: str, ts: int, side: str, strategy: str = "mr"):
     return Signal(ts=ts, symbol=symbol, strategy=strategy, side=side, strength=1.0, reason="t", params={})
 
 
-def test_risk_sizing_and_caps():
-    reset_killswitch()
-    reset_halt_flags()
-    cfg = {"risk_frac": 0.0025, "atr_stop_mult": 1.5, "max_position_value_per_symbol": 0.2}
-    r = RiskEngine(cfg, equity_start=10_000.0)
+def test_risk_sizing_and_caps(sizing_cfg):
+    r = RiskEngine(sizing_cfg, equity_start=10_000.0)
     sig = make_signal("BTC/USDT", 1, "long")
     features = {"price": 100.0, "atr14": 2.0}
     order = r.approve(sig, features, equity=10_000.0)
@@ -26,9 +39,17 @@ def test_risk_sizing_and_caps():
     assert 8.0 < order.qty < 8.5
 
 
+def test_sizing_param_writes_take_effect(sizing_cfg):
+    r = RiskEngine(sizing_cfg, equity_start=10_000.0)
+    r.risk_frac = 0.005
+    features = {"price": 100.0, "atr14": 2.0}
+    order = r.approve(make_signal("BTC/USDT", 1, "long"), features, equity=10_000.0)
+    assert order is not None and 16.5 < order.qty < 17.0
+    r.max_position_value_per_symbol = 0.1
+    assert r.approve(make_signal("ETH/USDT", 2, "long"), features, equity=10_000.0) is None
+
+
 def test_risk_killswitch_blocks():
-    reset_killswitch()
-    reset_halt_flags()
     r = RiskEngine({"daily_loss_cap_pct": 0.02}, equity_start=10_000.0)
     # Trip killswitch by passing low equity
     r.on_realized_pnl(equity=9_700.0)
@@ -42,8 +63,6 @@ def test_risk_killswitch_blocks():
 
 
 def test_risk_killswitch_blocks_followup_calls():
-    reset_killswitch()
-    reset_halt_flags()
     r = RiskEngine({"daily_loss_cap_pct": 0.01}, equity_start=10_000.0)
     r.on_realized_pnl(equity=9_800.0)
     assert r.is_active
@@ -55,8 +74,6 @@ def test_risk_killswitch_blocks_followup_calls():
 
 
 def test_risk_killswitch_after_sequential_losses_blocks_orders():
-    reset_killswitch()
-    reset_halt_flags()
     r = RiskEngine({"daily_loss_cap_pct": 0.02}, equity_start=10_000.0)
 
     # Losses that should not yet trigger the cap
@@ -73,3 +90,70 @@ def test_risk_killswitch_after_sequential_losses_blocks_orders():
     sig = make_signal("BTC/USDT", 123456, "long")
     features = {"price": 100.0, "atr14": 1.0, "timestamp": 123456}
     assert r.approve(sig, features, equity=9_700.0) is None
+
+
+def test_flat_exit_frees_position_slot():
+    r = RiskEngine({"max_positions": 1, "max_position_value_per_symbol": 1.0}, equity_start=10_000.0)
+    features = {"price": 100.0, "atr14": 2.0, "timestamp": 1}
+    assert r.approve(make_signal("BTC/USDT", 1, "long"), features, equity=10_000.0) is not None
+    assert r.approve(make_signal("ETH/USDT", 2, "long"), features, equity=10_000.0) is None
+    exit_order = r.approve(make_signal("BTC/USDT", 3, "flat"), {**features, "position_qty": 1.0}, equity=10_000.0)
+    assert exit_order is not None and exit_order.side == "sell"
+    assert "BTC/USDT" not in r.open_positions
+    assert r.approve(make_signal("ETH/USDT", 4, "long"), features, equity=10_000.0) is not None
+
+
+def test_reset_day_moves_loss_threshold():
+    r = RiskEngine({"daily_loss_cap_pct": 0.02}, equity_start=10_000.0)
+    r.reset_day(9_000.0)
+    r.on_realized_pnl(equity=9_700.0)
+    assert r.daily_stop_active is False
+    r.on_realized_pnl(equity=8_800.0)
+    assert r.daily_stop_active is True
+
+
+def test_loss_threshold_follows_direct_writes():
+    r = RiskEngine({"daily_loss_cap_pct": 0.02}, equity_start=10_000.0)
+    r.daily_loss_cap_pct = 0.05
+    r.on_realized_pnl(equity=9_700.0)
+    assert r.daily_stop_active is False
+    r.equity_start_of_day = 10_500.0
+    r.on_realized_pnl(equity=9_950.0)
+    assert r.daily_stop_active is True
+
+
+def test_halt_flags_bitmask_and_snapshot():
+    from src.paperbot.risk import halt_flags
+
+    assert halt_flags.any_active() is False
+    halt_flags.set_flag(HALT_KILL_SWITCH, True)
+    assert halt_flags.bits() == halt_flags.KILL_SWITCH_BIT
+    snap = halt_flags.snapshot()
+    assert snap == {HALT_DAILY_STOP: False, HALT_KILL_SWITCH: True}
+    assert halt_flags.snapshot() is snap
+    halt_flags.set_flag(HALT_KILL_SWITCH, False)
+    assert halt_flags.any_active() is False
+    assert halt_flags.snapshot()[HALT_KILL_SWITCH] is False
+    assert get_halt_flag("UNKNOWN_FLAG") is False
+
+
+def test_market_killswitch_change_is_seen_by_existing_engine():
+    from src.paperbot.risk import killswitch
+
+    r = RiskEngine({}, equity_start=10_000.0)
+    features = {"price": 100.0, "atr14": 50.0, "timestamp": 1}
+    assert r.approve(make_signal("BTC/USDT", 1, "long"), features, equity=10_000.0) is not None
+    killswitch.set_killswitch_state("crypto", True)
+    assert check_killswitch() is True
+    assert r.approve(make_signal("ETH/USDT", 2, "long"), features, equity=10_000.0) is None
+    reset_killswitch()
+    assert check_killswitch() is False
+
+
+def test_metric_handles_can_be_overridden_per_instance():
+    from src.paperbot.metrics.exec import NULL_METRIC
+
+    r = RiskEngine({"max_positions": 0}, equity_start=10_000.0)
+    r.orders_blocked = NULL_METRIC
+    features = {"price": 100.0, "atr14": 2.0, "timestamp": 1}
+    assert r.approve(make_signal("BTC/USDT", 1, "long"), features, equity=10_000.0) is None
@@ -0,0 +1,36 @@
+import threading
+import time
+
+from src.paperbot.runtime.ticker import Scheduler
+
+
+def test_scheduler_runs_periodic_and_delayed_tasks_on_one_thread():
+    sched = Scheduler().start()
+    ticks, threads = [], set()
+    once = threading.Event()
+
+    def _tick():
+        threads.add(threading.get_ident())
+        ticks.append(time.monotonic())
+
+    def _boom():
+        raise RuntimeError("ignored")
+
+    def _once():
+        threads.add(threading.get_ident())
+        once.set()
+
+    try:
+        sched.every(0.02, _tick, duration_s=0.15)
+        sched.every(0.02, _boom, duration_s=0.05)
+        sched.call_later(0.03, _once)
+        assert once.wait(1.0)
+        time.sleep(0.3)
+        n = len(ticks)
+        time.sleep(0.1)
+        # bounded by duration_s: no more ticks after the deadline
+        assert len(ticks) == n
+        assert 3 <= n <= 9
+        assert len(threads) == 1
+    finally:
+        sched.stop()
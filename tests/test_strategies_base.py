@@ -19,6 +19,7 @@ def test_signal_schema():
     assert s.side in ("long", "short", "flat")
     assert 0.0 <= s.strength <= 1.0
     assert isinstance(s.params, dict)
+    assert not hasattr(s, "__dict__")
 
 
 def test_strategy_interface_noop():
@@ -43,3 +43,16 @@ def test_momentum_confirmation_bars():
     sig = mo.on_bar(r(sym, 2, 62))
     assert sig is not None and sig.side == "long"
 
+
+def test_momentum_on_bars_matches_on_bar():
+    import random
+
+    rng = random.Random(11)
+    rsis = [rng.uniform(30, 80) for _ in range(300)]
+    for confirm in (0, 2):
+        cfg = {"enter_long_if_rsi_at_least": 60, "exit_long_if_rsi_at_most": 50, "confirm_bars": confirm}
+        one, batch = MomentumStrategy(cfg), MomentumStrategy(cfg)
+        expected = [s for k in range(300) if (s := one.on_bar(r("S", k, rsis[k]))) is not None]
+        got = batch.on_bars("S", list(range(300)), rsis)
+        assert got == expected and len(got) > 10
+        assert int(batch._confirm_arr[0]) == int(one._confirm_arr[0])
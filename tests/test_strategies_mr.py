@@ -48,3 +48,31 @@ def test_mr_vol_gate_suppresses_entries():
     sig = mr.on_bar(row(sym, 2, 2.0, 0.05))
     assert sig is None
 
+
+def test_mr_on_bars_matches_on_bar():
+    import random
+
+    cfg = {"enter_long_if_below": -1.5, "exit_long_if_above": -0.3,
+           "enter_short_if_above": 1.5, "exit_short_if_below": 0.3, "vol_gate_rv_30m_max": 0.03}
+    rng = random.Random(7)
+    zs = [rng.uniform(-3, 3) for _ in range(300)]
+    rvs = [rng.choice([0.01, 0.01, 0.05]) for _ in range(300)]
+    one, batch = MeanReversionStrategy(cfg), MeanReversionStrategy(cfg)
+    expected = [s for k in range(300) if (s := one.on_bar(row("S", k, zs[k], rvs[k]))) is not None]
+    got = batch.on_bars("S", list(range(300)), zs, rvs)
+    assert got == expected and len(got) > 10
+
+
+def test_mr_suppressed_counter_is_prebound():
+    from prometheus_client import CollectorRegistry, Counter
+
+    reg = CollectorRegistry()
+    counter = Counter("probe_suppressed_total", "probe", ["strat", "reason"], registry=reg)
+    mr = MeanReversionStrategy({"vol_gate_rv_30m_max": 0.03})
+    mr.bind_metrics(counter)
+    mr.on_bar(row("S", 1, -2.0, 0.05))
+    mr.on_bars("S", [2, 3], [-2.0, -2.0], [0.05, 0.05])
+    assert reg.get_sample_value("probe_suppressed_total", {"strat": "mr", "reason": "vol_gate"}) == 3.0
+    # A counter that cannot be bound degrades to a no-op instead of raising per bar
+    mr.bind_metrics(object())
+    assert mr.on_bar(row("S", 4, -2.0, 0.05)) is None
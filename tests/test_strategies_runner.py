@@ -0,0 +1,109 @@
+"""Unit tests for StrategyRunner dispatch and decision logging."""
+
+import json
+
+import pytest
+
+from src.paperbot.events.schema import OrderIntent
+from src.paperbot.strategies import runner as runner_mod
+from src.paperbot.strategies.mr import MeanReversionStrategy
+from src.paperbot.strategies.runner import StrategyRunner
+
+
+def test_runner_batches_decisions_and_intents_per_row(tmp_path, monkeypatch):
+    path = tmp_path / "decisions" / "d.jsonl"
+    monkeypatch.setenv("DECISION_LOG_PATH", str(path))
+    monkeypatch.setenv("APP_TRACK", "crypto")
+    published = []
+    monkeypatch.setattr(runner_mod, "publish_events", published.append)
+    writes = []
+    real = runner_mod.append_jsonl_many
+    monkeypatch.setattr(
+        runner_mod, "append_jsonl_many", lambda p, recs: (writes.append(len(recs)), real(p, recs))
+    )
+    a = MeanReversionStrategy({"enter_long_if_below": -1.5})
+    b = MeanReversionStrategy({"enter_long_if_below": -1.0})
+    r = StrategyRunner([a, b])
+
+    row = {"symbol": "BTC/USDT", "timestamp": 1, "z_vwap": -2.0, "rv_30m": 0.0, "close": 100.0}
+    sigs = r.on_feature_row(row)
+    assert [s.side for s in sigs] == ["long", "long"]
+    assert writes == [2]
+    assert [len(batch) for batch in published] == [2]
+    cid, event = published[0][0]
+    assert cid == "BTC/USDT:mr"
+    assert OrderIntent(**event).model_dump() == event
+    recs = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [rec["market"] for rec in recs] == ["crypto", "crypto"]
+    assert list(recs[0]) == [
+        "ts", "symbol", "market", "strategy", "action", "confidence", "features_used",
+        "signals_used", "risk_context", "flow_evidence", "gates_passed", "gates_failed", "outcome",
+    ]
+    assert recs[0]["features_used"] == ["z_vwap"]
+    assert recs[0]["signals_used"] == ["mr"] and recs[0]["gates_passed"] == []
+
+    # No signals -> no write
+    assert r.on_feature_row({**row, "timestamp": 2, "z_vwap": -2.0}) == []
+    assert writes == [2]
+
+
+def test_runner_signals_counter_labels_strat_side_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("DECISION_LOG_PATH", str(tmp_path / "d.jsonl"))
+    monkeypatch.setattr(runner_mod, "publish_events", lambda envs: None)
+
+    class _Counter:
+        def __init__(self):
+            self.bound = []
+            self.n = 0
+
+        def labels(self, **labels):
+            self.bound.append(labels)
+            return self
+
+        def inc(self, amount=1):
+            self.n += amount
+
+    counter = _Counter()
+    r = StrategyRunner([MeanReversionStrategy({})], signals_counter=counter)
+    for ts, z in ((1, -2.0), (2, 0.0), (3, -2.0)):
+        r.on_feature_row({"symbol": "BTC/USDT", "timestamp": ts, "z_vwap": z, "rv_30m": 0.0})
+    assert counter.n == 3
+    assert counter.bound == [{"strat": "mr", "side": "long"}, {"strat": "mr", "side": "flat"}]
+
+
+def test_runner_emit_errors_swallowed_unless_strict(tmp_path, monkeypatch):
+    monkeypatch.setenv("DECISION_LOG_PATH", str(tmp_path / "d.jsonl"))
+
+    def _boom(items):
+        raise RuntimeError("bus down")
+
+    monkeypatch.setattr(runner_mod, "publish_events", _boom)
+    row = {"symbol": "BTC/USDT", "timestamp": 1, "z_vwap": -2.0, "rv_30m": 0.0}
+    monkeypatch.setenv("PAPERBOT_STRICT", "0")
+    assert len(StrategyRunner([MeanReversionStrategy({})]).on_feature_row(row)) == 1
+    monkeypatch.setenv("PAPERBOT_STRICT", "1")
+    with pytest.raises(RuntimeError):
+        StrategyRunner([MeanReversionStrategy({})]).on_feature_row(row)
+
+
+def test_runner_skips_decision_log_when_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("DECISION_LOG_PATH", str(tmp_path / "d.jsonl"))
+    monkeypatch.setenv("DECISION_LOG_ENABLED", "0")
+    published = []
+    monkeypatch.setattr(runner_mod, "publish_events", published.append)
+    monkeypatch.setattr(runner_mod, "append_jsonl_many", lambda p, recs: pytest.fail("decision log written"))
+    r = StrategyRunner([MeanReversionStrategy({})])
+    assert len(r.on_feature_row({"symbol": "BTC/USDT", "timestamp": 1, "z_vwap": -2.0, "rv_30m": 0.0})) == 1
+    assert len(published) == 1
+
+
+def test_runner_publishes_intents_when_decision_log_path_is_unusable(tmp_path, monkeypatch):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("x")
+    monkeypatch.setenv("DECISION_LOG_PATH", str(blocker / "d.jsonl"))
+    monkeypatch.setenv("PAPERBOT_STRICT", "1")
+    published = []
+    monkeypatch.setattr(runner_mod, "publish_events", published.append)
+    r = StrategyRunner([MeanReversionStrategy({})])
+    assert len(r.on_feature_row({"symbol": "BTC/USDT", "timestamp": 1, "z_vwap": -2.0, "rv_30m": 0.0})) == 1
+    assert len(published) == 1